@@ -0,0 +1,47 @@
+import copy
+import random
+import sys
+import time
+
+from map_making import adjust_walls, adjust_walls_pairwise
+
+def synthetic_walls(count, seed=0):
+    # Wall002x10 가로/세로 벽을 대략 벽 하나당 15 m x 15 m 면적에 흩뿌림
+    # z는 2 m 간격 줄 근처로 모아서 겹침 이동과 맞닿음 정렬이 실제로 일어나게 함
+    rng = random.Random(seed)
+    side = (count ** 0.5) * 15
+    walls = []
+    for _ in range(count):
+        horizontal = rng.random() < 0.5
+        walls.append({
+            "prefabName": "Wall002x10",
+            "position": {
+                "x": rng.uniform(0, side),
+                "y": 9.502197265625,
+                "z": round(rng.uniform(0, side) / 2) * 2 + rng.uniform(-0.6, 0.6),
+            },
+            "rotation": {"x": 0.0, "y": 0.0 if horizontal else 0.7071068286895752, "z": 0.0,
+                         "w": 1.0 if horizontal else 0.7071068286895752},
+        })
+    return walls
+
+def timed(fn, *args):
+    start_time = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start_time) * 1000
+
+def bench(sizes=(1000, 10000, 100000), pairwise_limit=1000):
+    print("adjust_walls on synthetic maps")
+    for count in sizes:
+        walls = synthetic_walls(count)
+        indexed = copy.deepcopy(walls)
+        indexed_ms = timed(adjust_walls, indexed)
+        line = f"  {count:7d} walls  spatial hash {indexed_ms:10.1f} ms"
+        if count <= pairwise_limit:
+            pairwise = copy.deepcopy(walls)
+            pairwise_ms = timed(adjust_walls_pairwise, pairwise)
+            line += f"  pairwise {pairwise_ms:10.1f} ms  identical={pairwise == indexed}"
+        print(line)
+
+if __name__ == '__main__':
+    bench(tuple(int(n) for n in sys.argv[1:]) or (1000, 10000, 100000))
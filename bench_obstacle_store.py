@@ -0,0 +1,42 @@
+import random
+import sys
+import time
+import numpy as np
+
+from obstacle_store import ObstacleStore
+
+def repulsion_loop(obstacles, curr_x, curr_z, lookahead_distance):
+    # team_4_control.get_move의 기존 장애물마다 도는 루프 (비교용)
+    avoidance_vector = np.array([0.0, 0.0])
+    for obs_x, obs_z, obs_radius in obstacles:
+        to_obstacle = np.array([obs_x - curr_x, obs_z - curr_z])
+        distance_to_obs = np.linalg.norm(to_obstacle)
+        if distance_to_obs < obs_radius + lookahead_distance:
+            if distance_to_obs > 0:
+                repulsion = -to_obstacle / distance_to_obs
+                strength = 1.0 - min(1.0, (distance_to_obs - obs_radius) / lookahead_distance)
+                avoidance_vector += repulsion * strength
+    return avoidance_vector
+
+def bench(sizes=(10, 100, 1000, 10000), ticks=200, seed=0):
+    # 300 m x 300 m 맵에 반경 1~5 m 장애물을 흩뿌리고 임의 위치에서 틱당 회피 벡터 계산 시간 비교
+    rng = random.Random(seed)
+    print(f"repulsion per tick (mean of {ticks} ticks, lookahead 1-10 m)")
+    for count in sizes:
+        obstacles = [(rng.uniform(0, 300), rng.uniform(0, 300), rng.uniform(1, 5)) for _ in range(count)]
+        store = ObstacleStore()
+        for obstacle in obstacles:
+            store.add(*obstacle)
+        queries = [(rng.uniform(0, 300), rng.uniform(0, 300), rng.uniform(1, 10)) for _ in range(ticks)]
+
+        start_time = time.perf_counter()
+        expected = [repulsion_loop(obstacles, *query) for query in queries]
+        loop_us = (time.perf_counter() - start_time) / ticks * 1e6
+        start_time = time.perf_counter()
+        result = [store.repulsion(*query) for query in queries]
+        store_us = (time.perf_counter() - start_time) / ticks * 1e6
+        error = max(float(np.abs(a - b).max()) for a, b in zip(expected, result))
+        print(f"  {count:6d} obstacles  loop {loop_us:10.1f} us  store {store_us:8.1f} us  max error {error:.2e}")
+
+if __name__ == '__main__':
+    bench(tuple(int(n) for n in sys.argv[1:]) or (10, 100, 1000, 10000))
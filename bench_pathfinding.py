@@ -0,0 +1,459 @@
+import heapq
+import json
+import math
+import random
+import sys
+import time
+import numpy as np
+
+from semple_astar import Grid, Pathfinding, AnyAnglePathfinding, BidirectionalPathfinding, NavigationController, NavigationConfig
+from dstar_lite import DStarLite
+from hpa_star import HierarchicalPathfinding
+from flow_field import FlowFieldService
+from jps import JumpPointSearch
+from grid_astar import GridAStar
+from multires import MultiResolutionPathfinding
+from path_smoothing import smooth_path, min_turn_radius
+from space_time import EnemyTracker, SpaceTimePlanner
+from mpc import MPCController
+from map_loader import load_map_mask, load_walls, oriented_boxes, rasterize_boxes
+
+MAP_FILE = "map.map"
+BLUE_START = (60.0, 27.23)
+ENEMY_START = (135.46, 276.87)
+RED_START = (59.0, 280.0)
+
+def load_map_rects(file_path=MAP_FILE):
+    # Wall002x10 (10 x 2) 프리팹을 축 정렬 사각형으로 변환 (0°/90°만 고려)
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    rects = []
+    for wall in data['obstacles']:
+        x, z = wall['position']['x'], wall['position']['z']
+        if abs(wall['rotation']['y']) < 0.1:  # 가로
+            rects.append((x - 5, x + 5, z - 1, z + 1))
+        else:  # 세로
+            rects.append((x - 1, x + 1, z - 5, z + 5))
+    return rects
+
+def build_grid(rects=None):
+    grid = Grid(width=300, height=300, padding=1)
+    grid.set_obstacles(load_map_rects() if rects is None else rects)
+    return grid
+
+def timed(fn, *args):
+    start_time = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start_time) * 1000
+
+def bench_replan(steps=20, seed=0):
+    # 경로를 따라 이동하면서 매 스텝 경로 근처에 새 장애물이 들어오는 상황 재현
+    random.seed(seed)
+    grid = build_grid()
+    astar, dstar = Pathfinding(), DStarLite()
+    path, astar_first_ms = timed(astar.find_path, BLUE_START, ENEMY_START, grid)
+    astar_first_exp = astar.expansions
+    _, first_ms = timed(dstar.find_path, BLUE_START, ENEMY_START, grid)
+    dstar_first_exp = dstar.expansions
+
+    astar_ms, dstar_ms = [], []
+    position = BLUE_START
+    for step in range(steps):
+        if len(path) > 10:
+            position = path[min(len(path) - 1, 5)]
+            ahead_x, ahead_z = path[min(len(path) - 1, 40)]
+            x = ahead_x + random.uniform(-3, 3)
+            z = ahead_z + random.uniform(-3, 3)
+            grid.set_obstacles([(x - 2, x + 2, z - 2, z + 2)])
+        path, ms = timed(astar.find_path, position, ENEMY_START, grid)
+        astar_ms.append(ms)
+        dstar_path, ms = timed(dstar.find_path, position, ENEMY_START, grid)
+        dstar_ms.append(ms)
+        if len(path) != len(dstar_path):
+            print(f"  step {step}: path length differs (A* {len(path)}, D* Lite {len(dstar_path)})")
+
+    print("replan latency on map.map, blue start -> enemy start")
+    # D* Lite는 첫 탐색 비용을 재탐색으로 회수해야 함 (목표가 바뀔 때마다 다시 첫 탐색)
+    print(f"  A*      initial search : {astar_first_ms:8.2f} ms  ({astar_first_exp} expansions)")
+    print(f"  D* Lite initial search : {first_ms:8.2f} ms  ({dstar_first_exp} expansions)")
+    print(f"  A*      replan mean    : {sum(astar_ms) / steps:8.2f} ms  (max {max(astar_ms):.2f})")
+    print(f"  D* Lite replan mean    : {sum(dstar_ms) / steps:8.2f} ms  (max {max(dstar_ms):.2f})")
+
+QUERIES = [
+    (BLUE_START, ENEMY_START),
+    ((20.0, 20.0), (280.0, 280.0)),
+    ((110.0, 60.0), (230.0, 250.0)),
+    ((280.0, 30.0), (30.0, 270.0)),
+]
+
+def bench_anyangle():
+    # 4방향 A* 대비 노드 확장 수, 시간, 웨이포인트 개수 비교
+    grid = build_grid()
+    planners = [("A* 4-dir", Pathfinding()), ("any-angle", AnyAnglePathfinding())]
+    print("any-angle vs 4-connected A* on map.map")
+    for start, goal in QUERIES:
+        for name, planner in planners:
+            path, ms = timed(planner.find_path, start, goal, grid)
+            print(f"  {str(start):>14} -> {str(goal):<14} {name:<10} {ms:8.2f} ms "
+                  f"expansions={planner.expansions:6d} waypoints={len(path)}")
+
+def path_cost(path, grid):
+    costs = grid.entry_costs()
+    return sum(costs[grid.cell_from_world_point(x, z)] for x, z in path[1:])
+
+def bench_hpa():
+    # 추상 그래프 구성/증분 갱신 시간과 긴 질의의 시간, 확장 수, 경로 비용 비율
+    grid = build_grid()
+    astar, hpa = Pathfinding(), HierarchicalPathfinding(Pathfinding())
+    _, build_ms = timed(hpa.prepare, grid)
+    print(f"HPA* on map.map (cluster {hpa.cluster_size} m): full build {build_ms:.1f} ms, {hpa.rebuilt_clusters} clusters")
+    slower = 0
+    for start, goal in QUERIES:
+        flat, flat_ms = timed(astar.find_path, start, goal, grid)
+        path, hpa_ms = timed(hpa.find_path, start, goal, grid)
+        ratio = path_cost(path, grid) / path_cost(flat, grid) if flat else float("nan")
+        slower += hpa_ms > flat_ms
+        print(f"  {str(start):>14} -> {str(goal):<14} A* {flat_ms:7.2f} ms ({astar.expansions:6d} exp)  "
+              f"HPA* {hpa_ms:6.2f} ms ({hpa.expansions:5d} exp)  cost ratio {ratio:.3f}  speedup {flat_ms / hpa_ms:4.2f}x")
+    grid.set_obstacles([(140, 160, 150, 152)])
+    _, update_ms = timed(hpa.prepare, grid)
+    print(f"  incremental update after one wall: {update_ms:.1f} ms, {hpa.rebuilt_clusters} clusters rebuilt")
+    # 300x300 map.map에서는 평면 A*가 이미 수백 칸만 확장하므로 HPA*가 이기지 못함 (구성 비용도 회수 못 함)
+    print(f"  HPA* slower than flat A* on {slower}/{len(QUERIES)} queries")
+
+def bench_flow():
+    # 거리장 계산 시간, 틱당 lookahead 조회 시간, 거리장을 휴리스틱으로 쓴 A*
+    grid = build_grid()
+    flow_fields = FlowFieldService()
+    astar = Pathfinding(flow_fields)
+    _, plain_ms = timed(astar.find_path, BLUE_START, ENEMY_START, grid)
+    plain_expansions = astar.expansions
+    field, field_ms = timed(flow_fields.field, grid, ENEMY_START)
+    _, exact_ms = timed(astar.find_path, BLUE_START, ENEMY_START, grid)
+    cells = [grid.cell_from_world_point(random.uniform(0, 300), random.uniform(0, 300)) for _ in range(10000)]
+    start_time = time.perf_counter()
+    for cell in cells:
+        grid.cell_coords(int(field.lookahead[cell]))
+    lookup_us = (time.perf_counter() - start_time) / len(cells) * 1e6
+    print("flow field to enemy start on map.map")
+    print(f"  field build             : {field_ms:8.2f} ms")
+    print(f"  lookahead per tick      : {lookup_us:8.2f} us")
+    print(f"  A* manhattan heuristic  : {plain_ms:8.2f} ms ({plain_expansions} expansions)")
+    print(f"  A* field heuristic      : {exact_ms:8.2f} ms ({astar.expansions} expansions)")
+
+def bench_jps(repeat=5):
+    # 같은 8방향 비용 모델의 A*(AnyAnglePathfinding.find_cell_path)와 기본 4방향 A* 대비
+    grid = build_grid()
+    octile, jps = AnyAnglePathfinding(), JumpPointSearch()
+    planners = [
+        ("A* 4-dir", Pathfinding(), Pathfinding.find_path),
+        ("A* 8-dir", octile, AnyAnglePathfinding.find_cell_path),
+        ("JPS", jps, JumpPointSearch.find_path),
+    ]
+    print(f"JPS vs A* on map.map (best of {repeat})")
+    for start, goal in QUERIES:
+        for name, planner, search in planners:
+            best = min(timed(search, planner, start, goal, grid)[1] for _ in range(repeat))
+            path = search(planner, start, goal, grid)
+            print(f"  {str(start):>14} -> {str(goal):<14} {name:<9} {best:8.2f} ms "
+                  f"expansions={planner.expansions:6d} cells={len(path)}")
+
+def bench_batch(count=36, radius=25.0):
+    # 적 주변 원 위의 후보 사격 위치들: 목표마다 A* 한 번씩 vs 다중 목표 탐색 한 번
+    grid = build_grid()
+    astar = Pathfinding()
+    ex, ez = ENEMY_START
+    goals = [(ex + radius * math.cos(2 * math.pi * i / count), ez + radius * math.sin(2 * math.pi * i / count))
+             for i in range(count)]
+    start_time = time.perf_counter()
+    separate = [path_cost(astar.find_path(BLUE_START, goal, grid), grid) for goal in goals]
+    separate_ms = (time.perf_counter() - start_time) * 1000
+    (costs, _), batch_ms = timed(astar.find_paths, BLUE_START, goals, grid)
+    mismatches = sum(1 for a, b in zip(separate, costs) if a and a != b)
+    print(f"{count} candidate goals around enemy start on map.map")
+    print(f"  separate A* queries : {separate_ms:8.2f} ms")
+    print(f"  one batch search    : {batch_ms:8.2f} ms ({astar.expansions} expansions, {mismatches} cost mismatches)")
+
+def bench_mapload(repeat=20):
+    # 회전 사각형 래스터화(캐시 없음) vs 해시 캐시 mmap 로드, 그리고 기존 0°/90° 사각형 경로와 일치 여부
+    _, build_ms = timed(lambda: rasterize_boxes(oriented_boxes(load_walls(MAP_FILE)), 300, 300))
+    load_map_mask(MAP_FILE)
+    cached_ms = min(timed(load_map_mask, MAP_FILE)[1] for _ in range(repeat))
+    mask = load_map_mask(MAP_FILE)
+    grid = Grid(width=300, height=300, padding=1)
+    _, apply_ms = timed(grid.set_obstacle_mask, mask)
+    mismatches = int((grid.is_obstacle != build_grid().is_obstacle).sum())
+    print(f"map loading for {MAP_FILE}")
+    print(f"  parse + rasterize     : {build_ms:8.2f} ms")
+    print(f"  cached mask load      : {cached_ms:8.2f} ms")
+    print(f"  apply mask to grid    : {apply_ms:8.2f} ms ({mismatches} cells differ from axis-aligned rects)")
+
+def dict_astar(start, goal, blocked, cell_size):
+    # pure_.a_star의 기존 방식: 튜플 키 dict + 중복 항목 heapq (이웃 검사/휴리스틱 오타만 고친 비교용)
+    n = blocked.shape[0]
+    open_set = [(0, start)]
+    came_from = {}
+    g_score = {start: 0}
+    closed = set()
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        if current in closed:
+            continue
+        closed.add(current)
+        if current == goal:
+            path = []
+            while current in came_from:
+                path.append((current[0] * cell_size, current[1] * cell_size))
+                current = came_from[current]
+            path.append((start[0] * cell_size, start[1] * cell_size))
+            return path[::-1], len(closed)
+        for dx, dz in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            neighbor = (current[0] + dx, current[1] + dz)
+            if 0 <= neighbor[0] < n and 0 <= neighbor[1] < n and blocked[neighbor[0], neighbor[1]] == 0:
+                tentative_g = g_score[current] + (math.sqrt(dx**2 + dz**2) * cell_size)
+                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    f = tentative_g + math.sqrt((neighbor[0] - goal[0])**2 + (neighbor[1] - goal[1])**2)
+                    heapq.heappush(open_set, (f, neighbor))
+    return [], len(closed)
+
+def bench_ipq(queries=20, seed=0):
+    # pure_.a_star 탐색: dict/중복 heapq vs 평면 배열/decrease-key 힙, 초당 확장 수
+    rng = random.Random(seed)
+    blocked = (np.random.default_rng(seed).random((300, 300)) < 0.2).astype(np.uint8)
+    pairs = []
+    while len(pairs) < queries:
+        a, b = (rng.randrange(300), rng.randrange(300)), (rng.randrange(300), rng.randrange(300))
+        if not blocked[a] and not blocked[b]:
+            pairs.append((a, b))
+    search = GridAStar()
+    dict_expansions, ipq_expansions, mismatches = 0, 0, 0
+    start_time = time.perf_counter()
+    reference = []
+    for a, b in pairs:
+        path, expanded = dict_astar(a, b, blocked, 10)
+        reference.append(len(path))
+        dict_expansions += expanded
+    dict_s = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for (a, b), expected in zip(pairs, reference):
+        path = search.find_path(a, b, blocked, 10)
+        ipq_expansions += search.expansions
+        mismatches += len(path) != expected
+    ipq_s = time.perf_counter() - start_time
+    print(f"pure_ grid A* on 300x300 with 20% random blocks, {queries} queries")
+    print(f"  dict + duplicate heapq : {dict_s * 1000:8.1f} ms  {dict_expansions / dict_s:9.0f} expansions/s")
+    print(f"  dense + indexed heap   : {ipq_s * 1000:8.1f} ms  {ipq_expansions / ipq_s:9.0f} expansions/s  "
+          f"({mismatches} path length mismatches)")
+
+def bench_bidir(repeat=5, walls=300, seed=0):
+    # 맵을 가로지르는 긴 질의에서 단방향 A* vs 양방향 A* (맵 그대로 + 임의 벽을 더 깐 맵)
+    rng = random.Random(seed)
+    clutter = []
+    for _ in range(walls):
+        x, z = rng.uniform(10, 290), rng.uniform(40, 260)
+        clutter.append((x - 5, x + 5, z - 1, z + 1) if rng.random() < 0.5 else (x - 1, x + 1, z - 5, z + 5))
+    queries = [(BLUE_START, RED_START)] + QUERIES
+    planners = [("A*", Pathfinding()), ("bidir A*", BidirectionalPathfinding())]
+    for label, grid in (("map.map", build_grid()), (f"map.map + {walls} random walls", build_grid(load_map_rects() + clutter))):
+        print(f"bidirectional vs unidirectional A* on {label} (best of {repeat})")
+        for start, goal in queries:
+            for name, planner in planners:
+                best = min(timed(planner.find_path, start, goal, grid)[1] for _ in range(repeat))
+                cost = path_cost(planner.find_path(start, goal, grid), grid)
+                print(f"  {str(start):>14} -> {str(goal):<17} {name:<9} {best:8.2f} ms "
+                      f"expansions={planner.expansions:6d} cost={cost:.0f}")
+
+def bench_multires(queries=200, walls=300, seed=0):
+    # 거친 격자 + 1 m 통로 정제 vs 1 m A*: 임의 질의의 총 확장 수/시간과 경로 비용 비율 (최악/평균)
+    rng = random.Random(seed)
+    clutter = []
+    for _ in range(walls):
+        x, z = rng.uniform(10, 290), rng.uniform(40, 260)
+        clutter.append((x - 5, x + 5, z - 1, z + 1) if rng.random() < 0.5 else (x - 1, x + 1, z - 5, z + 5))
+    for label, grid in (("map.map", build_grid()), (f"map.map + {walls} random walls", build_grid(load_map_rects() + clutter))):
+        astar, multires = Pathfinding(), MultiResolutionPathfinding(Pathfinding())
+        _, build_ms = timed(multires.prepare, grid)
+        pairs = []
+        while len(pairs) < queries:
+            a = (rng.uniform(0, 300), rng.uniform(0, 300))
+            b = (rng.uniform(0, 300), rng.uniform(0, 300))
+            if not grid.is_obstacle[int(a[0]), int(a[1])] and not grid.is_obstacle[int(b[0]), int(b[1])]:
+                pairs.append((a, b))
+        flat_ms = multi_ms = 0.0
+        flat_exp = multi_exp = coarse_exp = path_cells = 0
+        ratios, levels = [], {}
+        for start, goal in pairs:
+            flat, ms = timed(astar.find_path, start, goal, grid)
+            flat_ms += ms
+            flat_exp += astar.expansions
+            path, ms = timed(multires.find_path, start, goal, grid)
+            multi_ms += ms
+            multi_exp += multires.expansions
+            coarse_exp += multires.coarse_expansions
+            levels[multires.level] = levels.get(multires.level, 0) + 1
+            if flat:
+                path_cells += len(flat)
+                ratios.append(path_cost(path, grid) / path_cost(flat, grid))
+        used = ", ".join(f"{level or 'fallback'}: {count}" for level, count in sorted(levels.items(), key=lambda kv: kv[0] or 0))
+        print(f"multi-resolution vs 1 m A* on {label}, {queries} random queries (pyramid {build_ms:.1f} ms)")
+        print(f"  1 m A*      : {flat_ms:8.1f} ms  expansions={flat_exp:7d}  (path cells {path_cells})")
+        print(f"  multires    : {multi_ms:8.1f} ms  expansions={multi_exp:7d}  (coarse {coarse_exp}, levels {used})")
+        print(f"  cost ratio  : worst {max(ratios):.3f}  mean {sum(ratios) / len(ratios):.4f}")
+
+def heading_changes(points):
+    # 연속한 웨이포인트 사이 진행 방향 변화: (변화가 있는 횟수, 절대값 합 deg)
+    headings = [math.atan2(b[0] - a[0], b[1] - a[1]) for a, b in zip(points, points[1:]) if a != b]
+    turns = [abs(math.atan2(math.sin(h1 - h0), math.cos(h1 - h0))) for h0, h1 in zip(headings, headings[1:])]
+    return sum(1 for t in turns if t > 1e-6), math.degrees(sum(turns))
+
+def bench_smooth(spacing=15.0):
+    # 칸 경로 vs 후처리 경로: 웨이포인트 수, 방향 전환 횟수/누적 각, 후처리 시간
+    grid = build_grid()
+    astar = Pathfinding()
+    print(f"path post-processing on map.map (spacing {spacing} m, turn radius {min_turn_radius():.1f} m)")
+    for start, goal in [(BLUE_START, RED_START)] + QUERIES:
+        cells = astar.find_path(start, goal, grid)
+        (points, limits), ms = timed(smooth_path, cells, grid, spacing)
+        raw_turns, raw_deg = heading_changes(cells)
+        turns, deg = heading_changes([cells[0]] + points)
+        print(f"  {str(start):>14} -> {str(goal):<17} cells={len(cells):4d} turns={raw_turns:3d} ({raw_deg:6.0f} deg)  "
+              f"smoothed={len(points):3d} turns={turns:3d} ({deg:4.0f} deg) min speed {min(limits):5.1f} m/s  {ms:6.2f} ms")
+
+def min_separation(path, tracker, speed):
+    # 경로를 speed (칸/초)로 따라갈 때 적 예측 위치와의 최소 거리
+    return min(math.dist(cell, tracker.predict(i / speed)) for i, cell in enumerate(path))
+
+def densify(points, step=1.0):
+    # 웨이포인트 꺾은선을 step 간격 점으로 (min_separation이 칸 경로처럼 시간을 셀 수 있게)
+    dense = [points[0]]
+    for (ax, az), (bx, bz) in zip(points, points[1:]):
+        count = max(1, int(math.ceil(math.dist((ax, az), (bx, bz)) / step)))
+        dense.extend((ax + (bx - ax) * k / count, az + (bz - az) * k / count) for k in range(1, count + 1))
+    return dense
+
+def bench_spacetime(budgets=(60.0, 20.0, 5.0)):
+    # 적 시나리오별 정적 A* vs 시공간 A*: 계획 시간, 확장 수, 예산 초과 여부, 적과의 최소 거리
+    # 후처리(SMOOTH_PATH, 서버 기본값) 뒤에도 적을 돌아간 구간이 남는지 확인: 위험 튜브를 피하는 단축 vs 벽만 보는 단축
+    grid = build_grid()
+    astar = Pathfinding()
+    scenarios = {
+        "parked on route": (BLUE_START, RED_START, (60.0, 150.0, 0.0, 0.0)),
+        "crossing +x": (BLUE_START, RED_START, (20.0, 120.0, 5.0, 90.0)),
+        "head-on": (BLUE_START, RED_START, (60.0, 250.0, 8.0, 180.0)),
+        "parked x=200": ((200.0, 30.0), (200.0, 280.0), (200.0, 150.0, 0.0, 0.0)),
+        "parked x=250": ((250.0, 30.0), (250.0, 280.0), (250.0, 150.0, 0.0, 0.0)),
+    }
+    print("space-time A* vs static A* (separation: static -> raw -> smoothed avoiding the tube / walls only)")
+    for label, (start, goal, (x, z, speed, body_deg)) in scenarios.items():
+        static = astar.find_path(start, goal, grid)
+        for budget in budgets:
+            tracker = EnemyTracker()
+            tracker.observe(x, z, speed, body_deg, now=time.time() + 3600)  # 경과 시간 보정이 0이 되게
+            planner = SpaceTimePlanner(Pathfinding(), tracker, budget_ms=budget)
+            # 첫 계획은 꼬리 시간 추정이 없으므로 따로 보고, 이후 재계획 (같은 플래너) 시간의 최댓값과 비교
+            path = planner.find_path(start, goal, grid)
+            first_ms, truncated = planner.plan_ms, planner.truncated
+            smoothed, _ = smooth_path(path, grid, 15.0, avoid=planner.avoid_mask)
+            walls_only, _ = smooth_path(path, grid, 15.0)
+            replan_ms = 0.0
+            for _ in range(5):
+                planner.find_path(start, goal, grid)
+                replan_ms = max(replan_ms, planner.plan_ms)
+            separations = [min_separation(p, tracker, planner.speed)
+                           for p in (static, path, densify([start] + smoothed), densify([start] + walls_only))]
+            kept = "kept" if separations[2] >= 0.8 * separations[1] else "LOST"
+            print(f"  {label:<16} budget {budget:4.0f} ms: first {first_ms:6.1f} ms  replan max {replan_ms:6.1f} ms  "
+                  f"truncated={truncated!s:<5}  separation {separations[0]:5.1f} -> {separations[1]:5.1f} -> "
+                  f"{separations[2]:5.1f} m ({kept}) / walls only {separations[3]:5.1f} m")
+
+def drive(controller, grid, start, goal, max_ticks=3000, truth_speed=1.0, terrain=None):
+    # 폐루프 주행: get_move 명령을 predict_state 운동 모델(MPCController.step)로 실제 위치에 반영하고 매 틱 /info처럼 알려줌
+    # truth_speed < 1이면 실제 전차가 제어기 모델보다 느림 (모델 오차가 있을 때의 추정/추종 확인용)
+    # terrain(x, z) -> 지면 높이를 주면 /info의 playerPos.y처럼 매 틱 높이도 관측시킴
+    # 차체 각도 /info의 playerBodyX처럼 알려줌 (제자리 회전은 위치 변화로 안 보임). 난수는 제어기 RNG(config.SEED)만 씀
+    truth = MPCController(max_speed=MPCController().max_speed * truth_speed)
+    position, heading = start, 0.0
+    controller.update_position(f"{start[0]},0,{start[1]}", math.degrees(heading))
+    controller.set_destination(f"{goal[0]},0,{goal[1]}")
+    keys, min_clearance = [], math.inf
+    for tick in range(max_ticks):
+        move = controller.get_move()
+        if controller.completed:
+            return tick, keys, min_clearance
+        keys.append(move["move"])
+        if move["move"] != "STOP":
+            position, heading = truth.step(position[0], position[1], heading, move["move"], move["weight"])
+        min_clearance = min(min_clearance, grid.clearance.at(*position))
+        controller.update_position(f"{position[0]},0,{position[1]}", math.degrees(heading))
+        if terrain is not None:
+            controller.observe_height(position[0], position[1], terrain(*position))
+    return None, keys, min_clearance
+
+def bench_mpc():
+    # 휴리스틱(랜덤 가중 선택) vs MPC 제어: 도착까지 틱 수, 키 전환 횟수, 벽까지 최소 거리, 틱당 MPC 시간
+    grid = build_grid()
+    print(f"closed-loop drive on map.map, dt {MPCController().dt} s")
+    for start, goal in [(BLUE_START, RED_START)] + QUERIES:
+        for mode, truth_speed in (("heuristic", 1.0), ("mpc", 1.0), ("mpc", 0.8)):
+            controller = NavigationController(NavigationConfig(SMOOTH_PATH=True, CONTROLLER=mode, SEED=0), Pathfinding(), grid)
+            start_time = time.perf_counter()
+            ticks, keys, min_clearance = drive(controller, grid, start, goal, truth_speed=truth_speed)
+            tick_ms = (time.perf_counter() - start_time) * 1000 / max(len(keys), 1)
+            switches = sum(1 for a, b in zip(keys, keys[1:]) if a != b)
+            label = mode if truth_speed == 1.0 else f"{mode}@{truth_speed}x"
+            print(f"  {str(start):>14} -> {str(goal):<17} {label:<9}: ticks={str(ticks):>5}  switches={switches:4d}  "
+                  f"min clearance {min_clearance:4.1f} m  {tick_ms:5.2f} ms/tick  overruns={controller.mpc.overruns}")
+
+def hill(x, z, center=(60.0, 150.0), peak=20.0, width=10.0):
+    # 파랑 시작 -> 빨강 시작 직선 위의 가파른 언덕 (경사 비용을 알면 돌아가는 경로가 나옴)
+    return peak * math.exp(-((x - center[0]) ** 2 + (z - center[1]) ** 2) / (2 * width ** 2))
+
+def bench_replay(trace_file="bench_trace.bin"):
+    # 기록 -> 재생 왕복: 출발 전에 적이 언덕을 훑고 지나간 높이(enemyPos.y)와 주행 중 매 틱 높이를 관측.
+    # HEIGHT 레코드를 재생해야 같은 비용 지도로 계획해 결정이 모두 일치함 (무시하면 첫 계획부터 다른 경로)
+    from replay_trace import replay
+    from decision_trace import read_trace, HEIGHT
+    print("decision trace replay over a hill (heights: enemy survey + every tick)")
+    for mode in ("heuristic", "mpc"):
+        grid = build_grid()
+        config = NavigationConfig(SMOOTH_PATH=True, CONTROLLER=mode, SEED=1, TRACE_FILE=trace_file)
+        controller = NavigationController(config, Pathfinding(), grid)
+        controller.mpc.budget_ms = math.inf  # 예산 초과 여부는 실행 속도에 따라 달라 재생되지 않음
+        for x in range(30, 91):
+            for z in range(120, 181):
+                controller.observe_height(x + 0.5, z + 0.5, hill(x + 0.5, z + 0.5))
+        ticks, keys, _ = drive(controller, grid, BLUE_START, RED_START, terrain=hill)
+        controller.trace.close()
+        heights = sum(record[0] == HEIGHT for record in read_trace(trace_file)[2])
+        result = replay(trace_file, {"CONTROLLER": mode}, grid=build_grid())
+        flat = build_grid()
+        flat.observe_height = lambda x, z, y: None  # 높이를 기록하지 않던 때의 재생
+        without = replay(trace_file, {"CONTROLLER": mode}, grid=flat)
+        print(f"  {mode:<9}: ticks={ticks}  heights={heights}  sloped cells={grid.layers.stats()['sloped_cells']}  "
+              f"decisions={result['decisions']}  mismatches={result['mismatches']}  "
+              f"(heights ignored: {without['mismatches']}, first at decision "
+              f"{without['first_divergence'] and without['first_divergence']['decision']})")
+
+BENCHMARKS = {
+    "replan": bench_replan,
+    "anyangle": bench_anyangle,
+    "hpa": bench_hpa,
+    "flow": bench_flow,
+    "jps": bench_jps,
+    "batch": bench_batch,
+    "mapload": bench_mapload,
+    "ipq": bench_ipq,
+    "bidir": bench_bidir,
+    "multires": bench_multires,
+    "smooth": bench_smooth,
+    "spacetime": bench_spacetime,
+    "mpc": bench_mpc,
+    "replay": bench_replay,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
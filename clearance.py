@@ -0,0 +1,60 @@
+import math
+import numpy as np
+
+# 장애물까지의 유클리드 거리장 (칸 중심 기준, 1칸 = 1 m)
+# 분리 가능한 두 단계로 정확히 계산한다:
+#   1) 열(z) 방향: 같은 x 줄에서 가장 가까운 장애물까지의 거리 g
+#   2) 행(x) 방향: D(x, z)^2 = min_s g(x + s, z)^2 + s^2  (|s| <= max_distance)
+# max_distance보다 먼 칸은 max_distance로 잘라 두므로, 장애물이 추가되면 추가된 칸에서
+# max_distance 안쪽 창만 다시 계산해 기존 값과 min을 취하면 된다 (거리는 줄어들기만 함).
+class ClearanceField:
+    def __init__(self, walls, max_distance=20):
+        self.walls = walls  # Grid.is_obstacle 공유
+        self.width, self.height = walls.shape
+        self.max_distance = max_distance
+        self.distance = np.full(walls.shape, float(max_distance))
+        self.flat = memoryview(self.distance.reshape(-1))
+        self.rebuild()
+
+    def rebuild(self):
+        self.distance[:] = self._transform(self.walls.astype(bool))
+
+    def add_obstacles(self, added):
+        # added: 새로 장애물이 된 칸 (width, height) bool 배열
+        xs, zs = np.nonzero(added)
+        if len(xs) == 0:
+            return
+        reach = int(math.ceil(self.max_distance))
+        x0, x1 = max(0, xs.min() - reach), min(self.width, xs.max() + reach + 1)
+        z0, z1 = max(0, zs.min() - reach), min(self.height, zs.max() + reach + 1)
+        window = self.distance[x0:x1, z0:z1]
+        np.minimum(window, self._transform(added[x0:x1, z0:z1]), out=window)
+
+    def _transform(self, occupied):
+        cap = self.max_distance
+        width, height = occupied.shape
+        # 1) z 방향: 앞/뒤로 가장 최근 장애물 위치를 누적해서 가까운 쪽 거리
+        index = np.arange(height, dtype=float)
+        before = np.maximum.accumulate(np.where(occupied, index, -np.inf), axis=1)
+        after = np.flip(np.minimum.accumulate(np.flip(np.where(occupied, index, np.inf), 1), axis=1), 1)
+        column = np.minimum(index - before, after - index)
+        column_sq = np.minimum(column, cap + 1) ** 2
+        # 2) x 방향: 이동량 s마다 한 번씩 min-plus
+        best = column_sq.copy()
+        for s in range(1, min(width, int(math.ceil(cap)) + 1)):
+            shift_sq = s * s
+            np.minimum(best[s:], column_sq[:-s] + shift_sq, out=best[s:])
+            np.minimum(best[:-s], column_sq[s:] + shift_sq, out=best[:-s])
+        return np.minimum(np.sqrt(best), cap)
+
+    def at(self, world_x, world_z):
+        x = max(0, min(int(world_x), self.width - 1))
+        z = max(0, min(int(world_z), self.height - 1))
+        return self.flat[x * self.height + z]
+
+    def gradient(self, world_x, world_z):
+        # 중앙 차분 (벽에서 멀어지는 방향), 조향에서 밀어내는 방향으로 사용
+        x = max(1, min(int(world_x), self.width - 2))
+        z = max(1, min(int(world_z), self.height - 2))
+        d = self.distance
+        return (d[x + 1, z] - d[x - 1, z]) / 2.0, (d[x, z + 1] - d[x, z - 1]) / 2.0
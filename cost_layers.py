@@ -0,0 +1,114 @@
+import numpy as np
+
+INF = float("inf")
+
+# 층별 비용 지도
+# walls     : 장애물 점유 (Grid.is_obstacle을 그대로 공유, 진입 불가)
+# inflation : 장애물에서 체비셰프 거리 d(1..radius)인 칸에 inflation_cost * decay**(d-1)
+#             (clearance 거리장을 주면 유클리드 거리 0 < d <= clearance_threshold인 칸에 같은 식)
+# slope     : 주행 중 관측한 높이(playerPos.y 등)로 학습한 경사 비용, 관측된 4-이웃과의 최대 높이차 * slope_cost를
+#             slope_step 단위로 양자화한 값 (관측 잡음으로 비용이 조금씩 흔들려도 층/맵 버전이 바뀌지 않게)
+# 층이 바뀌면 결합 배열만 무효화하고, combined()가 불릴 때 한 번 다시 합친다.
+class CostLayers:
+    def __init__(self, walls, move_cost=10, inflation_cost=5, inflation_radius=1, inflation_decay=1.0,
+                 slope_cost=20, slope_step=5.0, clearance=None, clearance_threshold=None):
+        self.walls = walls
+        self.width, self.height = walls.shape
+        self.move_cost = move_cost
+        self.inflation_cost = inflation_cost
+        self.inflation_radius = inflation_radius
+        self.inflation_decay = inflation_decay
+        self.slope_cost = slope_cost
+        self.slope_step = slope_step  # 경사 비용 양자화 단위 (기본 이동 비용의 절반 = 1 m당 0.25 m 높이차)
+        self.clearance = clearance
+        self.clearance_threshold = clearance_threshold
+        self.inflation = np.zeros(walls.shape)
+        self.slope = np.zeros(walls.shape)
+        self.height_sum = np.zeros(walls.shape)
+        self.height_count = np.zeros(walls.shape, dtype=np.int32)
+        self._walls_dirty = True
+        self._combined = None
+
+    def walls_changed(self):
+        self._walls_dirty = True
+        self._combined = None
+
+    def combined(self):
+        # 평면 float 배열 (cell = x * height + z), 장애물은 inf
+        if self._combined is None:
+            if self._walls_dirty:
+                self._inflate()
+            costs = (self.move_cost + self.inflation + self.slope).reshape(-1)
+            costs[self.walls.reshape(-1) == 1] = INF
+            self._combined = costs
+        return self._combined
+
+    def _inflate(self):
+        self.inflation[:] = 0.0
+        if self.clearance is not None:
+            # 거리장에서 바로 읽음 (칸마다 O(1), 팽창 반복 없음)
+            distance = self.clearance.distance
+            near = (distance > 0) & (distance <= self.clearance_threshold)
+            self.inflation[near] = self.inflation_cost * self.inflation_decay ** (distance[near] - 1)
+            self._walls_dirty = False
+            return
+        # 장애물을 한 칸씩 팽창시키며 새로 덮인 고리에 거리별 비용 기록
+        covered = self.walls.astype(bool)
+        for distance in range(1, self.inflation_radius + 1):
+            grown = covered.copy()
+            grown[1:, :] |= covered[:-1, :]
+            grown[:-1, :] |= covered[1:, :]
+            rows = grown.copy()
+            grown[:, 1:] |= rows[:, :-1]
+            grown[:, :-1] |= rows[:, 1:]
+            ring = grown & ~covered
+            self.inflation[ring] = self.inflation_cost * self.inflation_decay ** (distance - 1)
+            covered = grown
+        self._walls_dirty = False
+
+    def observe_height(self, x, z, y):
+        # 관측 높이를 칸 평균에 반영하고 그 칸과 4-이웃의 경사 비용을 국소적으로 갱신
+        # 경사 층이 실제로 바뀌었으면 True
+        x = max(0, min(int(x), self.width - 1))
+        z = max(0, min(int(z), self.height - 1))
+        self.height_sum[x, z] += y
+        self.height_count[x, z] += 1
+        changed = False
+        for cx, cz in ((x, z), (x + 1, z), (x - 1, z), (x, z + 1), (x, z - 1)):
+            if not (0 <= cx < self.width and 0 <= cz < self.height):
+                continue
+            slope = self._local_slope(cx, cz)
+            # 단계 경계에서 잡음으로 오가지 않게 현재 단계에서 3/4 단계 넘게 벗어날 때만 다음 단계로
+            if abs(slope - self.slope[cx, cz]) >= 0.75 * self.slope_step:
+                level = round(slope / self.slope_step) * self.slope_step
+                if level != self.slope[cx, cz]:
+                    self.slope[cx, cz] = level
+                    changed = True
+        if changed:
+            self._combined = None
+        return changed
+
+    def _local_slope(self, x, z):
+        count = self.height_count[x, z]
+        if not count:
+            return 0.0
+        h = self.height_sum[x, z] / count
+        grade = 0.0
+        for nx, nz in ((x + 1, z), (x - 1, z), (x, z + 1), (x, z - 1)):
+            if 0 <= nx < self.width and 0 <= nz < self.height and self.height_count[nx, nz]:
+                grade = max(grade, abs(h - self.height_sum[nx, nz] / self.height_count[nx, nz]))
+        return self.slope_cost * grade
+
+    def height_map(self):
+        # 관측된 칸의 평균 높이 (관측이 없으면 nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.height_count > 0, self.height_sum / self.height_count, np.nan)
+
+    def stats(self):
+        return {
+            "observed_cells": int(np.count_nonzero(self.height_count)),
+            "sloped_cells": int(np.count_nonzero(self.slope)),
+            "inflation_radius": self.inflation_radius,
+            "clearance_threshold": self.clearance_threshold,
+            "inflation_decay": self.inflation_decay,
+        }
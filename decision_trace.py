@@ -0,0 +1,63 @@
+import json
+import math
+import struct
+
+# 제어기 결정 기록 (이진): 헤더 하나 뒤에 고정 길이 레코드가 이어짐
+# 헤더: 매직, 버전, RNG 시드, 설정 JSON 길이 + 설정 JSON (재생할 때 같은 NavigationConfig로 만듦)
+# 레코드: 종류(u8), 실수 4개(f64), 코드(u8), 가중치(f32) = 38바이트
+#   POSITION  (x, z, 차체 각)               /info 또는 /update_position의 실제 위치 (차체 각 없으면 nan)
+#   GOAL      (x, z), 코드 = 플래너 번호     set_destination (그 시점 실제로 쓸 플래너)
+#   PLAN      (시작 x, z, 목표 x, z), 코드    게시된 경로가 어디서 어떤 플래너로 계획됐는지
+#   MOVE      (x, z, 방향, 웨이포인트 번호), 코드 = 명령, 가중치   get_move 입력 상태와 출력
+#   ENEMY     (x, z, 속도, 차체 각)          적 관측 (없는 값은 nan)
+#   OBSTACLE  (x_min, x_max, z_min, z_max)   장애물 사각형
+#   PLANNER   코드 = 플래너 번호              /set_planner (기본 플래너 변경)
+#   CONTROLLER 코드 = CONTROLLERS 번호        /set_controller
+#   HEIGHT    (x, z, y)                      /info의 지면 높이 관측 (경사 층 → 경로 비용이 바뀌므로 재생에도 필요)
+# 플래너 번호는 NavigationController.planners 순서 + 1
+MAGIC = b"NAVT"
+VERSION = 3
+HEADER = struct.Struct("<4sHqI")
+RECORD = struct.Struct("<BddddBf")
+POSITION, GOAL, PLAN, MOVE, ENEMY, OBSTACLE, PLANNER, CONTROLLER, HEIGHT = range(9)
+MOVES = ("STOP", "W", "A", "S", "D")
+CONTROLLERS = ("heuristic", "mpc")
+
+class DecisionTrace:
+    def __init__(self, path, seed, config, flush_every=64):
+        settings = json.dumps(config).encode()
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, len(settings)) + settings)
+        self.flush_every = flush_every
+        self.records = 0
+
+    def write(self, kind, a=0.0, b=0.0, c=0.0, d=0.0, code=0, weight=0.0):
+        self.file.write(RECORD.pack(kind, a, b, c, d, code, weight))
+        self.records += 1
+        if self.records % self.flush_every == 0:
+            self.file.flush()
+
+    def move(self, x, z, heading, waypoint, move, weight):
+        self.write(MOVE, x, z, heading, waypoint, MOVES.index(move), weight)
+
+    def close(self):
+        self.file.close()
+
+def optional(value):
+    # 기록할 때 None -> nan, 읽을 때 nan -> None
+    if value is None:
+        return math.nan
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+def read_trace(path):
+    # (시드, 설정 dict, [(종류, a, b, c, d, 코드, 가중치), ...])
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, seed, length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a decision trace (v{VERSION}): {path}")
+    start = HEADER.size + length
+    config = json.loads(data[HEADER.size:start])
+    # 마지막 레코드가 잘려 있으면 (기록 중 종료) 버림
+    end = start + (len(data) - start) // RECORD.size * RECORD.size
+    return seed, config, list(RECORD.iter_unpack(data[start:end]))
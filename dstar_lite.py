@@ -0,0 +1,171 @@
+import heapq
+import numpy as np
+
+INF = float("inf")
+
+# D* Lite (Koenig & Likhachev) 증분 경로 탐색
+# 목표에서 시작점 방향으로 탐색 트리를 유지하고, 장애물이 바뀐 칸이나 시작점 이동으로
+# 영향을 받은 영역만 다시 계산한다. semple_astar.Grid 위에서 Pathfinding과 같은
+# find_path(start_pos, target_pos, grid) 형태로 동작한다.
+# 주의: 첫 탐색은 A*보다 훨씬 느림 (bench_pathfinding.py replan 측정: map.map 파랑 시작 -> 적 시작에서
+# 첫 탐색 약 240~280 ms / 16k 확장, A*는 약 3 ms / 373 확장). 키의 둘째 값이 min(g, rhs) 오름차순이라
+# 첫째 키가 같은 평지를 목표 쪽부터 넓게 펼치기 때문. 정확성(증분 복구)이 이 순서에 기대므로 A*처럼 h로
+# 동점을 깨지 않는다 (뒤집으면 첫 탐색은 ~12 ms가 되지만 장애물 추가 후 재탐색이 벽을 지나는 경로를 돌려줌).
+# 재탐색은 A*와 비슷함 (평균 약 2.5 ms vs 2.9 ms). 목표가 자주 바뀌면 매번 첫 탐색이므로 "astar"가 낫다.
+class DStarLite:
+    def __init__(self):
+        self.grid = None
+        self.start = None
+        self.goal = None
+        self.last_start = None
+        self.km = 0.0
+        self.g = []
+        self.rhs = []
+        self.queue = []
+        self.queued = []   # 셀별 현재 유효한 큐 키 (None이면 큐에 없음)
+        self.costs = None  # 마지막으로 반영한 진입 비용 스냅샷
+        self.cost = None   # costs의 평면 뷰 (스칼라 접근용)
+        self.h_scale = 0.0
+        self.expansions = 0
+
+    def find_path(self, start_pos, target_pos, grid):
+        start = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        goal = grid.cell_from_world_point(target_pos[0], target_pos[1])
+        costs = grid.entry_costs()
+
+        if costs[start] == INF or costs[goal] == INF:
+            print("Warning: Start or target position is on an obstacle.")
+            return []
+
+        self.expansions = 0
+        if grid is not self.grid or goal != self.goal:
+            self._initialize(grid, start, goal, costs)
+        else:
+            if start != self.start:
+                # 시작점이 이동하면 키 보정값만 누적 (큐 재정렬 없음)
+                self.km += self._heuristic(self.last_start, start)
+                self.last_start = start
+                self.start = start
+            self._apply_cost_changes(costs)
+
+        self._compute_shortest_path()
+        return self._extract_path()
+
+    def _initialize(self, grid, start, goal, costs):
+        self.grid = grid
+        self.start = start
+        self.last_start = start
+        self.goal = goal
+        self.km = 0.0
+        self.g = [INF] * grid.size
+        self.rhs = [INF] * grid.size
+        self.queued = [None] * grid.size
+        self.queue = []
+        self._snapshot(costs)
+        # 허용 가능한 휴리스틱: 맨해튼 거리 x 최소 진입 비용
+        self.h_scale = float(self.costs.min())
+        self.rhs[goal] = 0.0
+        self._push(goal, self._calculate_key(goal))
+
+    def _snapshot(self, costs):
+        self.costs = costs.copy()
+        self.cost = memoryview(self.costs)
+
+    def _apply_cost_changes(self, costs):
+        changed = np.flatnonzero(costs != self.costs)
+        if len(changed) == 0:
+            return
+        if float(costs.min()) < self.h_scale:
+            # 비용이 최소값 아래로 내려가면 기존 키가 더 이상 허용 가능하지 않음
+            self._initialize(self.grid, self.start, self.goal, costs)
+            return
+        self._snapshot(costs)
+        # 칸 v의 진입 비용이 바뀌면 v로 들어가는 간선(=이웃들의 rhs)만 영향을 받음
+        affected = set()
+        for v in changed.tolist():
+            affected.update(self._neighbors(v))
+        for u in affected:
+            self._update_vertex(u)
+
+    def _neighbors(self, cell):
+        height = self.grid.height
+        x, z = divmod(cell, height)
+        if z + 1 < height:
+            yield cell + 1
+        if x + 1 < self.grid.width:
+            yield cell + height
+        if z > 0:
+            yield cell - 1
+        if x > 0:
+            yield cell - height
+
+    def _heuristic(self, a, b):
+        height = self.grid.height
+        ax, az = divmod(a, height)
+        bx, bz = divmod(b, height)
+        return (abs(ax - bx) + abs(az - bz)) * self.h_scale
+
+    def _calculate_key(self, cell):
+        best = min(self.g[cell], self.rhs[cell])
+        return (best + self._heuristic(self.start, cell) + self.km, best)
+
+    def _push(self, cell, key):
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key[0], key[1], cell))
+
+    def _update_vertex(self, u):
+        g, rhs, cost = self.g, self.rhs, self.cost
+        if u != self.goal:
+            best = INF
+            for s in self._neighbors(u):
+                candidate = cost[s] + g[s]
+                if candidate < best:
+                    best = candidate
+            rhs[u] = best
+        self.queued[u] = None  # 기존 큐 항목은 지연 삭제
+        if g[u] != rhs[u]:
+            self._push(u, self._calculate_key(u))
+
+    def _compute_shortest_path(self):
+        g, rhs, queue, queued = self.g, self.rhs, self.queue, self.queued
+        start = self.start
+        while queue:
+            k1, k2, u = queue[0]
+            if queued[u] != (k1, k2):
+                heapq.heappop(queue)  # 갱신되었거나 제거된 항목
+                continue
+            if (k1, k2) >= self._calculate_key(start) and rhs[start] == g[start]:
+                break
+            heapq.heappop(queue)
+            queued[u] = None
+            self.expansions += 1
+            new_key = self._calculate_key(u)
+            if (k1, k2) < new_key:
+                self._push(u, new_key)
+            elif g[u] > rhs[u]:
+                g[u] = rhs[u]
+                for p in self._neighbors(u):
+                    self._update_vertex(p)
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+                for p in self._neighbors(u):
+                    self._update_vertex(p)
+
+    def _extract_path(self):
+        g, cost = self.g, self.cost
+        current = self.start
+        if g[current] == INF and current != self.goal:
+            return []
+        path = [current]
+        while current != self.goal and len(path) <= self.grid.size:
+            best, best_cost = None, INF
+            for s in self._neighbors(current):
+                candidate = cost[s] + g[s]
+                if candidate < best_cost:
+                    best, best_cost = s, candidate
+            if best is None:
+                return []
+            current = best
+            path.append(current)
+        return [self.grid.cell_coords(cell) for cell in path]
@@ -0,0 +1,125 @@
+from collections import OrderedDict
+import numpy as np
+
+INF = float("inf")
+BLOCKED = 1e9  # 누적합이 inf - inf = nan이 되지 않도록 장애물 비용을 큰 유한값으로 대체
+
+# 목표 기준 거리장 (Dijkstra flow field)
+# dist[x, z] = 그 칸에서 목표까지의 최소 비용 (Pathfinding과 같은 진입 비용 모델, 4방향)
+# next_cell[c] = c에서 한 칸 이동할 최적 이웃, lookahead[c] = next_cell을 steps번 따라간 칸
+class FlowField:
+    def __init__(self, grid, goal_cell, steps=30):
+        self.goal_cell = goal_cell
+        self.version = grid.version
+        self.width, self.height = grid.width, grid.height
+        costs = grid.entry_costs().reshape(grid.width, grid.height)
+        self.dist = self._wavefront(costs, goal_cell)
+        self.dist_flat = memoryview(self.dist.reshape(-1))
+        self.next_cell = self._descend(costs)
+        self.lookahead = self._jump(self.next_cell, steps)
+
+    def _wavefront(self, costs, goal_cell):
+        # 축 방향 min-plus 스윕을 수렴할 때까지 반복
+        # 한 줄에서 D(i) = min_k D(k) + sum(cost[k:i]) 이므로 누적합 S로 쓰면
+        # D = minimum.accumulate(D - S) + S 한 번으로 그 줄 전체가 갱신된다
+        blocked = ~np.isfinite(costs)
+        step_costs = np.where(blocked, BLOCKED, costs)
+        dist = np.full(costs.shape, INF)
+        dist[divmod(goal_cell, self.height)] = 0.0
+        while True:
+            previous = dist.copy()
+            for axis in (0, 1):
+                for flip in (False, True):
+                    d = np.flip(dist, axis) if flip else dist
+                    c = np.flip(step_costs, axis) if flip else step_costs
+                    # i → i-1 → ... → k 로 가면 k..i-1 칸에 진입하므로 S(i) = cost[0] + ... + cost[i-1]
+                    prefix = np.cumsum(c, axis=axis) - c
+                    swept = np.minimum.accumulate(d - prefix, axis=axis) + prefix
+                    swept[swept >= BLOCKED] = INF
+                    swept[np.flip(blocked, axis) if flip else blocked] = INF
+                    dist = np.flip(swept, axis) if flip else swept
+            if np.array_equal(dist, previous):
+                return dist
+
+    def _descend(self, costs):
+        # 각 칸에서 (진입 비용 + 남은 거리)가 가장 작은 이웃을 한 번에 계산
+        width, height = self.width, self.height
+        total = costs + self.dist  # 이웃으로 들어가서 목표까지 가는 비용
+        cells = np.arange(width * height).reshape(width, height)
+        best = np.full((width, height), INF)
+        next_cell = cells.copy()
+        for dx, dz in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            candidate = np.full((width, height), INF)
+            target = np.full((width, height), -1)
+            src_x = slice(max(0, -dx), width - max(0, dx))
+            src_z = slice(max(0, -dz), height - max(0, dz))
+            dst_x = slice(max(0, dx), width - max(0, -dx))
+            dst_z = slice(max(0, dz), height - max(0, -dz))
+            candidate[src_x, src_z] = total[dst_x, dst_z]
+            target[src_x, src_z] = cells[dst_x, dst_z]
+            better = candidate < best
+            best[better] = candidate[better]
+            next_cell[better] = target[better]
+        next_cell = next_cell.reshape(-1)
+        next_cell[self.goal_cell] = self.goal_cell
+        return next_cell
+
+    def _jump(self, next_cell, steps):
+        # 포인터 점프(배가)로 next_cell을 steps번 적용한 결과
+        result = np.arange(len(next_cell))
+        power = next_cell
+        while steps:
+            if steps & 1:
+                result = power[result]
+            power = power[power]
+            steps >>= 1
+        return result
+
+    def distance(self, cell):
+        return self.dist_flat[cell]
+
+    def path_from(self, cell):
+        # next_cell을 따라가며 목표까지의 셀 좌표 목록 (탐색 없음)
+        if self.dist_flat[cell] == INF:
+            return []
+        path = [cell]
+        while cell != self.goal_cell:
+            cell = int(self.next_cell[cell])
+            path.append(cell)
+        return [divmod(c, self.height) for c in path]
+
+class FlowFieldService:
+    # (목표 셀, 장애물 맵 버전)마다 거리장을 한 번만 계산해 보관
+    def __init__(self, maxsize=8, steps=30):
+        self.maxsize = maxsize
+        self.steps = steps
+        self.fields = OrderedDict()
+
+    def lookup(self, grid, goal_cell):
+        # 이미 계산된 거리장이 있을 때만 반환 (계산하지 않음)
+        field = self.fields.get((goal_cell, grid.version))
+        if field is not None:
+            self.fields.move_to_end((goal_cell, grid.version))
+        return field
+
+    def field(self, grid, goal_pos):
+        goal_cell = grid.cell_from_world_point(goal_pos[0], goal_pos[1])
+        field = self.lookup(grid, goal_cell)
+        if field is None:
+            field = FlowField(grid, goal_cell, self.steps)
+            self.fields[(goal_cell, grid.version)] = field
+            # 다른 버전의 거리장은 더 이상 맞지 않으므로 정리
+            for key in [k for k in self.fields if k[1] != grid.version]:
+                del self.fields[key]
+            while len(self.fields) > self.maxsize:
+                self.fields.popitem(last=False)
+        return field
+
+    def find_path(self, start_pos, target_pos, grid):
+        # 다른 플래너와 같은 형태: 거리장을 (필요하면) 만들고 내려가기만 함
+        field = self.field(grid, target_pos)
+        start_cell = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        if grid.obstacle_flat[start_cell] or grid.obstacle_flat[field.goal_cell]:
+            print("Warning: Start or target position is on an obstacle.")
+            return []
+        return field.path_from(start_cell)
@@ -1,6 +1,11 @@
 import math
+import numpy as np
 
 class Vector:
+    # __slots__로 인스턴스 dict를 없애고, += -= *= /=는 새 객체 없이 제자리에서 바꿈
+    # (+ - * /는 기존처럼 새 Vector를 돌려줌)
+    __slots__ = ("x", "y")
+
     def __init__(self, x=0.0, y=0.0):
         self.x = x
         self.y = y
@@ -14,6 +19,38 @@ class Vector:
     def __mul__(self, scalar):
         return Vector(self.x * scalar, self.y * scalar)
 
+    def __truediv__(self, scalar):
+        return Vector(self.x / scalar, self.y / scalar)
+
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def __itruediv__(self, scalar):
+        self.x /= scalar
+        self.y /= scalar
+        return self
+
+    def add_scaled(self, other, scale):
+        # self += other * scale (임시 Vector 없이)
+        self.x += other.x * scale
+        self.y += other.y * scale
+        return self
+
+    def copy(self):
+        return Vector(self.x, self.y)
+
     def length(self):
         return math.sqrt(self.x**2 + self.y**2)
 
@@ -28,31 +65,33 @@ class Vector:
         return f"Vector({self.x:.2f}, {self.y:.2f})"
 
 class Kinematic:
-    def __init__(self, position=Vector(), orientation=0.0, velocity=Vector(), rotation=0.0):
-        self.position = position
+    # update는 position/velocity 객체를 제자리에서 바꾸므로, 지난 값을 보관하려면 copy()로 복사
+    def __init__(self, position=None, orientation=0.0, velocity=None, rotation=0.0):
+        self.position = position if position is not None else Vector()
         self.orientation = orientation
-        self.velocity = velocity
+        self.velocity = velocity if velocity is not None else Vector()
         self.rotation = rotation
 
     def update(self, steering, maxSpeed, time, map_bounds=(0, 30, 0, 30)):
+        velocity = self.velocity
         if steering is None:
-            self.velocity = Vector(0, 0)
+            velocity.x = velocity.y = 0.0
             self.rotation = 0
             return
 
-        self.velocity = self.velocity + (steering.linear * time)
+        velocity.add_scaled(steering.linear, time)
         self.rotation += steering.angular * time
 
-        if self.velocity.length() > maxSpeed:
-            self.velocity.normalize()
-            self.velocity *= maxSpeed
+        speed = velocity.length()
+        if speed > maxSpeed:
+            velocity *= maxSpeed / speed
 
         # 위치 업데이트 전 경계 체크 (단위: coord, 1 coord = 10m)
-        new_position = self.position + (self.velocity * time)
+        position = self.position
+        position.add_scaled(velocity, time)
         min_x, max_x, min_z, max_z = map_bounds
-        new_position.x = max(min_x, min(max_x, new_position.x))
-        new_position.y = max(min_z, min(max_z, new_position.y))
-        self.position = new_position
+        position.x = max(min_x, min(max_x, position.x))
+        position.y = max(min_z, min(max_z, position.y))
 
         self.orientation += self.rotation * time
         self.orientation = self.orientation % (2 * math.pi)
@@ -60,17 +99,81 @@ class Kinematic:
     def asVector(self):
         return Vector(math.cos(self.orientation), math.sin(self.orientation))
 
+class KinematicBatch:
+    # 전차 N대의 상태를 배열 묶음(struct-of-arrays)으로 두고 한 번에 진행
+    # position/velocity: (N, 2), orientation/rotation: (N,). Kinematic.update와 같은 규칙
+    def __init__(self, positions, orientations=None, velocities=None, rotations=None):
+        self.position = np.array(positions, dtype=float).reshape(-1, 2)
+        count = len(self.position)
+        self.orientation = np.zeros(count) if orientations is None else np.array(orientations, dtype=float)
+        self.velocity = np.zeros((count, 2)) if velocities is None else np.array(velocities, dtype=float).reshape(-1, 2)
+        self.rotation = np.zeros(count) if rotations is None else np.array(rotations, dtype=float)
+
+    def __len__(self):
+        return len(self.position)
+
+    def update(self, steering, maxSpeed, time, map_bounds=(0, 30, 0, 30)):
+        # maxSpeed는 스칼라 또는 (N,) 배열. steering.stopped인 전차는 Kinematic.update(None)처럼 멈춤
+        if steering is None:
+            self.velocity[:] = 0.0
+            self.rotation[:] = 0.0
+            return
+
+        self.velocity += steering.linear * time
+        self.rotation += steering.angular * time
+
+        speed = np.hypot(self.velocity[:, 0], self.velocity[:, 1])
+        over = speed > maxSpeed
+        if over.any():
+            self.velocity[over] *= (np.broadcast_to(maxSpeed, speed.shape)[over] / speed[over])[:, None]
+        if steering.stopped is not None:
+            self.velocity[steering.stopped] = 0.0
+            self.rotation[steering.stopped] = 0.0
+
+        self.position += self.velocity * time
+        min_x, max_x, min_z, max_z = map_bounds
+        np.clip(self.position[:, 0], min_x, max_x, out=self.position[:, 0])
+        np.clip(self.position[:, 1], min_z, max_z, out=self.position[:, 1])
+
+        self.orientation += self.rotation * time
+        np.mod(self.orientation, 2 * math.pi, out=self.orientation)
+
+    def asVector(self):
+        return np.stack((np.cos(self.orientation), np.sin(self.orientation)), axis=1)
+
+    def kinematic(self, i):
+        # i번째 전차를 Kinematic으로 꺼냄 (복사본)
+        return Kinematic(Vector(*self.position[i]), float(self.orientation[i]),
+                         Vector(*self.velocity[i]), float(self.rotation[i]))
+
 def newOrientation(current, velocity):
+    if isinstance(velocity, np.ndarray):
+        moving = np.hypot(velocity[:, 0], velocity[:, 1]) > 0
+        return np.where(moving, np.arctan2(velocity[:, 1], velocity[:, 0]), current)
     if velocity.length() > 0:
         return math.atan2(velocity.y, velocity.x)
     return current
 
 class SteeringOutput:
-    def __init__(self, linear=Vector(), angular=0.0):
-        self.linear = linear
+    # 배치에서는 linear (N, 2), angular (N,), stopped는 목표 반경 안이라 멈출 전차 (N,) bool
+    def __init__(self, linear=None, angular=0.0, stopped=None):
+        self.linear = linear if linear is not None else Vector()
         self.angular = angular
+        self.stopped = stopped
+
+def _target_position(target):
+    # Kinematic이면 (2,), KinematicBatch이면 전차별 목표 (N, 2)
+    if isinstance(target, KinematicBatch):
+        return target.position
+    return np.array((target.position.x, target.position.y))
+
+def _per_agent(value):
+    # 스칼라 또는 (N,) 매개변수를 (N, 2) 벡터 연산에 맞게
+    value = np.asarray(value, dtype=float)
+    return value[:, None] if value.ndim == 1 else value
 
 class DynamicSteeringBehavior:
+    # character가 KinematicBatch이면 getSteering은 전차 전체의 SteeringOutput 하나를 돌려줌
     def __init__(self, character, maxAcceleration):
         self.character = character
         self.maxAcceleration = maxAcceleration
@@ -84,29 +187,43 @@ class Seek(DynamicSteeringBehavior):
         self.target = target
 
     def getSteering(self):
+        if isinstance(self.character, KinematicBatch):
+            return self._getSteeringBatch()
         result = SteeringOutput()
         direction = self.target.position - self.character.position
         direction.normalize()
-        result.linear = direction * self.maxAcceleration
+        direction *= self.maxAcceleration
+        result.linear = direction
         result.angular = 0
         return result
 
+    def _getSteeringBatch(self):
+        direction = _target_position(self.target) - self.character.position
+        length = np.hypot(direction[:, 0], direction[:, 1])[:, None]
+        np.divide(direction, length, out=direction, where=length > 0)
+        direction *= _per_agent(self.maxAcceleration)
+        return SteeringOutput(direction, np.zeros(len(direction)))
+
 class Arrive(DynamicSteeringBehavior):
-    def __init__(self, character, target, maxAcceleration, maxSpeed, targetRadius, slowRadius, timeToTarget=0.1):
+    def __init__(self, character, target, maxAcceleration, maxSpeed, targetRadius, slowRadius, timeToTarget=0.1, verbose=True):
         super().__init__(character, maxAcceleration)
         self.target = target
         self.maxSpeed = maxSpeed
         self.targetRadius = targetRadius
         self.slowRadius = slowRadius
         self.timeToTarget = timeToTarget
+        self.verbose = verbose  # False이면 매 호출 출력 생략 (여러 대 시뮬레이션용)
 
     def getSteering(self):
+        if isinstance(self.character, KinematicBatch):
+            return self._getSteeringBatch()
         result = SteeringOutput()
         direction = self.target.position - self.character.position
         distance = direction.length()
 
         if distance < self.targetRadius:
-            print(f"Arrive: Within targetRadius ({distance:.2f} < {self.targetRadius}), stopping")
+            if self.verbose:
+                print(f"Arrive: Within targetRadius ({distance:.2f} < {self.targetRadius}), stopping")
             return None
 
         # 목표 속도 계산
@@ -115,17 +232,41 @@ class Arrive(DynamicSteeringBehavior):
         else:
             targetSpeed = self.maxSpeed * (distance / self.slowRadius)
 
-        # 방향 벡터 정규화
+        # 방향 벡터 정규화 (direction을 그대로 목표 속도로 씀)
         targetVelocity = direction
         if distance > 0:
-            targetVelocity = targetVelocity * (targetSpeed / distance)
+            targetVelocity *= targetSpeed / distance
 
         # 선형 가속도 계산
-        result.linear = (targetVelocity - self.character.velocity) / self.timeToTarget
-        if result.linear.length() > self.maxAcceleration:
-            result.linear.normalize()
-            result.linear *= self.maxAcceleration
+        targetVelocity -= self.character.velocity
+        targetVelocity /= self.timeToTarget
+        result.linear = targetVelocity
+        linear_length = result.linear.length()
+        if linear_length > self.maxAcceleration:
+            result.linear *= self.maxAcceleration / linear_length
 
         result.angular = 0
-        print(f"Arrive: distance={distance:.2f}, targetSpeed={targetSpeed:.2f}, linear={result.linear}")
-        return result
\ No newline at end of file
+        if self.verbose:
+            print(f"Arrive: distance={distance:.2f}, targetSpeed={targetSpeed:.2f}, linear={result.linear}")
+        return result
+
+    def _getSteeringBatch(self):
+        # 출력 없이 전차 전체를 한 번에. 매개변수는 스칼라 또는 전차별 (N,) 배열
+        direction = _target_position(self.target) - self.character.position
+        distance = np.hypot(direction[:, 0], direction[:, 1])
+        maxSpeed = np.broadcast_to(np.asarray(self.maxSpeed, dtype=float), distance.shape)
+        slowRadius = np.broadcast_to(np.asarray(self.slowRadius, dtype=float), distance.shape)
+        stopped = distance < self.targetRadius
+
+        targetSpeed = np.where(distance > slowRadius, maxSpeed, maxSpeed * distance / slowRadius)
+        scale = np.divide(targetSpeed, distance, out=np.zeros_like(distance), where=distance > 0)
+        linear = direction * scale[:, None]
+        linear -= self.character.velocity
+        linear /= _per_agent(self.timeToTarget)
+
+        linear_length = np.hypot(linear[:, 0], linear[:, 1])
+        maxAcceleration = np.broadcast_to(np.asarray(self.maxAcceleration, dtype=float), distance.shape)
+        over = linear_length > maxAcceleration
+        linear[over] *= (maxAcceleration[over] / linear_length[over])[:, None]
+        linear[stopped] = 0.0
+        return SteeringOutput(linear, np.zeros(len(linear)), stopped)
@@ -0,0 +1,74 @@
+import math
+import numpy as np
+from indexed_heap import IndexedHeap
+
+# pure_.a_star용 4방향 격자 A*
+# 셀 번호(x * n + z) 위의 평면 배열에 g/parent를 두고, 열린 목록은 decrease-key 힙이라 셀마다 항목이 하나뿐이다.
+# 배열은 격자 크기가 바뀔 때만 다시 할당하고, 탐색마다 세대 번호로 O(1) 초기화한다.
+class GridAStar:
+    def __init__(self):
+        self.expansions = 0
+        self.size = 0
+
+    def _prepare(self, size):
+        if size != self.size:
+            self.size = size
+            self.g_cost = [0.0] * size
+            self.parent = [-1] * size
+            self.visited = [0] * size
+            self.closed = [0] * size
+            self.open = IndexedHeap(size)
+            self.generation = 0
+        self.open.clear()
+        self.generation += 1
+        return self.generation
+
+    def find_path(self, start, goal, blocked, cell_size):
+        # start/goal: (x, z) 셀 좌표, blocked: (n, n) 점유 배열
+        # 반환값은 시작부터 목표까지 셀 좌표 * cell_size 목록 (도달 불가면 [])
+        n = blocked.shape[0]
+        blocked = memoryview(np.ascontiguousarray(blocked, dtype=np.uint8).reshape(-1))
+        gen = self._prepare(n * n)
+        g_cost, parent, visited, closed = self.g_cost, self.parent, self.visited, self.closed
+        open_set = self.open
+        pop, push = open_set.pop, open_set.push
+        start_cell = start[0] * n + start[1]
+        goal_cell = goal[0] * n + goal[1]
+        goal_x, goal_z = goal
+        step = float(cell_size)  # 4방향 이동 비용 = sqrt(dx^2 + dz^2) * cell_size
+
+        g_cost[start_cell] = 0.0
+        parent[start_cell] = -1
+        visited[start_cell] = gen
+        push(start_cell, math.sqrt((start[0] - goal_x) ** 2 + (start[1] - goal_z) ** 2))
+        self.expansions = 0
+
+        while open_set.items:
+            current, _ = pop()
+            closed[current] = gen
+            self.expansions += 1
+            if current == goal_cell:
+                path = []
+                while current != -1:
+                    x, z = divmod(current, n)
+                    path.append((x * cell_size, z * cell_size))
+                    current = parent[current]
+                return path[::-1]
+
+            current_g = g_cost[current]
+            cx, cz = divmod(current, n)
+            for neighbor, nx, nz in (
+                (current + 1, cx, cz + 1) if cz + 1 < n else (-1, 0, 0),
+                (current + n, cx + 1, cz) if cx + 1 < n else (-1, 0, 0),
+                (current - 1, cx, cz - 1) if cz > 0 else (-1, 0, 0),
+                (current - n, cx - 1, cz) if cx > 0 else (-1, 0, 0),
+            ):
+                if neighbor < 0 or blocked[neighbor] or closed[neighbor] == gen:
+                    continue
+                tentative_g = current_g + step
+                if visited[neighbor] != gen or tentative_g < g_cost[neighbor]:
+                    visited[neighbor] = gen
+                    g_cost[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    push(neighbor, tentative_g + math.sqrt((nx - goal_x) ** 2 + (nz - goal_z) ** 2))
+        return []
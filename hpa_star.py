@@ -0,0 +1,264 @@
+import heapq
+import numpy as np
+
+INF = float("inf")
+
+# HPA* (Botea et al.) 계층 경로 탐색
+# 격자를 cluster_size 크기의 클러스터로 나누고, 이웃 클러스터 경계의 통로(entrance)마다
+# 전이 노드를 둔다. 클러스터 내부 노드 간 최단 경로는 미리 계산해 캐시하고, 긴 질의는
+# 추상 그래프에서 탐색한 뒤 캐시된 구간 경로를 이어 붙여 1 m 경로로 복원한다.
+# 장애물이 바뀌면 바뀐 칸이 속한 클러스터와 그 이웃만 다시 계산한다.
+# 주의: 300x300 map.map에서는 평면 A*보다 느림 (bench_pathfinding.py hpa 측정: 질의마다 확장 수 2~6배,
+# 시간 1.5~4배, 전체 구성 약 1.2 s, 벽 하나 갱신 약 100~145 ms). 평면 A*의 확장 수가 맵 크기만큼 커지는
+# 더 큰 맵이나 질의가 아주 많은 경우를 위한 선택지이며 기본 플래너는 "astar"로 둔다.
+class HierarchicalPathfinding:
+    def __init__(self, fallback, cluster_size=30):
+        self.fallback = fallback  # 같은 클러스터 안의 짧은 질의나 추상 탐색 실패 시 사용하는 평면 A*
+        self.cluster_size = cluster_size
+        self.grid = None
+        self.costs = None         # 마지막으로 반영한 진입 비용 스냅샷
+        self.costs_source = None  # grid.entry_costs()가 돌려준 원본 (바뀌었는지 빠르게 확인)
+        self.cost = None
+        self.h_scale = 0.0
+        self.clusters_x = 0
+        self.clusters_z = 0
+        self.borders = {}        # (ci, cj) -> [(cell_i, cell_j), ...] 경계 통로의 전이 노드 쌍
+        self.intra = {}          # ci -> {node: [(other, cost, path), ...]} 클러스터 내부 간선
+        self.links = {}          # node -> [(other, cost), ...] 클러스터 사이 간선
+        self.expansions = 0
+        self.rebuilt_clusters = 0  # 마지막 갱신에서 다시 계산한 클러스터 수
+
+    def prepare(self, grid):
+        # 추상 그래프를 grid의 현재 장애물 상태에 맞춤 (바뀐 클러스터만 재계산)
+        costs = grid.entry_costs()
+        if grid is self.grid and costs is self.costs_source:
+            return
+        if grid is not self.grid:
+            self.grid = grid
+            self.clusters_x = -(-grid.width // self.cluster_size)
+            self.clusters_z = -(-grid.height // self.cluster_size)
+            self.borders, self.intra, self.links = {}, {}, {}
+            dirty = set(range(self.clusters_x * self.clusters_z))
+        else:
+            changed = np.flatnonzero(costs != self.costs)
+            xs, zs = np.divmod(changed, grid.height)
+            dirty = set((xs // self.cluster_size * self.clusters_z + zs // self.cluster_size).tolist())
+        self.costs_source = costs
+        self.costs = costs.copy()
+        self.cost = memoryview(self.costs)
+        self.h_scale = float(self.costs.min())
+        self._rebuild(dirty)
+
+    def find_path(self, start_pos, target_pos, grid):
+        self.prepare(grid)
+        start = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        goal = grid.cell_from_world_point(target_pos[0], target_pos[1])
+        if self.cost[start] == INF or self.cost[goal] == INF:
+            print("Warning: Start or target position is on an obstacle.")
+            return []
+
+        start_cluster, goal_cluster = self._cluster_of(start), self._cluster_of(goal)
+        if start_cluster == goal_cluster:
+            return self._fallback(start_pos, target_pos, grid)
+
+        self.expansions = 0
+        # 시작점/목표점을 자기 클러스터의 전이 노드에 임시로 연결
+        start_nodes = self._cluster_nodes(start_cluster)
+        dist, parent = self._dijkstra(start, start_cluster, start_nodes)
+        start_edges = [(v, dist[v], self._trace(parent, start, v)) for v in start_nodes if v in dist and v != start]
+        goal_nodes = self._cluster_nodes(goal_cluster)
+        dist, parent = self._dijkstra(goal, goal_cluster, goal_nodes, reverse=True)
+        goal_edges = {u: (dist[u], self._trace_reverse(parent, u, goal)) for u in goal_nodes if u in dist and u != goal}
+
+        segments = self._abstract_search(start, goal, start_edges, goal_edges)
+        if segments is None:
+            return self._fallback(start_pos, target_pos, grid)
+        path = [start]
+        for segment in segments:
+            path.extend(segment)
+        return [grid.cell_coords(cell) for cell in path]
+
+    def _fallback(self, start_pos, target_pos, grid):
+        path = self.fallback.find_path(start_pos, target_pos, grid)
+        self.expansions = self.fallback.expansions
+        return path
+
+    # --- 추상 그래프 구성 ---
+
+    def _cluster_of(self, cell):
+        x, z = divmod(cell, self.grid.height)
+        return x // self.cluster_size * self.clusters_z + z // self.cluster_size
+
+    def _cluster_bounds(self, ci):
+        cx, cz = divmod(ci, self.clusters_z)
+        x0, z0 = cx * self.cluster_size, cz * self.cluster_size
+        return x0, min(self.grid.width, x0 + self.cluster_size), z0, min(self.grid.height, z0 + self.cluster_size)
+
+    def _cluster_neighbors(self, ci):
+        cx, cz = divmod(ci, self.clusters_z)
+        if cx > 0:
+            yield ci - self.clusters_z
+        if cx + 1 < self.clusters_x:
+            yield ci + self.clusters_z
+        if cz > 0:
+            yield ci - 1
+        if cz + 1 < self.clusters_z:
+            yield ci + 1
+
+    def _cluster_nodes(self, ci):
+        return list(self.intra.get(ci, {}))
+
+    def _rebuild(self, dirty):
+        # 바뀐 클러스터의 경계 통로를 다시 찾고, 전이 노드가 바뀌었을 수 있는 이웃까지 내부 간선 재계산
+        touched = set(dirty)
+        for ci in dirty:
+            for cj in self._cluster_neighbors(ci):
+                touched.add(cj)
+                self.borders[(min(ci, cj), max(ci, cj))] = self._find_entrances(min(ci, cj), max(ci, cj))
+
+        self.links = {}
+        nodes = {ci: set() for ci in touched}
+        cost = self.cost
+        for (ci, cj), pairs in self.borders.items():
+            for a, b in pairs:
+                self.links.setdefault(a, []).append((b, cost[b]))
+                self.links.setdefault(b, []).append((a, cost[a]))
+                if ci in nodes:
+                    nodes[ci].add(a)
+                if cj in nodes:
+                    nodes[cj].add(b)
+
+        for ci in touched:
+            self.intra[ci] = self._connect_cluster(ci, nodes[ci])
+        self.rebuilt_clusters = len(touched)
+
+    def _find_entrances(self, ci, cj):
+        # 두 클러스터 경계에서 양쪽 칸이 모두 비어 있는 연속 구간마다 전이 노드 배치
+        # (짧은 구간은 가운데 하나, 긴 구간은 양 끝 두 개)
+        x0, x1, z0, z1 = self._cluster_bounds(ci)
+        height = self.grid.height
+        costs = self.costs.reshape(self.grid.width, height)
+        if cj == ci + self.clusters_z:  # 오른쪽(+x) 이웃: x = x1 - 1 | x1 경계
+            free = np.isfinite(costs[x1 - 1, z0:z1]) & np.isfinite(costs[x1, z0:z1])
+            cell_pair = lambda i: ((x1 - 1) * height + z0 + i, x1 * height + z0 + i)
+        else:  # 위쪽(+z) 이웃: z = z1 - 1 | z1 경계
+            free = np.isfinite(costs[x0:x1, z1 - 1]) & np.isfinite(costs[x0:x1, z1])
+            cell_pair = lambda i: ((x0 + i) * height + z1 - 1, (x0 + i) * height + z1)
+
+        pairs = []
+        free = free.tolist()
+        i = 0
+        while i < len(free):
+            if not free[i]:
+                i += 1
+                continue
+            run_start = i
+            while i < len(free) and free[i]:
+                i += 1
+            run_end = i - 1
+            if run_end - run_start + 1 < 6:
+                pairs.append(cell_pair((run_start + run_end) // 2))
+            else:
+                pairs.append(cell_pair(run_start))
+                pairs.append(cell_pair(run_end))
+        return pairs
+
+    def _connect_cluster(self, ci, nodes):
+        edges = {}
+        for u in nodes:
+            dist, parent = self._dijkstra(u, ci, nodes)
+            edges[u] = [(v, dist[v], self._trace(parent, u, v)) for v in nodes if v != u and v in dist]
+        return edges
+
+    def _dijkstra(self, source, ci, targets, reverse=False):
+        # 클러스터 범위 안에서만 탐색. reverse=True이면 각 칸에서 source까지의 비용을 계산
+        x0, x1, z0, z1 = self._cluster_bounds(ci)
+        height, cost = self.grid.height, self.cost
+        remaining = set(targets)
+        remaining.discard(source)
+        dist = {source: 0.0}
+        parent = {source: -1}
+        open_set = [(0.0, source)]
+        closed = set()
+        while open_set and remaining:
+            d, u = heapq.heappop(open_set)
+            if u in closed:
+                continue
+            closed.add(u)
+            remaining.discard(u)
+            self.expansions += 1
+            x, z = divmod(u, height)
+            for v, vx, vz in ((u + 1, x, z + 1), (u - 1, x, z - 1), (u + height, x + 1, z), (u - height, x - 1, z)):
+                if not (x0 <= vx < x1 and z0 <= vz < z1) or v in closed:
+                    continue
+                step = cost[u] if reverse else cost[v]
+                if step == INF or cost[v] == INF:
+                    continue
+                new_dist = d + step
+                if new_dist < dist.get(v, INF):
+                    dist[v] = new_dist
+                    parent[v] = u
+                    heapq.heappush(open_set, (new_dist, v))
+        return dist, parent
+
+    def _trace(self, parent, source, target):
+        # source 다음 칸부터 target까지 (source 제외)
+        path = []
+        while target != source:
+            path.append(target)
+            target = parent[target]
+        path.reverse()
+        return path
+
+    def _trace_reverse(self, parent, node, goal):
+        # 역방향 탐색 트리에서 node 다음 칸부터 goal까지 (node 제외)
+        path = []
+        while node != goal:
+            node = parent[node]
+            path.append(node)
+        return path
+
+    # --- 추상 그래프 탐색 ---
+
+    def _abstract_search(self, start, goal, start_edges, goal_edges):
+        height, h_scale = self.grid.height, self.h_scale
+        goal_x, goal_z = divmod(goal, height)
+
+        def heuristic(cell):
+            x, z = divmod(cell, height)
+            return (abs(x - goal_x) + abs(z - goal_z)) * h_scale
+
+        g_cost = {start: 0.0}
+        came_from = {start: (None, None)}
+        open_set = [(heuristic(start), start)]
+        closed = set()
+        while open_set:
+            _, u = heapq.heappop(open_set)
+            if u in closed:
+                continue
+            closed.add(u)
+            self.expansions += 1
+            if u == goal:
+                segments = []
+                while came_from[u][0] is not None:
+                    u, segment = came_from[u]
+                    segments.append(segment)
+                segments.reverse()
+                return segments
+
+            if u == start:
+                successors = list(start_edges)
+            else:
+                successors = list(self.intra[self._cluster_of(u)].get(u, []))
+                if u in goal_edges:
+                    successors.append((goal,) + goal_edges[u])
+            successors.extend((v, c, [v]) for v, c in self.links.get(u, []))
+            for v, edge_cost, segment in successors:
+                if v in closed:
+                    continue
+                new_cost = g_cost[u] + edge_cost
+                if new_cost < g_cost.get(v, INF):
+                    g_cost[v] = new_cost
+                    came_from[v] = (u, segment)
+                    heapq.heappush(open_set, (new_cost + heuristic(v), v))
+        return None
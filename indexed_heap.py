@@ -0,0 +1,102 @@
+# 정수 id(격자 셀 번호) 위의 이진 최소 힙, decrease-key 지원
+# position[item]이 힙 배열 안의 위치라서 이미 들어 있는 항목은 중복으로 넣지 않고 키만 바꿔 제자리로 옮긴다.
+# 키는 튜플 등 비교 가능한 값 (예: (f, h)로 f가 같을 때 h가 작은 쪽 우선)
+class IndexedHeap:
+    def __init__(self, size):
+        self.position = [-1] * size  # 힙에 없으면 -1
+        self.items = []
+        self.keys = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return self.position[item] >= 0
+
+    def clear(self):
+        # 남아 있는 항목의 위치만 지우므로 O(힙 크기)
+        position = self.position
+        for item in self.items:
+            position[item] = -1
+        self.items = []
+        self.keys = []
+
+    def key(self, item):
+        return self.keys[self.position[item]]
+
+    def push(self, item, key):
+        # 없으면 삽입, 있으면 키 갱신 (작아지면 위로, 커지면 아래로)
+        items, keys, position = self.items, self.keys, self.position
+        index = position[item]
+        if index < 0:
+            index = len(items)
+            items.append(item)
+            keys.append(key)
+        elif not key < keys[index]:
+            self._sift_down(index, item, key)
+            return
+        # 위로 올리기 (함수 호출 없이 인라인, 탐색 루프에서 가장 자주 불림)
+        while index:
+            parent = (index - 1) >> 1
+            parent_key = keys[parent]
+            if not key < parent_key:
+                break
+            parent_item = items[parent]
+            items[index] = parent_item
+            keys[index] = parent_key
+            position[parent_item] = index
+            index = parent
+        items[index] = item
+        keys[index] = key
+        position[item] = index
+
+    def pop(self):
+        # 키가 가장 작은 항목을 꺼내 (item, key)로 반환
+        items, keys, position = self.items, self.keys, self.position
+        top, top_key = items[0], keys[0]
+        position[top] = -1
+        item, key = items.pop(), keys.pop()
+        size = len(items)
+        if not size:
+            return top, top_key
+        # 마지막 항목을 루트에서 내려보내기 (인라인)
+        index = 0
+        child = 1
+        while child < size:
+            right = child + 1
+            if right < size and keys[right] < keys[child]:
+                child = right
+            child_key = keys[child]
+            if not child_key < key:
+                break
+            child_item = items[child]
+            items[index] = child_item
+            keys[index] = child_key
+            position[child_item] = index
+            index = child
+            child = 2 * index + 1
+        items[index] = item
+        keys[index] = key
+        position[item] = index
+        return top, top_key
+
+    def _sift_down(self, index, item, key):
+        items, keys, position = self.items, self.keys, self.position
+        size = len(items)
+        child = 2 * index + 1
+        while child < size:
+            right = child + 1
+            if right < size and keys[right] < keys[child]:
+                child = right
+            child_key = keys[child]
+            if not child_key < key:
+                break
+            child_item = items[child]
+            items[index] = child_item
+            keys[index] = child_key
+            position[child_item] = index
+            index = child
+            child = 2 * index + 1
+        items[index] = item
+        keys[index] = key
+        position[item] = index
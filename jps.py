@@ -0,0 +1,239 @@
+import heapq
+import numpy as np
+
+INF = float("inf")
+
+# Jump Point Search (Harabor & Grastien), 8방향 + 벽 모서리 가로지르기 금지 변형
+# 균일 비용 영역에서는 대칭 경로를 가지치기하고 직선/대각선으로 점프해 점프 포인트만 큐에 넣는다.
+# 진입 비용이 기본값과 다른 칸(예: 벽 근처 팽창, 경사 비용)과 그 8-이웃은 점프를 멈추는 칸으로 두고
+# 가지치기 없이 전부 확장하므로 비균일 비용 구간에서는 일반 A*와 같은 결과를 낸다.
+class JumpPointSearch:
+    def __init__(self, move_cost=10, diagonal_cost=14):
+        self.move_cost = move_cost
+        self.diagonal_cost = diagonal_cost
+        self.expansions = 0
+        self._costs_source = None
+        self._cost = None
+        self._stop = None
+        self._next_event = {}  # 방향 -> 셀별 다음 사건 칸 좌표 (grid.entry_costs()가 바뀔 때 재계산)
+
+    def _prepare(self, grid):
+        costs = grid.entry_costs()
+        if costs is self._costs_source:
+            return
+        width, height = grid.width, grid.height
+        walk = np.isfinite(costs).reshape(width, height)
+        # 기본 비용이 아닌 칸(special)과 그 8-이웃은 점프를 멈추는 칸
+        special = walk & (costs != self.move_cost).reshape(width, height)
+        stop = special.copy()
+        stop[1:, :] |= special[:-1, :]
+        stop[:-1, :] |= special[1:, :]
+        stop[:, 1:] |= stop[:, :-1].copy()
+        stop[:, :-1] |= stop[:, 1:].copy()
+        free = walk & ~special
+
+        # 직선 점프 테이블 (JPS+): 방향별로 다음 "사건" 칸(장애물, 멈춤 칸, 강제 이웃)의 좌표
+        # 격자 밖은 walk/free 모두 False로 보도록 한 칸씩 패딩해서 이웃을 읽음
+        walk_p = np.pad(walk, 1)
+        free_p = np.pad(free, 1)
+        def shifted(a, sx, sz):
+            return a[1 + sx:a.shape[0] - 1 + sx, 1 + sz:a.shape[1] - 1 + sz]
+        blocked_or_stop = ~walk | stop
+        forced = {
+            (1, 0): (shifted(walk_p, 0, -1) & ~shifted(free_p, -1, -1)) | (shifted(walk_p, 0, 1) & ~shifted(free_p, -1, 1)),
+            (-1, 0): (shifted(walk_p, 0, -1) & ~shifted(free_p, 1, -1)) | (shifted(walk_p, 0, 1) & ~shifted(free_p, 1, 1)),
+            (0, 1): (shifted(walk_p, -1, 0) & ~shifted(free_p, -1, -1)) | (shifted(walk_p, 1, 0) & ~shifted(free_p, 1, -1)),
+            (0, -1): (shifted(walk_p, -1, 0) & ~shifted(free_p, -1, 1)) | (shifted(walk_p, 1, 0) & ~shifted(free_p, 1, 1)),
+        }
+        self._next_event = {}
+        for (dx, dz), forced_mask in forced.items():
+            event = blocked_or_stop | forced_mask
+            axis = 0 if dx else 1
+            size = width if dx else height
+            index = np.arange(size).reshape((-1, 1) if dx else (1, -1))
+            if dx + dz > 0:
+                # 자기 자신 다음(+1)부터 가장 가까운 사건 좌표, 없으면 size
+                marks = np.where(event, index, size)
+                nearest = np.flip(np.minimum.accumulate(np.flip(marks, axis), axis=axis), axis)
+                table = np.full_like(marks, size)
+                if dx:
+                    table[:-1, :] = nearest[1:, :]
+                else:
+                    table[:, :-1] = nearest[:, 1:]
+            else:
+                marks = np.where(event, index, -1)
+                nearest = np.maximum.accumulate(marks, axis=axis)
+                table = np.full_like(marks, -1)
+                if dx:
+                    table[1:, :] = nearest[:-1, :]
+                else:
+                    table[:, 1:] = nearest[:, :-1]
+            self._next_event[(dx, dz)] = table.reshape(-1).tolist()
+
+        self._costs_source = costs
+        self._cost = memoryview(costs)
+        self._stop = memoryview(stop.reshape(-1).astype(np.uint8))
+
+    def find_path(self, start_pos, target_pos, grid):
+        self._prepare(grid)
+        start = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        goal = grid.cell_from_world_point(target_pos[0], target_pos[1])
+        cost = self._cost
+        if cost[start] == INF or cost[goal] == INF:
+            print("Warning: Start or target position is on an obstacle.")
+            return []
+
+        self.width, self.height = grid.width, grid.height
+        self.goal = goal
+        height = self.height
+        goal_x, goal_z = divmod(goal, height)
+        straight, diagonal = self.move_cost, self.diagonal_cost
+
+        state = grid.search
+        gen = state.reset()
+        g_cost, parent, visited, closed = state.g_cost, state.parent, state.visited, state.closed
+        g_cost[start] = 0
+        parent[start] = -1
+        visited[start] = gen
+        open_set = [(0, 0, start)]
+        self.expansions = 0
+
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
+            self.expansions += 1
+            if current == goal:
+                return self._retrace(start, goal, parent, grid)
+
+            cx, cz = divmod(current, height)
+            for dx, dz in self._directions(current, parent[current]):
+                jump = self._jump(cx, cz, dx, dz)
+                if jump is None:
+                    continue
+                jx, jz = jump
+                neighbor = jx * height + jz
+                if closed[neighbor] == gen:
+                    continue
+                # 점프 구간의 중간 칸은 모두 기본 비용이므로 끝 칸의 추가 비용만 더함
+                steps = max(abs(jx - cx), abs(jz - cz))
+                step_cost = diagonal if dx and dz else straight
+                new_cost = g_cost[current] + steps * step_cost + cost[neighbor] - self.move_cost
+                if visited[neighbor] != gen or new_cost < g_cost[neighbor]:
+                    visited[neighbor] = gen
+                    g_cost[neighbor] = new_cost
+                    parent[neighbor] = current
+                    hx, hz = abs(jx - goal_x), abs(jz - goal_z)
+                    h_cost = straight * max(hx, hz) + (diagonal - straight) * min(hx, hz)
+                    heapq.heappush(open_set, (new_cost + h_cost, h_cost, neighbor))
+        return []
+
+    def _walkable(self, x, z):
+        return 0 <= x < self.width and 0 <= z < self.height and self._cost[x * self.height + z] != INF
+
+    def _directions(self, cell, parent_cell):
+        height = self.height
+        x, z = divmod(cell, height)
+        walkable = self._walkable
+        if parent_cell < 0 or self._stop[cell]:
+            # 시작점이나 비균일 구간: 가지치기 없이 모든 이동
+            directions = []
+            for dx, dz in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                if walkable(x + dx, z + dz):
+                    directions.append((dx, dz))
+            for dx, dz in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+                if walkable(x + dx, z + dz) and walkable(x + dx, z) and walkable(x, z + dz):
+                    directions.append((dx, dz))
+            return directions
+
+        px, pz = divmod(parent_cell, height)
+        dx = (x > px) - (x < px)
+        dz = (z > pz) - (z < pz)
+        directions = []
+        if dx and dz:
+            if walkable(x, z + dz):
+                directions.append((0, dz))
+            if walkable(x + dx, z):
+                directions.append((dx, 0))
+            if walkable(x, z + dz) and walkable(x + dx, z) and walkable(x + dx, z + dz):
+                directions.append((dx, dz))
+        elif dx:
+            ahead, up, down = walkable(x + dx, z), walkable(x, z + 1), walkable(x, z - 1)
+            if ahead:
+                directions.append((dx, 0))
+                if up and walkable(x + dx, z + 1):
+                    directions.append((dx, 1))
+                if down and walkable(x + dx, z - 1):
+                    directions.append((dx, -1))
+            if up:
+                directions.append((0, 1))
+            if down:
+                directions.append((0, -1))
+        else:
+            ahead, right, left = walkable(x, z + dz), walkable(x + 1, z), walkable(x - 1, z)
+            if ahead:
+                directions.append((0, dz))
+                if right and walkable(x + 1, z + dz):
+                    directions.append((1, dz))
+                if left and walkable(x - 1, z + dz):
+                    directions.append((-1, dz))
+            if right:
+                directions.append((1, 0))
+            if left:
+                directions.append((-1, 0))
+        return directions
+
+    def _jump_straight(self, x, z, dx, dz):
+        # 점프 테이블로 O(1): 목표가 사건 칸보다 먼저 나오면 목표, 사건 칸이 막혀 있으면 None
+        height = self.height
+        event = self._next_event[(dx, dz)][x * height + z]
+        goal_x, goal_z = divmod(self.goal, height)
+        if dx:
+            if goal_z == z and (x < goal_x <= event if dx > 0 else event <= goal_x < x):
+                return goal_x, z
+            if event < 0 or event >= self.width or self._cost[event * height + z] == INF:
+                return None
+            return event, z
+        if goal_x == x and (z < goal_z <= event if dz > 0 else event <= goal_z < z):
+            return x, goal_z
+        if event < 0 or event >= height or self._cost[x * height + event] == INF:
+            return None
+        return x, event
+
+    def _jump(self, x, z, dx, dz):
+        # (x, z)에서 (dx, dz) 방향으로 다음 점프 포인트까지 이동, 없으면 None
+        if not (dx and dz):
+            return self._jump_straight(x, z, dx, dz)
+        height, goal, stop = self.height, self.goal, self._stop
+        walkable, jump_straight = self._walkable, self._jump_straight
+        while True:
+            x += dx
+            z += dz
+            if not walkable(x, z):
+                return None
+            cell = x * height + z
+            if cell == goal or stop[cell]:
+                return x, z
+            if jump_straight(x, z, dx, 0) is not None or jump_straight(x, z, 0, dz) is not None:
+                return x, z
+            # 다음 대각선 이동은 양쪽 직선 칸이 모두 열려 있어야 함
+            if not (walkable(x + dx, z) and walkable(x, z + dz)):
+                return None
+
+    def _retrace(self, start, goal, parent, grid):
+        # 점프 포인트 사이를 한 칸씩 채워 다른 플래너와 같은 셀 경로로 반환
+        jump_points = []
+        cell = goal
+        while cell != start:
+            jump_points.append(grid.cell_coords(cell))
+            cell = parent[cell]
+        jump_points.append(grid.cell_coords(start))
+        jump_points.reverse()
+        path = [jump_points[0]]
+        for (x0, z0), (x1, z1) in zip(jump_points, jump_points[1:]):
+            dx = (x1 > x0) - (x1 < x0)
+            dz = (z1 > z0) - (z1 < z0)
+            for step in range(1, max(abs(x1 - x0), abs(z1 - z0)) + 1):
+                path.append((x0 + dx * step, z0 + dz * step))
+        return path
@@ -0,0 +1,78 @@
+import glob
+import hashlib
+import json
+import math
+import os
+import numpy as np
+
+# map.map / output.map (시뮬레이터 맵 JSON) → 점유 격자
+# 프리팹마다 로컬 크기(x 방향 길이, z 방향 두께)를 두고 쿼터니언 회전을 그대로 적용한 회전 사각형으로 래스터화한다.
+# 결과는 맵 파일 내용 해시로 이름 붙인 .npy로 저장해 다음 시작 때 mmap으로 바로 읽는다.
+PREFAB_SIZES = {"Wall002x10": (10.0, 2.0)}
+CACHE_DIR = ".map_cache"
+RASTER_VERSION = 1  # 래스터화 방식이 바뀌면 올려서 기존 캐시를 무효화
+
+def load_walls(file_path):
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    return data['obstacles']
+
+def yaw_from_quaternion(rotation):
+    # y축 회전각 (라디안)
+    x, y, z, w = rotation['x'], rotation['y'], rotation['z'], rotation['w']
+    return math.atan2(2 * (w * y + x * z), 1 - 2 * (x * x + y * y))
+
+def oriented_boxes(walls):
+    # (중심 x, 중심 z, 반길이, 반두께, yaw) 배열. 모르는 프리팹은 건너뜀
+    boxes = []
+    for wall in walls:
+        size = PREFAB_SIZES.get(wall.get('prefabName'))
+        if size is None:
+            print(f"Warning: Unknown prefab {wall.get('prefabName')}, skipped.")
+            continue
+        boxes.append((wall['position']['x'], wall['position']['z'], size[0] / 2, size[1] / 2,
+                      yaw_from_quaternion(wall['rotation'])))
+    return np.array(boxes, dtype=float).reshape(-1, 5)
+
+def rasterize_boxes(boxes, width, height):
+    # 회전 사각형과 겹치는(맞닿는 것 포함) 모든 1 m 칸을 표시
+    # 칸은 축 정렬 단위 정사각형이므로 분리축은 사각형의 두 축만 보면 된다 (격자 축은 AABB 범위로 처리)
+    mask = np.zeros((width, height), dtype=np.uint8)
+    for cx, cz, half_len, half_thick, yaw in boxes:
+        # Unity 기준 y축 회전: 로컬 x → (cos, -sin), 로컬 z → (sin, cos)
+        ux, uz = math.cos(yaw), -math.sin(yaw)
+        vx, vz = math.sin(yaw), math.cos(yaw)
+        ext_x = half_len * abs(ux) + half_thick * abs(vx)
+        ext_z = half_len * abs(uz) + half_thick * abs(vz)
+        x0, x1 = max(0, math.floor(cx - ext_x)), min(width - 1, math.floor(cx + ext_x))
+        z0, z1 = max(0, math.floor(cz - ext_z)), min(height - 1, math.floor(cz + ext_z))
+        if x0 > x1 or z0 > z1:
+            continue
+        dx = np.arange(x0, x1 + 1)[:, None] + 0.5 - cx
+        dz = np.arange(z0, z1 + 1)[None, :] + 0.5 - cz
+        along = np.abs(dx * ux + dz * uz) <= half_len + 0.5 * (abs(ux) + abs(uz)) + 1e-9
+        across = np.abs(dx * vx + dz * vz) <= half_thick + 0.5 * (abs(vx) + abs(vz)) + 1e-9
+        mask[x0:x1 + 1, z0:z1 + 1] |= (along & across).astype(np.uint8)
+    return mask
+
+def cache_path(map_file, width, height, cache_dir=CACHE_DIR):
+    with open(map_file, 'rb') as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(f"{width}x{height}:v{RASTER_VERSION}".encode())
+    stem = os.path.splitext(os.path.basename(map_file))[0]
+    return os.path.join(cache_dir, f"{stem}.{digest.hexdigest()[:16]}.npy")
+
+def load_map_mask(map_file, width=300, height=300, cache_dir=CACHE_DIR):
+    # 캐시가 있으면 mmap으로 읽고, 없거나 맵 파일이 바뀌었으면 다시 래스터화해서 저장
+    path = cache_path(map_file, width, height, cache_dir)
+    if os.path.exists(path):
+        return np.load(path, mmap_mode='r')
+    mask = rasterize_boxes(oriented_boxes(load_walls(map_file)), width, height)
+    os.makedirs(cache_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(map_file))[0]
+    for stale in glob.glob(os.path.join(cache_dir, f"{stem}.*.npy")):
+        os.remove(stale)
+    tmp_path = path + ".tmp.npy"
+    np.save(tmp_path, mask)
+    os.replace(tmp_path, path)  # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 원자적으로 교체
+    return mask
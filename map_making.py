@@ -1,5 +1,6 @@
 import json
 import math
+from collections import defaultdict
 
 def load_walls(file_path):
     with open(file_path, 'r') as f:
@@ -19,7 +20,8 @@ def check_overlap(box1, box2):
     x2_min, x2_max, z2_min, z2_max = box2
     return x1_min < x2_max and x1_max > x2_min and z1_min < z2_max and z1_max > z2_min
 
-def adjust_walls(walls):
+def adjust_walls_pairwise(walls):
+    # 원래의 O(n²) 버전 (검증/벤치마크용)
     for i in range(len(walls)):
         for j in range(i + 1, len(walls)):
             box1 = get_bounding_box(walls[i])
@@ -35,12 +37,105 @@ def adjust_walls(walls):
                     if abs(walls[i]['position']['x'] + 5 - walls[j]['position']['x'] + 5) < 2:
                         walls[j]['position']['x'] = walls[i]['position']['x'] + 10
 
+class SpatialHash:
+    # 균일 해시 격자: 크기 cell_size인 버킷마다 그 버킷과 겹치는 벽 번호 집합
+    def __init__(self, cell_size=10.0):
+        self.cell_size = cell_size
+        self.buckets = defaultdict(set)
+        self.keys = {}  # 벽 번호 -> 들어가 있는 버킷 키 목록
+
+    def _cover(self, box):
+        x_min, x_max, z_min, z_max = box
+        size = self.cell_size
+        return [(i, j)
+                for i in range(math.floor(x_min / size), math.floor(x_max / size) + 1)
+                for j in range(math.floor(z_min / size), math.floor(z_max / size) + 1)]
+
+    def insert(self, item, box):
+        keys = self._cover(box)
+        for key in keys:
+            self.buckets[key].add(item)
+        self.keys[item] = keys
+
+    def remove(self, item):
+        for key in self.keys.pop(item):
+            bucket = self.buckets[key]
+            bucket.discard(item)
+            if not bucket:
+                del self.buckets[key]
+
+    def move(self, item, box):
+        self.remove(item)
+        self.insert(item, box)
+
+    def query(self, box):
+        # box와 같은 버킷에 있는 후보 (실제 겹침은 호출한 쪽에서 확인)
+        found = set()
+        for key in self._cover(box):
+            found |= self.buckets.get(key, set())
+        return found
+
+def adjust_walls(walls, cell_size=10.0):
+    # adjust_walls_pairwise와 같은 결과를 내는 공간 색인 버전
+    # i번째 단계는 j > i인 벽만 바꾸고 각 (i, j) 쌍의 처리는 서로 독립이므로,
+    # 실제로 무언가 바뀔 수 있는 j만 찾아 같은 순서로 처리한다.
+    #  - 박스가 겹치는 벽: 해시 격자 질의
+    #  - 둘 다 가로 벽이고 z 차이 < 1: z가 다르면 정렬 대상, z가 같으면 끝점 연결 범위 (x_i + 8, x_i + 12)에 있을 때만
+    boxes = [get_bounding_box(wall) for wall in walls]
+    index = SpatialHash(cell_size)
+    rows = defaultdict(lambda: defaultdict(set))  # floor(z) -> {z: 가로 벽(rotation.y == 0) 번호}
+    for j, wall in enumerate(walls):
+        index.insert(j, boxes[j])
+        if wall['rotation']['y'] == 0:
+            z = wall['position']['z']
+            rows[math.floor(z)][z].add(j)
+
+    for i in range(len(walls)):
+        wall_i, box_i = walls[i], boxes[i]
+        candidates = {j for j in index.query(box_i) if j > i and check_overlap(box_i, boxes[j])}
+        if wall_i['rotation']['y'] == 0:
+            x_i, z_i = wall_i['position']['x'], wall_i['position']['z']
+            row = math.floor(z_i)
+            for r in (row - 1, row, row + 1):
+                for z, group in rows.get(r, {}).items():
+                    if z != z_i and abs(z_i - z) < 1:
+                        candidates.update(j for j in group if j > i)
+            for j in index.query((x_i + 8, x_i + 12, z_i, z_i)):
+                if j > i and walls[j]['rotation']['y'] == 0 and walls[j]['position']['z'] == z_i:
+                    candidates.add(j)
+
+        for j in sorted(candidates):
+            wall_j = walls[j]
+            old_x, old_z = wall_j['position']['x'], wall_j['position']['z']
+            if check_overlap(box_i, boxes[j]):
+                # 겹침 해결: 한 벽을 이동
+                wall_j['position']['x'] += 10  # 예시 이동
+            # 맞닿음 정렬: z 좌표 정렬 (가로 벽 기준)
+            if wall_i['rotation']['y'] == wall_j['rotation']['y'] == 0:
+                if abs(wall_i['position']['z'] - wall_j['position']['z']) < 1:
+                    wall_j['position']['z'] = wall_i['position']['z']
+                    # 끝점 연결
+                    if abs(wall_i['position']['x'] + 5 - wall_j['position']['x'] + 5) < 2:
+                        wall_j['position']['x'] = wall_i['position']['x'] + 10
+            new_z = wall_j['position']['z']
+            if (wall_j['position']['x'], new_z) == (old_x, old_z):
+                continue
+            boxes[j] = get_bounding_box(wall_j)
+            index.move(j, boxes[j])
+            if new_z != old_z:
+                group = rows[math.floor(old_z)][old_z]
+                group.discard(j)
+                if not group:
+                    del rows[math.floor(old_z)][old_z]
+                rows[math.floor(new_z)][new_z].add(j)
+
 def save_walls(walls, output_path):
     data = {"terrainIndex": 3, "obstacles": walls}
     with open(output_path, 'w') as f:
         json.dump(data, f, indent=4)
 
 # 실행
-walls = load_walls("./map.json")
-adjust_walls(walls)
-save_walls(walls, 'output.json')
\ No newline at end of file
+if __name__ == '__main__':
+    walls = load_walls("./map.json")
+    adjust_walls(walls)
+    save_walls(walls, 'output.json')
\ No newline at end of file
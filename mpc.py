@@ -0,0 +1,130 @@
+import math
+import time
+import numpy as np
+from path_smoothing import TANK_MAX_SPEED, TANK_MAX_ROTATION_SPEED
+
+# 후보 동작 (키, 가중치). 가중치는 4th_try.py/control.py predict_state처럼 0.3~1.0
+ACTIONS = (("W", 1.0), ("W", 0.6), ("W", 0.3), ("A", 1.0), ("A", 0.5), ("D", 1.0), ("D", 0.5), ("S", 0.5))
+
+# 모델 예측 제어: 짧은 horizon 동안의 W/A/S/D 명령열 후보를 전부 굴려 보고 가장 좋은 열의 첫 명령만 냄
+# - 후보: 앞 switch 틱은 동작 a, 나머지는 동작 b인 두 구간 명령열 (len(ACTIONS)^2개, 지난 틱 최선 열 포함)
+# - 운동 모델 (predict_state와 같음, 방향은 Unity 요 각): W/S는 최고 속도 * 가중치로 앞/뒤 이동,
+#   A/D는 제자리에서 최대 회전 속도 * 가중치로 회전. 후보 x 틱 배열에 누적합으로 한 번에 계산
+# - 비용: 경로(웨이포인트 꺾은선)에서 벗어난 거리 제곱 평균, 벽까지 거리가 clearance_margin보다 가까운 만큼,
+#   마지막 위치의 경로 진행 거리(클수록 좋음), 마지막 진행 방향과 경로 방향 차이, 지난 명령과 다른 키
+# - 지연 예산: 후보를 chunk개씩 평가하고 budget_ms를 넘기면 None을 돌려줘 휴리스틱 제어로 넘김
+class MPCController:
+    def __init__(self, horizon=10, switch=3, dt=0.1, budget_ms=5.0, chunk=32,
+                 max_speed=TANK_MAX_SPEED, rotation_speed=TANK_MAX_ROTATION_SPEED, clearance_margin=4.0,
+                 deviation_weight=0.5, clearance_weight=10.0, progress_weight=2.0, heading_weight=5.0, switch_weight=0.5):
+        self.horizon = horizon
+        self.switch = switch
+        self.dt = dt
+        self.budget_ms = budget_ms
+        self.chunk = chunk
+        self.max_speed = max_speed
+        self.rotation_speed = rotation_speed
+        self.clearance_margin = clearance_margin
+        self.deviation_weight = deviation_weight
+        self.clearance_weight = clearance_weight
+        self.progress_weight = progress_weight
+        self.heading_weight = heading_weight
+        self.switch_weight = switch_weight
+        # 후보 명령열: (후보 수, horizon) 동작 번호
+        first, second = np.meshgrid(np.arange(len(ACTIONS)), np.arange(len(ACTIONS)), indexing="ij")
+        self.sequences = np.where(np.arange(horizon) < switch, first.reshape(-1, 1), second.reshape(-1, 1))
+        keys = [key for key, _ in ACTIONS]
+        weights = np.array([weight for _, weight in ACTIONS])
+        forward = np.array([1.0 if key == "W" else -1.0 if key == "S" else 0.0 for key in keys])
+        turn = np.array([1.0 if key == "D" else -1.0 if key == "A" else 0.0 for key in keys])
+        self.action_speed = forward * weights * max_speed
+        self.action_turn = turn * weights * rotation_speed
+        self.last_action = None
+        self.plan_ms = 0.0
+        self.plans = 0
+        self.overruns = 0  # 예산 초과로 휴리스틱에 넘긴 횟수
+
+    def step(self, x, z, heading, move, weight):
+        # 실제로 낸 명령 하나로 자기 위치를 한 틱 추정 (다음 /info까지 추측 항법)
+        weight = min(max(weight, 0.3), 1.0)
+        if move == "W" or move == "S":
+            speed = self.max_speed * weight * (1.0 if move == "W" else -1.0)
+            x += speed * math.sin(heading) * self.dt
+            z += speed * math.cos(heading) * self.dt
+        elif move == "D" or move == "A":
+            heading += self.rotation_speed * weight * self.dt * (1.0 if move == "D" else -1.0)
+            heading = math.atan2(math.sin(heading), math.cos(heading))
+        return (x, z), heading
+
+    def plan(self, x, z, heading, polyline, clearance):
+        # polyline: 따라갈 꺾은선 [(x, z), ...] (2점 이상), clearance: (width, height) 벽까지 거리 배열
+        # 반환: (키, 가중치) 또는 예산 초과 시 None
+        start_time = time.perf_counter()
+        deadline = start_time + self.budget_ms / 1000.0
+        points = np.asarray(polyline, dtype=float)
+        seg_start = points[:-1]
+        seg_vec = points[1:] - points[:-1]
+        seg_len = np.hypot(seg_vec[:, 0], seg_vec[:, 1])
+        seg_len_sq = np.maximum(seg_len * seg_len, 1e-9)
+        seg_offset = np.concatenate(([0.0], np.cumsum(seg_len)[:-1]))
+        seg_heading = np.arctan2(seg_vec[:, 0], seg_vec[:, 1])
+        width, height = clearance.shape
+        # 시작점의 경로 진행 거리 (후보의 진행량 기준)
+        _, start_along, _ = self._project(np.array([[[x, z]]]), seg_start, seg_vec, seg_len_sq, seg_offset)
+
+        best_index, best_cost = None, math.inf
+        sequences = self.sequences
+        if self.last_action is not None:
+            # 지난 틱 최선 열을 한 칸 당긴 후보가 항상 먼저 평가되도록 앞에 둠
+            shifted = np.append(self.last_action[1:], self.last_action[-1])
+            sequences = np.vstack((shifted, sequences))
+        for lo in range(0, len(sequences), self.chunk):
+            if time.perf_counter() > deadline:
+                self.overruns += 1
+                self.plan_ms = (time.perf_counter() - start_time) * 1000
+                return None
+            batch = sequences[lo:lo + self.chunk]
+            # 롤아웃: (후보, 틱) 배열에 방향과 위치를 누적합으로
+            headings = heading + np.cumsum(self.action_turn[batch] * self.dt, axis=1)
+            distance = self.action_speed[batch] * self.dt
+            xs = x + np.cumsum(distance * np.sin(headings), axis=1)
+            zs = z + np.cumsum(distance * np.cos(headings), axis=1)
+            deviation, along, segment = self._project(np.stack((xs, zs), axis=2), seg_start, seg_vec, seg_len_sq, seg_offset)
+            cells_x = np.clip(xs.astype(int), 0, width - 1)
+            cells_z = np.clip(zs.astype(int), 0, height - 1)
+            crowding = np.maximum(0.0, self.clearance_margin - clearance[cells_x, cells_z])
+            heading_error = np.abs(np.angle(np.exp(1j * (headings[:, -1] - seg_heading[segment[:, -1]]))))
+            cost = (
+                self.deviation_weight * (deviation * deviation).mean(axis=1)
+                + self.clearance_weight * (crowding * crowding).mean(axis=1)
+                - self.progress_weight * (along[:, -1] - start_along[0, 0])
+                + self.heading_weight * heading_error
+            )
+            if self.last_action is not None:
+                cost += self.switch_weight * (batch[:, 0] != self.last_action[0])
+            # 벽 칸을 지나는 후보는 제외
+            cost[(clearance[cells_x, cells_z] <= 0.0).any(axis=1)] = math.inf
+            index = int(np.argmin(cost))
+            if cost[index] < best_cost:
+                best_index, best_cost = lo + index, float(cost[index])
+        self.plans += 1
+        self.plan_ms = (time.perf_counter() - start_time) * 1000
+        if best_index is None:
+            return None  # 모든 후보가 벽에 닿음
+        self.last_action = sequences[best_index]
+        return ACTIONS[self.last_action[0]]
+
+    def _project(self, positions, seg_start, seg_vec, seg_len_sq, seg_offset):
+        # positions: (..., 2) -> 꺾은선까지 거리, 꺾은선 위 진행 거리, 가장 가까운 구간 번호
+        rel = positions[..., None, :] - seg_start
+        t = np.clip((rel * seg_vec).sum(axis=-1) / seg_len_sq, 0.0, 1.0)
+        offset = rel - t[..., None] * seg_vec
+        distance = np.hypot(offset[..., 0], offset[..., 1])
+        segment = np.argmin(distance, axis=-1)
+        pick = segment[..., None]
+        nearest = np.take_along_axis(distance, pick, axis=-1)[..., 0]
+        along = seg_offset[segment] + np.take_along_axis(t, pick, axis=-1)[..., 0] * np.sqrt(seg_len_sq[segment])
+        return nearest, along, segment
+
+    def status(self):
+        return {"plans": self.plans, "overruns": self.overruns, "plan_ms": self.plan_ms}
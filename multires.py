@@ -0,0 +1,192 @@
+import heapq
+import numpy as np
+
+INF = float("inf")
+
+# 다해상도 경로 탐색: 거친 격자에서 먼저 찾고 1 m 격자에서는 그 경로 주변 통로 안만 탐색
+# 점유 피라미드는 level m 크기 블록마다 max-pool (벽이 한 칸이라도 있으면 막힘)이라 보수적이다.
+# 다만 시작/목표 블록은 벽이 섞여 있어도 거친 경로에 들어가므로 (그 안에서 출발/도착해야 하므로),
+# 그 블록 안의 벽이 시작/목표 칸을 통로 쪽에서 갈라놓으면 통로 안에 1 m 경로가 없을 수 있다.
+# 그때나 거친 격자에서 경로가 없을 때 (좁은 틈만 있는 경우)는 다음 해상도로, 마지막에는 fallback(1 m 전체 격자 A*)으로
+# 내려간다. 그래서 경로가 있으면 항상 찾지만, 통로 정제가 실패한 만큼 전체 격자 탐색 비용을 추가로 낸다.
+# 품질: 1 m 단계는 통로 안에서 최적이고, 보수적 거친 경로가 같은 해상도의 낙관적 경로(벽으로 꽉 찬 블록만 막음)보다
+# max_ratio 넘게 비싸면 그 해상도를 쓰지 않는다. map.map 임의 질의 200개에서 A* 대비 비용 최악 1.02배, 벽을 더 깐
+# 맵에서 1.04배 (bench_pathfinding.py multires). 이 비율은 측정값이지 모든 맵에 대한 증명된 상한은 아님.
+class MultiResolutionPathfinding:
+    def __init__(self, fallback, levels=(10, 5), margin=1, max_ratio=1.05):
+        self.fallback = fallback  # 모든 해상도에서 실패하면 쓰는 평면 A*
+        self.levels = levels      # 블록 크기 (m), 거친 것부터
+        self.margin = margin      # 거친 경로 주변으로 통로에 포함할 블록 수 (체비셰프)
+        self.costs_source = None  # grid.entry_costs()가 돌려준 원본 (바뀌었는지 빠르게 확인)
+        self.max_ratio = max_ratio  # 보수적 거친 경로 비용 / 낙관적 거친 경로 비용 상한
+        self.pyramid = []         # level마다 (블록 크기, max-pool 막힘, min-pool 막힘, 블록 진입 비용)
+        self.h_scale = 0.0
+        self.g_cost = []
+        self.parent = []
+        self.visited = []
+        self.closed = []
+        self.generation = 0
+        self.expansions = 0
+        self.coarse_expansions = 0
+        self.level = None  # 마지막 질의에 쓰인 블록 크기 (None이면 fallback)
+
+    def prepare(self, grid):
+        # 진입 비용이 바뀌었을 때만 피라미드를 다시 만듦
+        costs = grid.entry_costs()
+        if costs is self.costs_source:
+            return
+        self.costs_source = costs
+        self.h_scale = float(costs.min())
+        fine = costs.reshape(grid.width, grid.height)
+        self.pyramid = []
+        for size in self.levels:
+            blocks_x, blocks_z = -(-grid.width // size), -(-grid.height // size)
+            padded = np.full((blocks_x * size, blocks_z * size), INF)
+            padded[:grid.width, :grid.height] = fine
+            tiles = padded.reshape(blocks_x, size, blocks_z, size).swapaxes(1, 2).reshape(blocks_x, blocks_z, -1)
+            finite = np.isfinite(tiles)
+            # 격자 밖으로 넘친 칸(가장자리 블록)은 막힘으로 보지 않고 안쪽 칸만으로 판정
+            inside = np.zeros((blocks_x * size, blocks_z * size), dtype=bool)
+            inside[:grid.width, :grid.height] = True
+            inside = inside.reshape(blocks_x, size, blocks_z, size).swapaxes(1, 2).reshape(blocks_x, blocks_z, -1)
+            blocked = (~finite & inside).any(axis=2)      # max-pool: 벽이 한 칸이라도 있으면 막힘
+            walled = ~(finite & inside).any(axis=2)        # min-pool: 전부 벽일 때만 막힘 (품질 비교용)
+            # 블록 하나를 가로지르는 비용 = 안쪽 칸 평균 진입 비용 * 블록 크기
+            mean = np.where(finite, tiles, 0.0).sum(axis=2) / np.maximum(finite.sum(axis=2), 1)
+            self.pyramid.append((size, blocked, walled, mean * size))
+        if len(self.g_cost) != grid.size:
+            self.g_cost = [0] * grid.size
+            self.parent = [-1] * grid.size
+            self.visited = [0] * grid.size
+            self.closed = [0] * grid.size
+
+    def find_path(self, start_pos, target_pos, grid):
+        self.prepare(grid)
+        start = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        goal = grid.cell_from_world_point(target_pos[0], target_pos[1])
+        if self.costs_source[start] == INF or self.costs_source[goal] == INF:
+            print("Warning: Start or target position is on an obstacle.")
+            return []
+        self.expansions = self.coarse_expansions = 0
+        sx, sz = divmod(start, grid.height)
+        gx, gz = divmod(goal, grid.height)
+        for size, blocked, walled, block_cost in self.pyramid:
+            start_block, goal_block = (sx // size, sz // size), (gx // size, gz // size)
+            route, cost = self._coarse_search(blocked, block_cost, start_block, goal_block, size)
+            if route is None:
+                continue
+            # 같은 해상도에서 벽이 꽉 찬 블록만 막은 낙관적 경로와 비교해 보수적 막힘 때문에
+            # max_ratio 넘게 돌아가면 (좁은 틈을 막아버린 경우) 이 해상도는 버리고 더 세밀한 쪽으로
+            # (맨해튼 하한 안쪽이면 낙관적 탐색은 생략)
+            lower = (abs(start_block[0] - goal_block[0]) + abs(start_block[1] - goal_block[1])) * size * self.h_scale
+            if cost > self.max_ratio * lower:
+                _, optimistic = self._coarse_search(walled, block_cost, start_block, goal_block, size)
+                if cost > self.max_ratio * optimistic:
+                    continue
+            path = self._refine(self._corridor(route, blocked.shape, size, grid), start, goal, grid)
+            if path:
+                self.level = size
+                return path
+        self.level = None
+        path = self.fallback.find_path(start_pos, target_pos, grid)
+        self.expansions += self.fallback.expansions
+        return path
+
+    def _coarse_search(self, blocked, block_cost, start_block, goal_block, size):
+        # 블록 격자에서 4방향 A*, (경로 블록 목록, 비용) 반환 (경로 없으면 (None, inf))
+        blocks_x, blocks_z = blocked.shape
+        h_scale = size * self.h_scale
+        open_set = [(0.0, start_block)]
+        g_cost = {start_block: 0.0}
+        parent = {start_block: None}
+        closed = set()
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.coarse_expansions += 1
+            self.expansions += 1
+            if current == goal_block:
+                route = []
+                while current is not None:
+                    route.append(current)
+                    current = parent[current]
+                return route, g_cost[goal_block]
+            bx, bz = current
+            for nx, nz in ((bx, bz + 1), (bx + 1, bz), (bx, bz - 1), (bx - 1, bz)):
+                if not (0 <= nx < blocks_x and 0 <= nz < blocks_z) or (nx, nz) in closed:
+                    continue
+                # 목표 블록은 벽이 섞여 있어도 들어감 (그 안에서의 경로는 1 m 단계가 찾음)
+                if blocked[nx, nz] and (nx, nz) != goal_block:
+                    continue
+                new_cost = g_cost[current] + block_cost[nx, nz]
+                if new_cost < g_cost.get((nx, nz), INF):
+                    g_cost[nx, nz] = new_cost
+                    parent[nx, nz] = current
+                    h_cost = (abs(nx - goal_block[0]) + abs(nz - goal_block[1])) * h_scale
+                    heapq.heappush(open_set, (new_cost + h_cost, (nx, nz)))
+        return None, INF
+
+    def _corridor(self, route, shape, size, grid):
+        # 경로 블록을 margin만큼 넓힌 뒤 1 m 칸 마스크로 펼침
+        corridor = np.zeros(shape, dtype=bool)
+        for block in route:
+            corridor[block] = True
+        for _ in range(self.margin):
+            grown = corridor.copy()
+            grown[1:, :] |= corridor[:-1, :]
+            grown[:-1, :] |= corridor[1:, :]
+            rows = grown.copy()
+            grown[:, 1:] |= rows[:, :-1]
+            grown[:, :-1] |= rows[:, 1:]
+            corridor = grown
+        fine = np.repeat(np.repeat(corridor, size, axis=0), size, axis=1)
+        return memoryview(np.ascontiguousarray(fine[:grid.width, :grid.height]).reshape(-1))
+
+    def _refine(self, corridor, start, goal, grid):
+        # 통로 마스크 안에서만 1 m A* (비용 모델과 휴리스틱은 Pathfinding과 같음)
+        cost = memoryview(self.costs_source)
+        g_cost, parent, visited, closed = self.g_cost, self.parent, self.visited, self.closed
+        self.generation += 1
+        gen = self.generation
+        width, height = grid.width, grid.height
+        goal_x, goal_z = divmod(goal, height)
+        h_scale = self.h_scale
+        g_cost[start] = 0
+        parent[start] = -1
+        visited[start] = gen
+        open_set = [(0, 0, start)]
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
+            self.expansions += 1
+            if current == goal:
+                path = []
+                while current != -1:
+                    path.append(divmod(current, height))
+                    current = parent[current]
+                return path[::-1]
+            current_g = g_cost[current]
+            cx, cz = divmod(current, height)
+            for neighbor, nx, nz in (
+                (current + 1, cx, cz + 1) if cz + 1 < height else (-1, 0, 0),
+                (current + height, cx + 1, cz) if cx + 1 < width else (-1, 0, 0),
+                (current - 1, cx, cz - 1) if cz > 0 else (-1, 0, 0),
+                (current - height, cx - 1, cz) if cx > 0 else (-1, 0, 0),
+            ):
+                if neighbor < 0 or not corridor[neighbor] or closed[neighbor] == gen:
+                    continue
+                step = cost[neighbor]
+                if step == INF:
+                    continue
+                new_cost = current_g + step
+                if visited[neighbor] != gen or new_cost < g_cost[neighbor]:
+                    visited[neighbor] = gen
+                    g_cost[neighbor] = new_cost
+                    parent[neighbor] = current
+                    h_cost = (abs(nx - goal_x) + abs(nz - goal_z)) * h_scale
+                    heapq.heappush(open_set, (new_cost + h_cost, h_cost, neighbor))
+        return []
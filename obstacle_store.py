@@ -0,0 +1,71 @@
+import math
+import numpy as np
+
+# 원형 장애물 (x, z, radius) 저장소
+# 좌표/반경은 용량을 두 배씩 늘리는 NumPy 배열에, 중심 좌표는 cell_size 격자 버킷에 색인한다.
+# 질의는 (최대 반경 + 주시 거리) 안의 버킷만 모아서 한 번의 벡터 연산으로 처리하므로
+# 틱당 비용이 전체 장애물 수가 아니라 주변 장애물 수에 비례한다.
+class ObstacleStore:
+    def __init__(self, cell_size=10.0, capacity=64):
+        self.cell_size = cell_size
+        self.xs = np.empty(capacity)
+        self.zs = np.empty(capacity)
+        self.radii = np.empty(capacity)
+        self.count = 0
+        self.max_radius = 0.0
+        self.buckets = {}  # (i, j) -> 장애물 번호 목록
+
+    def __len__(self):
+        return self.count
+
+    def _key(self, x, z):
+        return math.floor(x / self.cell_size), math.floor(z / self.cell_size)
+
+    def add(self, x, z, radius):
+        if self.count == len(self.xs):
+            for name in ("xs", "zs", "radii"):
+                grown = np.empty(2 * self.count)
+                grown[:self.count] = getattr(self, name)
+                setattr(self, name, grown)
+        index = self.count
+        self.xs[index], self.zs[index], self.radii[index] = x, z, radius
+        self.count += 1
+        self.max_radius = max(self.max_radius, radius)
+        self.buckets.setdefault(self._key(x, z), []).append(index)
+        return index
+
+    def clear(self):
+        self.count = 0
+        self.max_radius = 0.0
+        self.buckets = {}
+
+    def nearby(self, x, z, distance):
+        # 중심이 (최대 반경 + distance) 안에 있을 수 있는 장애물 번호 (버킷 단위 후보)
+        reach = self.max_radius + distance
+        i0, j0 = self._key(x - reach, z - reach)
+        i1, j1 = self._key(x + reach, z + reach)
+        indices = []
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                bucket = self.buckets.get((i, j))
+                if bucket:
+                    indices.extend(bucket)
+        return np.array(indices, dtype=np.intp)
+
+    def repulsion(self, x, z, lookahead_distance):
+        # 영향 범위(장애물 반경 + 주시 거리) 안의 장애물에서 멀어지는 단위 벡터 * 세기의 합
+        # 세기 = 1 - min(1, (거리 - 반경) / 주시 거리), 장애물에 가까울수록 강함
+        indices = self.nearby(x, z, lookahead_distance)
+        if len(indices) == 0:
+            return np.zeros(2)
+        dx = self.xs[indices] - x
+        dz = self.zs[indices] - z
+        radii = self.radii[indices]
+        distance = np.hypot(dx, dz)
+        inside = (distance < radii + lookahead_distance) & (distance > 0)
+        if not inside.any():
+            return np.zeros(2)
+        distance = distance[inside]
+        strength = 1.0 - np.minimum(1.0, (distance - radii[inside]) / lookahead_distance)
+        scale = strength / distance
+        return -np.array([np.dot(dx[inside], scale), np.dot(dz[inside], scale)])
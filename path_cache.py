@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+# 경로 LRU 캐시
+# 키는 (..., 시작 셀, 목표 셀, 장애물 맵 버전) 형태의 튜플이고 마지막 원소가 버전이다.
+# 더 새로운 버전의 키가 들어오면 이전 버전 항목은 더 이상 맞을 수 없으므로 한꺼번에 비운다.
+class PathCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self.entries:
+                self.invalidations += 1
+                self.entries.clear()
+            self.version = version
+
+    def get(self, key):
+        self._check_version(key[-1])
+        path = self.entries.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return list(path)
+
+    def put(self, key, path):
+        self._check_version(key[-1])
+        self.entries[key] = tuple(path)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
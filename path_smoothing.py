@@ -0,0 +1,124 @@
+import math
+import numpy as np
+
+INF = float("inf")
+
+# 전차 기동 한계 (4th_try.py/control.py InitState)
+TANK_MAX_SPEED = 19.44                       # m/s
+TANK_MAX_ROTATION_SPEED = math.radians(56.2)  # rad/s
+
+# 경로 후처리: 칸 경로 -> 시야선 단축 -> 곡률 제한 스플라인 -> 호 길이 재표본
+# 스플라인은 꺾이는 점마다 반경 R 이상의 원호로 모서리를 둥글린 직선-원호 곡선 (접선 연속)이라
+# 곡률이 1/R로 정확히 제한된다. R = 최고 속도 / 최대 회전 속도면 전속으로 달려도 회전이 따라간다.
+# 구간이 짧아 R을 다 못 쓰거나 원호가 벽에 닿으면 반경을 줄이고, 그 구간의 속도 상한을
+# 최대 회전 속도 * 반경으로 낮춰 돌려준다.
+# avoid: (width, height) bool 배열을 주면 벽처럼 그 칸을 지나는 단축/원호도 쓰지 않음
+# (시공간 플래너가 적 위험 구역을 돌아간 구간을 직선으로 펴서 다시 가로지르지 않게)
+
+def min_turn_radius(speed=TANK_MAX_SPEED, rotation_speed=TANK_MAX_ROTATION_SPEED):
+    return speed / rotation_speed
+
+def _visible(grid, avoid, x0, z0, x1, z1):
+    if not grid.line_of_sight(x0, z0, x1, z1):
+        return False
+    if avoid is None:
+        return True
+    # 선분 위를 칸 크기의 절반 간격으로 표본해 피할 칸을 지나는지 확인
+    count = 2 * max(abs(x1 - x0), abs(z1 - z0)) + 1
+    xs = np.linspace(x0 + 0.5, x1 + 0.5, count).astype(int)
+    zs = np.linspace(z0 + 0.5, z1 + 0.5, count).astype(int)
+    return not avoid[xs, zs].any()
+
+def shortcut(path, grid, avoid=None):
+    # 탐욕적 시야선 단축: 기준점에서 보이는 가장 먼 꺾임 점까지 건너뛰고 꺾이는 점만 남김
+    if len(path) <= 2:
+        return path
+    # 방향이 바뀌는 칸만 후보로 남김 (직선 구간 중간 칸은 시야선 검사 불필요)
+    turns = [path[0]]
+    for prev, cell, nxt in zip(path, path[1:], path[2:]):
+        if (cell[0] - prev[0], cell[1] - prev[1]) != (nxt[0] - cell[0], nxt[1] - cell[1]):
+            turns.append(cell)
+    turns.append(path[-1])
+    # 현재 기준점에서 보이는 가장 먼 후보까지 건너뛰고, 안 보이는 직전 후보를 코너로 남김
+    corners = [turns[0]]
+    anchor = turns[0]
+    for i in range(1, len(turns) - 1):
+        if not _visible(grid, avoid, anchor[0], anchor[1], turns[i + 1][0], turns[i + 1][1]):
+            anchor = turns[i]
+            corners.append(anchor)
+    corners.append(turns[-1])
+    return corners
+
+def fillet(corners, grid, radius, step=0.5, avoid=None):
+    # 꺾이는 점을 원호로 둥글린 조밀한 폴리라인 [(x, z, 그 점의 회전 반경)] (직선 위는 inf)
+    points = [(float(x), float(z)) for x, z in corners]
+    line = [(points[0][0], points[0][1], INF)]
+    for i in range(1, len(points) - 1):
+        (px, pz), (cx, cz), (nx, nz) = points[i - 1], points[i], points[i + 1]
+        in_len, out_len = math.hypot(cx - px, cz - pz), math.hypot(nx - cx, nz - cz)
+        if in_len == 0 or out_len == 0:
+            continue
+        ux, uz = (cx - px) / in_len, (cz - pz) / in_len
+        vx, vz = (nx - cx) / out_len, (nz - cz) / out_len
+        turn = math.atan2(ux * vz - uz * vx, ux * vx + uz * vz)  # 부호 있는 꺾임 각
+        if abs(turn) < 1e-6:
+            continue
+        half_tan = math.tan(abs(turn) / 2)
+        # 접선 길이는 양쪽 구간의 절반까지 (이웃 모서리의 원호와 겹치지 않게), 첫/마지막 구간은 전부
+        room = min(in_len if i == 1 else in_len / 2, out_len if i == len(points) - 2 else out_len / 2)
+        arc_radius = min(radius, room / half_tan)
+        while arc_radius >= 1.0:
+            arc = _arc(cx, cz, ux, uz, vx, vz, turn, arc_radius, step)
+            if all(_visible(grid, avoid, int(ax), int(az), int(bx), int(bz))
+                   for (ax, az), (bx, bz) in zip(arc, arc[1:])):
+                line.extend((x, z, arc_radius) for x, z in arc)
+                break
+            arc_radius /= 2  # 원호가 벽에 닿으면 모서리 쪽으로 당김
+        else:
+            line.append((cx, cz, 0.0))  # 둥글릴 여유가 없으면 제자리 회전
+    line.append((points[-1][0], points[-1][1], INF))
+    return line
+
+def _arc(cx, cz, ux, uz, vx, vz, turn, radius, step):
+    # 모서리 (cx, cz)에서 들어오는 방향 u, 나가는 방향 v에 접하는 반경 radius 원호의 표본점
+    t = radius * math.tan(abs(turn) / 2)
+    sx, sz = cx - ux * t, cz - uz * t
+    side = 1.0 if turn > 0 else -1.0
+    ox, oz = sx - uz * side * radius, sz + ux * side * radius  # 원의 중심 (u의 회전 방향 법선 쪽)
+    start_angle = math.atan2(sz - oz, sx - ox)
+    count = max(2, int(math.ceil(radius * abs(turn) / step)) + 1)
+    return [
+        (ox + radius * math.cos(start_angle + turn * k / (count - 1)),
+         oz + radius * math.sin(start_angle + turn * k / (count - 1)))
+        for k in range(count)
+    ]
+
+def resample(line, spacing):
+    # 호 길이 spacing 이하 간격으로 재표본 (시작점 제외, 끝점 포함)
+    # 반환: (점 목록, 각 점까지의 구간에서 가장 작은 회전 반경)
+    xy = np.array([(x, z) for x, z, _ in line])
+    radii = np.array([r for _, _, r in line])
+    if len(xy) < 2:
+        return [tuple(xy[-1])], [INF]
+    arc_length = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(xy, axis=0).T))))
+    total = arc_length[-1]
+    # 전체 길이를 spacing 이하의 같은 간격으로 나눔 (끝에 짧은 자투리 구간이 남지 않게)
+    count = max(1, int(math.ceil(total / spacing)))
+    stations = np.linspace(total / count, total, count)
+    xs = np.interp(stations, arc_length, xy[:, 0])
+    zs = np.interp(stations, arc_length, xy[:, 1])
+    # 표본 사이 구간에 들어간 조밀한 점의 최소 반경
+    bounds = np.searchsorted(arc_length, np.concatenate(([0.0], stations)), side="right")
+    segment_radii = [float(radii[max(lo - 1, 0):hi].min()) for lo, hi in zip(bounds, bounds[1:])]
+    return list(zip(xs.tolist(), zs.tolist())), segment_radii
+
+def smooth_path(path, grid, spacing, radius=None, rotation_speed=TANK_MAX_ROTATION_SPEED, max_speed=TANK_MAX_SPEED, avoid=None):
+    # 칸 경로 -> (웨이포인트, 웨이포인트별 속도 상한 m/s)
+    if not path:
+        return [], []
+    if len(path) == 1:
+        return [tuple(map(float, path[0]))], [max_speed]
+    radius = min_turn_radius(max_speed, rotation_speed) if radius is None else radius
+    corners = shortcut(path, grid, avoid)
+    waypoints, radii = resample(fillet(corners, grid, radius, avoid=avoid), spacing)
+    return waypoints, [min(max_speed, rotation_speed * r) for r in radii]
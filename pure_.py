@@ -4,9 +4,10 @@ import torch
 from ultralytics import YOLO
 import math
 import time
-import heapq
 import numpy as np
 import json
+from path_cache import PathCache
+from grid_astar import GridAStar
 
 app = Flask(__name__)
 model = YOLO('yolov8n.pt')
@@ -49,6 +50,9 @@ last_info_time = time.time()
 waypoints = []
 current_waypoint_idx = 0
 obstacles = {(70, 30), (80, 40)}
+obstacles_version = 0  # 장애물 목록이 바뀔 때마다 증가 (경로 캐시 키)
+path_cache = PathCache(maxsize=128)
+grid_search = GridAStar()  # 셀 번호 평면 배열 + decrease-key 힙 A*
 last_steering_move = None
 last_waypoint_change_time = time.time()
 
@@ -81,36 +85,22 @@ action_command = [
 ]
 
 def a_star(start, goal, grid_size=300, cell_size=10):
+    start = (min(int(start[0] / cell_size), grid_size - 1), min(int(start[1] / cell_size), grid_size - 1))
+    goal = (min(int(goal[0] / cell_size), grid_size - 1), min(int(goal[1] / cell_size), grid_size - 1))
+    key = (grid_size, cell_size, start, goal, obstacles_version)
+    path = path_cache.get(key)
+    if path is None:
+        path = _a_star_search(start, goal, grid_size, cell_size)
+        path_cache.put(key, path)
+    return path
+
+def _a_star_search(start, goal, grid_size, cell_size):
     grid = np.zeros((grid_size, grid_size), dtype=np.uint8)
     for ox, oz in obstacles:
         grid_x = min(int(ox / cell_size), grid_size - 1)
         grid_z = min(int(oz / cell_size), grid_size - 1)
         grid[grid_x, grid_z] = 1
-    start = (min(int(start[0] / cell_size), grid_size - 1), min(int(start[1] / cell_size), grid_size - 1))
-    goal = (min(int(goal[0] / cell_size), grid_size - 1), min(int(goal[1] / cell_size), grid_size - 1))
-    open_set = [(0, start)]
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: math.sqrt((start[0] - goal[0])**2 + (start[1] - goal[1])**2)}
-    while open_set:
-        current_f, current = heapq.heappop(open_set)
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append((current[0] * cell_size, current[1] * cell_size))
-                current = came_from[current]
-            path.append((start[0] * cell_size, start[1] * cell_size))
-            return path[::-1]
-        for dx, dz in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            neighbor = (current[0] + dx, current[1] + dz)
-            if 0 <= neighbor[0] < grid_size and 0 <= neighbor[1] < grid_size and grid[neighbor[0], grid_z] == 0:
-                tentative_g = g_score[current] + (math.sqrt(dx**2 + dz**2) * cell_size)
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + math.sqrt((neighbor[0] - goal[0])**2 + (neighbor[1] - goal[0])**2)
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
-    return []
+    return grid_search.find_path(start, goal, grid, cell_size)
 
 def pure_pursuit(current_pos, current_heading, waypoints, waypoint_idx, lookahead_distance=15.0):  # lookahead 조정
     global last_waypoint_change_time
@@ -260,7 +250,7 @@ def get_move():
 
 @app.route('/update_obstacle', methods=['POST'])
 def update_obstacle():
-    global obstacles, waypoints, current_waypoint_idx
+    global obstacles, obstacles_version, waypoints, current_waypoint_idx
     data = request.get_json()
     if not data:
         print("⚠️ No obstacle data received")
@@ -273,8 +263,10 @@ def update_obstacle():
             x = float(obstacle.get("x", 0))
             z = float(obstacle.get("z", 0))
             new_obstacles.add((int(x), int(z)))
+        if new_obstacles != obstacles:
+            obstacles_version += 1
         obstacles = new_obstacles
-        print(f"🪨 Obstacles updated: {len(obstacles)} obstacles")
+        print(f"🪨 Obstacles updated: {len(obstacles)} obstacles (version {obstacles_version})")
         if waypoints and current_position:
             waypoints = a_star(current_position, waypoints[current_waypoint_idx])
             print(f"🛤️ Waypoints updated after obstacle change: {len(waypoints)} points")
@@ -344,6 +336,18 @@ def init():
         "rdStartZ": 280
     })
 
+@app.route('/get_status', methods=['GET'])
+def get_status():
+    return jsonify({
+        "current_position": current_position,
+        "destination": destination,
+        "waypoints": len(waypoints),
+        "current_waypoint": current_waypoint_idx,
+        "obstacles": len(obstacles),
+        "obstacles_version": obstacles_version,
+        "path_cache": path_cache.stats()
+    })
+
 @app.route('/start', methods=['GET'])
 def start():
     return jsonify({"control": ""})
@@ -0,0 +1,98 @@
+import json
+import math
+import sys
+import time
+
+from semple_astar import Grid, Pathfinding, NavigationController, NavigationConfig, MAP_FILE
+from decision_trace import read_trace, optional, MOVES, CONTROLLERS, POSITION, GOAL, PLAN, MOVE, ENEMY, OBSTACLE, PLANNER, CONTROLLER, HEIGHT
+from map_loader import load_map_mask
+
+# 결정 기록 재생: 기록의 입력(위치, 목표, 경로 게시, 적, 장애물, 지면 높이)을 시뮬레이터 없이 순서대로 다시 넣고
+# get_move 출력을 기록과 비교. 설정을 바꿔(key=value) 재생하면 같은 에피소드에서 제어기 A/B 비교가 된다.
+#   python replay_trace.py trace.bin                      # 같은 설정: 결정이 모두 같아야 함
+#   python replay_trace.py trace.bin CONTROLLER='"mpc"'   # 다른 제어기: 일치율과 결정 시간 비교
+# 경로는 PLAN 레코드 시점에 동기로 다시 계획한다 (비동기 작업이 언제 끝났는지까지 기록을 따름).
+# 실행 중 /set_planner, /set_controller 전환도 기록대로 따르되, 같은 항목을 key=value로 바꿨으면 그 값을 유지
+# (PLANNER를 바꾸면 기록된 플래너 대신 모든 목표/경로 계획에 그 플래너를 씀)
+# 재현되지 않는 것: 적 예측의 경과 시간 보정(벽시계), MPC 예산 초과 여부(실행 속도)
+
+def build_grid(map_file=MAP_FILE):
+    grid = Grid(width=300, height=300, padding=1)
+    grid.set_obstacle_mask(load_map_mask(map_file, grid.width, grid.height))
+    return grid
+
+def replay(path, overrides=None, grid=None):
+    seed, settings, records = read_trace(path)
+    overrides = overrides or {}
+    settings.update(overrides)
+    settings.update(SEED=seed, TRACE_FILE=None, ASYNC_PLANNING=False)
+    controller = NavigationController(NavigationConfig(**settings), Pathfinding(), grid or build_grid())
+    planner_names = list(controller.planners)
+    planner_override = overrides.get("PLANNER")
+    decisions, mismatches, first_divergence = 0, 0, None
+    move_ms, plan_ms = [], 0.0
+    start_time = time.perf_counter()
+    for i, (kind, a, b, c, d, code, weight) in enumerate(records):
+        if kind == POSITION:
+            controller.update_position(f"{a},0,{b}", optional(c))
+        elif kind == GOAL:
+            controller._set_goal(a, b, planner_override or planner_names[code - 1])
+        elif kind == PLAN:
+            plan_start = time.perf_counter()
+            controller._apply_path(*controller._compute_path((a, b), (c, d), planner_override or planner_names[code - 1]))
+            plan_ms += (time.perf_counter() - plan_start) * 1000
+        elif kind == ENEMY:
+            controller.enemy_tracker.observe(a, b, optional(c), optional(d))
+        elif kind == OBSTACLE:
+            controller.grid.set_obstacles([(a, b, c, d)])
+        elif kind == HEIGHT:
+            controller.grid.observe_height(a, b, c)
+        elif kind == PLANNER:
+            if planner_override is None:
+                controller.set_planner(planner_names[code - 1])
+        elif kind == CONTROLLER:
+            if "CONTROLLER" not in overrides:
+                controller.set_controller(CONTROLLERS[code])
+        elif kind == MOVE:
+            state = controller._decision_state()
+            move_start = time.perf_counter()
+            move = controller.get_move()
+            move_ms.append((time.perf_counter() - move_start) * 1000)
+            decisions += 1
+            # 가중치는 f32로 기록되므로 그 정밀도로 비교
+            same = move["move"] == MOVES[code] and math.isclose(move["weight"], weight, rel_tol=1e-6, abs_tol=1e-6)
+            if not same:
+                mismatches += 1
+            if first_divergence is None and (not same or not _same_state(state, (a, b, c, d))):
+                first_divergence = {
+                    "record": i,
+                    "decision": decisions - 1,
+                    "recorded": {"state": (a, b, c, d), "move": MOVES[code], "weight": weight},
+                    "replayed": {"state": state, "move": move["move"], "weight": move["weight"]},
+                }
+    move_ms.sort()
+    return {
+        "records": len(records),
+        "decisions": decisions,
+        "mismatches": mismatches,
+        "agreement": 1 - mismatches / decisions if decisions else None,
+        "first_divergence": first_divergence,
+        "replay_ms": (time.perf_counter() - start_time) * 1000,
+        "plan_ms": plan_ms,
+        "move_us_mean": sum(move_ms) / len(move_ms) * 1000 if move_ms else None,
+        "move_us_p99": move_ms[int(len(move_ms) * 0.99)] * 1000 if move_ms else None,
+    }
+
+def _same_state(replayed, recorded):
+    # nan(위치 모름)끼리는 같은 것으로 봄
+    return all(x == y or (math.isnan(x) and math.isnan(y)) for x, y in zip(replayed, recorded))
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("usage: python replay_trace.py TRACE_FILE [CONFIG_KEY=JSON_VALUE ...]")
+        sys.exit(1)
+    overrides = {}
+    for arg in sys.argv[2:]:
+        key, value = arg.split("=", 1)
+        overrides[key] = json.loads(value)
+    print(json.dumps(replay(sys.argv[1], overrides), indent=2))
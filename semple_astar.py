@@ -1,118 +1,531 @@
 from flask import Flask, request, jsonify
 import math
+import os
 import heapq
 import random
+import threading
 import time
-from dataclasses import dataclass
+import numpy as np
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict
 from typing import Optional, Tuple, Dict, List
+from dstar_lite import DStarLite
+from hpa_star import HierarchicalPathfinding
+from path_cache import PathCache
+from flow_field import FlowFieldService
+from jps import JumpPointSearch
+from multires import MultiResolutionPathfinding
+from space_time import EnemyTracker, SpaceTimePlanner
+from mpc import MPCController
+from decision_trace import DecisionTrace, POSITION, GOAL, PLAN, ENEMY, OBSTACLE, PLANNER, CONTROLLER, HEIGHT, CONTROLLERS, optional
+from path_smoothing import shortcut, smooth_path, TANK_MAX_SPEED
+from cost_layers import CostLayers
+from map_loader import load_map_mask
+from clearance import ClearanceField
 
 app = Flask(__name__)
 
 # A* 알고리즘 관련 클래스
-class Node:
-    def __init__(self, grid_x, grid_z):
-        self.grid_x = grid_x
-        self.grid_z = grid_z
-        self.g_cost = 0
-        self.h_cost = 0
-        self.parent = None
-        self.is_obstacle = False
-        self.is_near_obstacle = False  # 벽 근처 여부 플래그
-
-    @property
-    def f_cost(self):
-        return self.g_cost + self.h_cost
-
-    def __lt__(self, other):
-        return self.f_cost < other.f_cost
+MOVE_COST = 10           # 한 칸 이동 비용
+NEAR_OBSTACLE_COST = 5   # 벽 바로 옆 칸의 추가 비용 (팽창 층, 거리에 따라 감쇠)
+DIAGONAL_COST = 14       # 대각선 이동 비용 (10 * sqrt(2))
+SLOPE_COST = 20          # 이웃 칸과 높이차 1 m당 추가 비용 (경사 층)
+CLEARANCE_MAX = 20       # 벽까지 거리장의 상한 (m), 이보다 먼 칸은 모두 이 값
+
+class SearchBuffers:
+    # 탐색별 g/parent 상태를 미리 할당한 평면 배열에 보관
+    # generation 카운터로 O(1) 초기화 (stamp가 현재 세대와 같을 때만 값이 유효)
+    def __init__(self, size):
+        self.size = size
+        self.g_cost = [0] * size
+        self.parent = [-1] * size
+        self.visited = [0] * size  # g_cost/parent가 기록된 세대
+        self.closed = [0] * size   # 확장이 끝난 세대
+        self.generation = 0
+
+    def reset(self):
+        self.generation += 1
+        return self.generation
 
 class Grid:
-    def __init__(self, width=300, height=300, padding=1):
+    def __init__(self, width=300, height=300, padding=1, inflation_decay=1.0, clearance_threshold=None):
         self.width = width
         self.height = height
-        self.padding = padding  # 장애물 패딩 거리
-        self.grid = [[Node(x, z) for z in range(height)] for x in range(width)]
+        self.padding = padding  # 장애물 패딩(팽창) 거리
+        self.size = width * height
+        # grid[x][z] 순서 그대로 (width, height) 배열에 플래그 저장
+        self.is_obstacle = np.zeros((width, height), dtype=np.uint8)
+        # 탐색 루프용 평면 뷰 (복사 없음, cell = x * height + z)
+        self.obstacle_flat = memoryview(self.is_obstacle.reshape(-1))
+        self.search = SearchBuffers(self.size)
+        # 가장 가까운 벽까지의 유클리드 거리 (장애물이 추가될 때 바뀐 창만 갱신, clearance.at()으로 O(1) 조회)
+        self.clearance = ClearanceField(self.is_obstacle, max(CLEARANCE_MAX, clearance_threshold or 0))
+        # 벽/팽창/경사 층을 합친 진입 비용은 entry_costs()로 읽음
+        # clearance_threshold를 주면 패딩 칸 대신 벽까지 거리 <= threshold인 칸에 팽창 비용
+        self.layers = CostLayers(
+            self.is_obstacle, MOVE_COST, NEAR_OBSTACLE_COST, padding, inflation_decay, SLOPE_COST,
+            clearance=self.clearance if clearance_threshold is not None else None,
+            clearance_threshold=clearance_threshold,
+        )
+        self.version = 0  # 비용 맵 버전 (장애물이나 경사 비용이 바뀔 때마다 증가)
+        # 장애물 쓰기 -> 층 무효화 -> 버전 증가를 한 덩어리로 (백그라운드 플래너가 그 사이에 비용 맵을 다시 만들지 않게)
+        self.lock = threading.RLock()
 
-    def node_from_world_point(self, world_x, world_z):
+    def cell_from_world_point(self, world_x, world_z):
         grid_x = max(0, min(int(world_x), self.width - 1))
         grid_z = max(0, min(int(world_z), self.height - 1))
-        return self.grid[grid_x][grid_z]
+        return grid_x * self.height + grid_z
+
+    def cell_coords(self, cell):
+        return divmod(cell, self.height)
 
     def set_obstacle(self, x_min, x_max, z_min, z_max):
         x_min = max(0, min(int(x_min), self.width - 1))
         x_max = max(0, min(int(x_max), self.width - 1))
         z_min = max(0, min(int(z_min), self.height - 1))
         z_max = max(0, min(int(z_max), self.height - 1))
-        # 실제 장애물 설정
-        for x in range(x_min, x_max + 1):
-            for z in range(z_min, z_max + 1):
-                self.grid[x][z].is_obstacle = True
-        # 패딩 영역 설정 (비용 페널티용)
-        for x in range(max(0, x_min - self.padding), min(self.width, x_max + self.padding + 1)):
-            for z in range(max(0, z_min - self.padding), min(self.height, z_max + self.padding + 1)):
-                if not self.grid[x][z].is_obstacle:
-                    self.grid[x][z].is_near_obstacle = True
-
-    def get_neighbors(self, node):
+        with self.lock:
+            # 실제 장애물 설정 (패딩 비용은 팽창 층에서 계산)
+            added = np.zeros(self.is_obstacle.shape, dtype=bool)
+            added[x_min:x_max + 1, z_min:z_max + 1] = self.is_obstacle[x_min:x_max + 1, z_min:z_max + 1] == 0
+            self.is_obstacle[x_min:x_max + 1, z_min:z_max + 1] = 1
+            self.clearance.add_obstacles(added)
+            self.layers.walls_changed()
+            self.version += 1
+
+    def set_obstacles(self, rects):
+        # 여러 사각형 (x_min, x_max, z_min, z_max)을 한 번에 래스터화
+        rects = np.asarray(rects, dtype=float).reshape(-1, 4)
+        if len(rects) == 0:
+            return 0
+        bounds = rects.astype(int)  # int()와 같은 0 방향 절삭
+        x_min = np.clip(bounds[:, 0], 0, self.width - 1)
+        x_max = np.clip(bounds[:, 1], 0, self.width - 1)
+        z_min = np.clip(bounds[:, 2], 0, self.height - 1)
+        z_max = np.clip(bounds[:, 3], 0, self.height - 1)
+        # 실제 장애물 설정 (뒤집힌 사각형은 원래 루프처럼 빈 영역, 패딩 비용은 팽창 층에서 계산)
+        solid = (x_min <= x_max) & (z_min <= z_max)
+        occupied = self._rasterize(x_min[solid], x_max[solid] + 1, z_min[solid], z_max[solid] + 1)
+        with self.lock:
+            added = (occupied == 1) & (self.is_obstacle == 0)
+            self.is_obstacle |= occupied
+            self.clearance.add_obstacles(added)
+            self.layers.walls_changed()
+            self.version += 1
+        return len(rects)
+
+    def set_obstacle_mask(self, mask):
+        # (width, height) 점유 배열을 한 번에 반영 (맵 파일 로더 결과 등)
+        mask = np.asarray(mask, dtype=np.uint8)
+        with self.lock:
+            added = (mask == 1) & (self.is_obstacle == 0)
+            self.is_obstacle |= mask
+            self.clearance.add_obstacles(added)
+            self.layers.walls_changed()
+            self.version += 1
+        return int(np.count_nonzero(mask))
+
+    def _rasterize(self, x_start, x_end, z_start, z_end):
+        # 2D 차분 배열: 사각형마다 꼭짓점 4개만 기록하고 누적합 두 번으로 전체를 채움
+        diff = np.zeros((self.width + 1, self.height + 1), dtype=np.int32)
+        np.add.at(diff, (x_start, z_start), 1)
+        np.add.at(diff, (x_end, z_start), -1)
+        np.add.at(diff, (x_start, z_end), -1)
+        np.add.at(diff, (x_end, z_end), 1)
+        coverage = diff.cumsum(axis=0).cumsum(axis=1)[:self.width, :self.height]
+        return (coverage > 0).astype(np.uint8)
+
+    def entry_costs(self):
+        # 각 칸에 들어갈 때의 비용 (층을 합친 평면 float 배열, 장애물은 inf)
+        # 층이 바뀌지 않았으면 같은 배열 객체를 돌려주므로 플래너는 동일성으로 변경 여부를 확인
+        with self.lock:
+            return self.layers.combined()
+
+    def observe_height(self, world_x, world_z, y):
+        # 주행 중 관측한 지면 높이를 경사 층에 반영 (비용이 바뀌면 맵 버전 증가)
+        with self.lock:
+            if self.layers.observe_height(world_x, world_z, y):
+                self.version += 1
+
+    def line_of_sight(self, x0, z0, x1, z1):
+        # Bresenham 직선 위에 장애물이 없는지 검사
+        # 대각선으로 넘어갈 때는 모서리 양쪽 칸도 확인해서 벽 틈을 빠져나가지 않게 함
+        blocked = self.obstacle_flat
+        height = self.height
+        dx, dz = abs(x1 - x0), abs(z1 - z0)
+        sx = 1 if x1 > x0 else -1
+        sz = 1 if z1 > z0 else -1
+        err = dx - dz
+        x, z = x0, z0
+        while True:
+            if blocked[x * height + z]:
+                return False
+            if x == x1 and z == z1:
+                return True
+            e2 = 2 * err
+            step_x, step_z = e2 > -dz, e2 < dx
+            if step_x and step_z and (blocked[(x + sx) * height + z] or blocked[x * height + z + sz]):
+                return False
+            if step_x:
+                err -= dz
+                x += sx
+            if step_z:
+                err += dx
+                z += sz
+
+    def get_neighbors(self, cell):
         neighbors = []
+        grid_x, grid_z = divmod(cell, self.height)
         for dx, dz in [(0, 1), (1, 0), (0, -1), (-1, 0)]:  # 4방향 이동
-            new_x, new_z = node.grid_x + dx, node.grid_z + dz
+            new_x, new_z = grid_x + dx, grid_z + dz
             if 0 <= new_x < self.width and 0 <= new_z < self.height:
-                neighbor = self.grid[new_x][new_z]
-                if not neighbor.is_obstacle:
+                neighbor = new_x * self.height + new_z
+                if not self.obstacle_flat[neighbor]:
                     neighbors.append((neighbor, dx, dz))
         return neighbors
 
 class Pathfinding:
+    def __init__(self, flow_fields=None):
+        self.expansions = 0  # 마지막 탐색에서 확장한 노드 수
+        self.flow_fields = flow_fields  # 목표 거리장이 이미 있으면 완전한 휴리스틱으로 사용
+
     def find_path(self, start_pos, target_pos, grid):
-        start_node = grid.node_from_world_point(start_pos[0], start_pos[1])
-        target_node = grid.node_from_world_point(target_pos[0], target_pos[1])
-        
-        if start_node.is_obstacle or target_node.is_obstacle:
+        start_cell = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        target_cell = grid.cell_from_world_point(target_pos[0], target_pos[1])
+        blocked = grid.obstacle_flat
+        cost = memoryview(grid.entry_costs())
+
+        if blocked[start_cell] or blocked[target_cell]:
             print("Warning: Start or target position is on an obstacle.")
             return []
 
-        open_set = []
-        heapq.heappush(open_set, (start_node.f_cost, id(start_node), start_node))
-        open_set_nodes = {start_node}
-        closed_set = set()
+        state = grid.search
+        gen = state.reset()
+        g_cost, parent, visited, closed = state.g_cost, state.parent, state.visited, state.closed
+        width, height = grid.width, grid.height
+        target_x, target_z = divmod(target_cell, height)
+        field = self.flow_fields.lookup(grid, target_cell) if self.flow_fields else None
+        exact_h = field.dist_flat if field is not None else None
+
+        g_cost[start_cell] = 0
+        parent[start_cell] = -1
+        visited[start_cell] = gen
+        open_set = [(0, 0, start_cell)]
+        self.expansions = 0
 
         while open_set:
-            _, _, current_node = heapq.heappop(open_set)
-            open_set_nodes.remove(current_node)
-            closed_set.add(current_node)
+            _, _, current = heapq.heappop(open_set)
+            if closed[current] == gen:
+                continue  # 이미 더 낮은 비용으로 확장된 중복 항목
+            closed[current] = gen
+            self.expansions += 1
 
-            if current_node.grid_x == target_node.grid_x and current_node.grid_z == target_node.grid_z:
-                return self.retrace_path(start_node, current_node)
+            if current == target_cell:
+                return self.retrace_path(start_cell, current, grid)
 
-            for neighbor, dx, dz in grid.get_neighbors(current_node):
-                if neighbor in closed_set:
+            current_g = g_cost[current]
+            cx, cz = divmod(current, height)
+            for neighbor, nx, nz in (
+                (current + 1, cx, cz + 1) if cz + 1 < height else (-1, 0, 0),
+                (current + height, cx + 1, cz) if cx + 1 < width else (-1, 0, 0),
+                (current - 1, cx, cz - 1) if cz > 0 else (-1, 0, 0),
+                (current - height, cx - 1, cz) if cx > 0 else (-1, 0, 0),
+            ):
+                if neighbor < 0 or blocked[neighbor] or closed[neighbor] == gen:
                     continue
-                move_cost = 10
-                # 벽 근처 노드에 페널티 추가
-                if neighbor.is_near_obstacle:
-                    move_cost += 5  # 패딩 영역 비용 증가 (조정 가능)
-                new_cost = current_node.g_cost + move_cost
-                if new_cost < neighbor.g_cost or neighbor not in open_set_nodes:
-                    neighbor.g_cost = new_cost
-                    dx_h = abs(neighbor.grid_x - target_node.grid_x)
-                    dz_h = abs(neighbor.grid_z - target_node.grid_z)
-                    neighbor.h_cost = (dx_h + dz_h) * 10
-                    neighbor.parent = current_node
-                    if neighbor not in open_set_nodes:
-                        open_set_nodes.add(neighbor)
-                        heapq.heappush(open_set, (neighbor.f_cost, id(neighbor), neighbor))
+                # 진입 비용 = 기본 이동 비용 + 팽창(벽 근처) + 경사
+                new_cost = current_g + cost[neighbor]
+                if visited[neighbor] != gen or new_cost < g_cost[neighbor]:
+                    visited[neighbor] = gen
+                    g_cost[neighbor] = new_cost
+                    parent[neighbor] = current
+                    if exact_h is not None:
+                        h_cost = exact_h[neighbor]
+                    else:
+                        h_cost = (abs(nx - target_x) + abs(nz - target_z)) * MOVE_COST
+                    # f가 같으면 목표에 더 가까운(h가 작은) 노드 우선
+                    heapq.heappush(open_set, (new_cost + h_cost, h_cost, neighbor))
         return []
 
-    def retrace_path(self, start_node, end_node):
+    def find_paths(self, start_pos, target_positions, grid, with_paths=False, buffers=None):
+        # 시작점에서 탐색 트리 하나를 키워가며 여러 목표까지의 비용(과 경로)을 구함
+        # 가까운 목표부터 A*로 확장하고, 다음 목표로 넘어갈 때는 열린 목록만 새 휴리스틱으로 다시 정렬한다.
+        # 휴리스틱이 일관적이면 닫힌 칸의 g는 목표와 상관없이 최적이므로 이전 목표에서 확장한 칸은 그대로 재사용.
+        # 반환값은 입력 순서대로 (costs, paths)
+        start_cell = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        target_cells = [grid.cell_from_world_point(x, z) for x, z in target_positions]
+        blocked = grid.obstacle_flat
+        cost = memoryview(grid.entry_costs())
+        costs = [float("inf")] * len(target_cells)
+        paths = [[] for _ in target_cells] if with_paths else None
+        self.expansions = 0
+        if blocked[start_cell]:
+            print("Warning: Start position is on an obstacle.")
+            return costs, paths
+
+        remaining = {}  # 셀 -> 그 셀을 목표로 한 입력 인덱스들
+        for i, cell in enumerate(target_cells):
+            if not blocked[cell]:
+                remaining.setdefault(cell, []).append(i)
+
+        state = buffers or grid.search
+        gen = state.reset()
+        g_cost, parent, visited, closed = state.g_cost, state.parent, state.visited, state.closed
+        width, height = grid.width, grid.height
+        start_x, start_z = divmod(start_cell, height)
+        g_cost[start_cell] = 0
+        parent[start_cell] = -1
+        visited[start_cell] = gen
+        frontier = {start_cell}  # 열린 목록에 있는 칸 (다음 목표로 넘어갈 때 다시 정렬)
+
+        def manhattan(cell):
+            x, z = divmod(cell, height)
+            return abs(x - start_x) + abs(z - start_z)
+
+        for target_cell in sorted(remaining, key=manhattan):
+            if target_cell not in remaining:
+                continue  # 앞선 목표를 찾는 동안 이미 확정됨
+            target_x, target_z = divmod(target_cell, height)
+            open_set = []
+            for cell in frontier:
+                if closed[cell] != gen:
+                    x, z = divmod(cell, height)
+                    h_cost = (abs(x - target_x) + abs(z - target_z)) * MOVE_COST
+                    open_set.append((g_cost[cell] + h_cost, h_cost, cell))
+            heapq.heapify(open_set)
+            frontier = set()
+
+            while open_set:
+                _, _, current = heapq.heappop(open_set)
+                if closed[current] == gen:
+                    continue
+                closed[current] = gen
+                self.expansions += 1
+
+                current_g = g_cost[current]
+                if current in remaining:
+                    for i in remaining.pop(current):
+                        costs[i] = current_g
+                        if with_paths:
+                            paths[i] = self._trace(parent, start_cell, current, grid)
+
+                # 목표 칸도 이웃까지 확장한 뒤 멈춰야 열린 목록이 닫힌 영역의 경계를 온전히 유지함
+                cx, cz = divmod(current, height)
+                for neighbor, nx, nz in (
+                    (current + 1, cx, cz + 1) if cz + 1 < height else (-1, 0, 0),
+                    (current + height, cx + 1, cz) if cx + 1 < width else (-1, 0, 0),
+                    (current - 1, cx, cz - 1) if cz > 0 else (-1, 0, 0),
+                    (current - height, cx - 1, cz) if cx > 0 else (-1, 0, 0),
+                ):
+                    if neighbor < 0 or blocked[neighbor] or closed[neighbor] == gen:
+                        continue
+                    new_cost = current_g + cost[neighbor]
+                    if visited[neighbor] != gen or new_cost < g_cost[neighbor]:
+                        visited[neighbor] = gen
+                        g_cost[neighbor] = new_cost
+                        parent[neighbor] = current
+                        h_cost = (abs(nx - target_x) + abs(nz - target_z)) * MOVE_COST
+                        heapq.heappush(open_set, (new_cost + h_cost, h_cost, neighbor))
+                if current == target_cell:
+                    break
+            else:
+                break  # 열린 목록이 비었으면 남은 목표는 모두 도달 불가
+            frontier.update(cell for _, _, cell in open_set)
+        return costs, paths
+
+    def _trace(self, parent, start_cell, end_cell, grid):
         path = []
-        current_node = end_node
-        while current_node != start_node:
-            path.append(current_node)
-            current_node = current_node.parent
-        path.append(start_node)
+        current = end_cell
+        while current != start_cell:
+            path.append(current)
+            current = parent[current]
+        path.append(start_cell)
         path.reverse()
-        return [(node.grid_x, node.grid_z) for node in path]
+        return [grid.cell_coords(cell) for cell in path]
+
+    def retrace_path(self, start_cell, end_cell, grid):
+        return self._trace(grid.search.parent, start_cell, end_cell, grid)
+
+class BidirectionalPathfinding(Pathfinding):
+    # 양방향 A*: 시작점(정방향)과 목표(역방향)에서 동시에 탐색해 가운데서 만남
+    # 두 방향이 평균 퍼텐셜 p(v) = (h_목표(v) - h_시작(v)) / 2 를 부호만 바꿔 쓰면 (Ikeda et al.)
+    # 양쪽 축소 비용이 모두 0 이상이라 양방향 다익스트라의 종료 조건을 그대로 쓸 수 있다:
+    #   정방향 최소 키 + 역방향 최소 키 >= mu (지금까지 두 탐색이 이어진 최단 경로 비용) 이면 mu가 최적
+    # 비용 모델은 4방향 A*와 같음 (역방향으로 u <- v를 지날 때의 비용은 v의 진입 비용)
+    def __init__(self):
+        super().__init__()
+        self.backward = None  # 역방향 탐색 버퍼 (정방향은 grid.search 사용)
+
+    def find_path(self, start_pos, target_pos, grid):
+        start_cell = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        target_cell = grid.cell_from_world_point(target_pos[0], target_pos[1])
+        blocked = grid.obstacle_flat
+        cost = memoryview(grid.entry_costs())
+
+        if blocked[start_cell] or blocked[target_cell]:
+            print("Warning: Start or target position is on an obstacle.")
+            return []
+
+        if self.backward is None or self.backward.size != grid.size:
+            self.backward = SearchBuffers(grid.size)
+        forward, backward = grid.search, self.backward
+        gen_f, gen_b = forward.reset(), backward.reset()
+        g_f, parent_f, visited_f, closed_f = forward.g_cost, forward.parent, forward.visited, forward.closed
+        g_b, parent_b, visited_b, closed_b = backward.g_cost, backward.parent, backward.visited, backward.closed
+        width, height = grid.width, grid.height
+        start_x, start_z = divmod(start_cell, height)
+        target_x, target_z = divmod(target_cell, height)
+        half = MOVE_COST / 2.0
+
+        g_f[start_cell] = g_b[target_cell] = 0
+        parent_f[start_cell] = parent_b[target_cell] = -1
+        visited_f[start_cell] = gen_f
+        visited_b[target_cell] = gen_b
+        distance = abs(start_x - target_x) + abs(start_z - target_z)
+        open_f = [(distance * half, distance, start_cell)]
+        open_b = [(distance * half, distance, target_cell)]
+        best, meet = (0, start_cell) if start_cell == target_cell else (float("inf"), -1)
+        self.expansions = 0
+
+        while open_f and open_b:
+            # 이미 확장된 중복 항목을 걷어내야 맨 앞 키가 실제 하한
+            while open_f and closed_f[open_f[0][2]] == gen_f:
+                heapq.heappop(open_f)
+            while open_b and closed_b[open_b[0][2]] == gen_b:
+                heapq.heappop(open_b)
+            if not open_f or not open_b or open_f[0][0] + open_b[0][0] >= best:
+                break
+            # 열린 목록이 작은 쪽을 확장 (좁은 통로 쪽 탐색이 먼저 진행됨)
+            is_forward = len(open_f) <= len(open_b)
+            if is_forward:
+                _, _, current = heapq.heappop(open_f)
+                closed_f[current] = gen_f
+            else:
+                _, _, current = heapq.heappop(open_b)
+                closed_b[current] = gen_b
+            self.expansions += 1
+
+            cx, cz = divmod(current, height)
+            if is_forward:
+                current_g = g_f[current]
+                for neighbor, nx, nz in (
+                    (current + 1, cx, cz + 1) if cz + 1 < height else (-1, 0, 0),
+                    (current + height, cx + 1, cz) if cx + 1 < width else (-1, 0, 0),
+                    (current - 1, cx, cz - 1) if cz > 0 else (-1, 0, 0),
+                    (current - height, cx - 1, cz) if cx > 0 else (-1, 0, 0),
+                ):
+                    if neighbor < 0 or blocked[neighbor] or closed_f[neighbor] == gen_f:
+                        continue
+                    new_cost = current_g + cost[neighbor]
+                    if visited_f[neighbor] != gen_f or new_cost < g_f[neighbor]:
+                        visited_f[neighbor] = gen_f
+                        g_f[neighbor] = new_cost
+                        parent_f[neighbor] = current
+                        to_target = abs(nx - target_x) + abs(nz - target_z)
+                        to_start = abs(nx - start_x) + abs(nz - start_z)
+                        heapq.heappush(open_f, (new_cost + (to_target - to_start) * half, to_target, neighbor))
+                    if visited_b[neighbor] == gen_b and g_f[neighbor] + g_b[neighbor] < best:
+                        best, meet = g_f[neighbor] + g_b[neighbor], neighbor
+            else:
+                # 역방향: current로 들어오는 비용을 이전 칸(이웃)의 g에 더함
+                new_cost = g_b[current] + cost[current]
+                for neighbor, nx, nz in (
+                    (current + 1, cx, cz + 1) if cz + 1 < height else (-1, 0, 0),
+                    (current + height, cx + 1, cz) if cx + 1 < width else (-1, 0, 0),
+                    (current - 1, cx, cz - 1) if cz > 0 else (-1, 0, 0),
+                    (current - height, cx - 1, cz) if cx > 0 else (-1, 0, 0),
+                ):
+                    if neighbor < 0 or blocked[neighbor] or closed_b[neighbor] == gen_b:
+                        continue
+                    if visited_b[neighbor] != gen_b or new_cost < g_b[neighbor]:
+                        visited_b[neighbor] = gen_b
+                        g_b[neighbor] = new_cost
+                        parent_b[neighbor] = current
+                        to_target = abs(nx - target_x) + abs(nz - target_z)
+                        to_start = abs(nx - start_x) + abs(nz - start_z)
+                        heapq.heappush(open_b, (new_cost + (to_start - to_target) * half, to_start, neighbor))
+                    if visited_f[neighbor] == gen_f and g_f[neighbor] + g_b[neighbor] < best:
+                        best, meet = g_f[neighbor] + g_b[neighbor], neighbor
+
+        if meet < 0:
+            return []
+        # 시작 -> 만난 칸은 정방향 부모, 만난 칸 -> 목표는 역방향 부모를 따라감
+        path = self._trace(parent_f, start_cell, meet, grid)
+        current = parent_b[meet]
+        while current != -1:
+            path.append(grid.cell_coords(current))
+            current = parent_b[current]
+        return path
+
+class AnyAnglePathfinding(Pathfinding):
+    # 8방향 A* (옥타일 휴리스틱) + 시야선 단축: 꺾이는 지점만 웨이포인트로 반환
+    def find_path(self, start_pos, target_pos, grid):
+        cells = self.find_cell_path(start_pos, target_pos, grid)
+        return self.smooth_path(cells, grid)
+
+    def find_cell_path(self, start_pos, target_pos, grid):
+        start_cell = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        target_cell = grid.cell_from_world_point(target_pos[0], target_pos[1])
+        blocked = grid.obstacle_flat
+        cost = memoryview(grid.entry_costs())
+
+        if blocked[start_cell] or blocked[target_cell]:
+            print("Warning: Start or target position is on an obstacle.")
+            return []
+
+        state = grid.search
+        gen = state.reset()
+        g_cost, parent, visited, closed = state.g_cost, state.parent, state.visited, state.closed
+        width, height = grid.width, grid.height
+        target_x, target_z = divmod(target_cell, height)
+
+        g_cost[start_cell] = 0
+        parent[start_cell] = -1
+        visited[start_cell] = gen
+        open_set = [(0, 0, start_cell)]
+        self.expansions = 0
+
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
+            self.expansions += 1
+
+            if current == target_cell:
+                return self.retrace_path(start_cell, current, grid)
+
+            current_g = g_cost[current]
+            cx, cz = divmod(current, height)
+            for dx, dz in ((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)):
+                nx, nz = cx + dx, cz + dz
+                if not (0 <= nx < width and 0 <= nz < height):
+                    continue
+                neighbor = nx * height + nz
+                if blocked[neighbor] or closed[neighbor] == gen:
+                    continue
+                if dx and dz:
+                    # 벽 모서리를 대각선으로 가로지르지 않음
+                    if blocked[cx * height + nz] or blocked[nx * height + cz]:
+                        continue
+                    step_cost = DIAGONAL_COST
+                else:
+                    step_cost = MOVE_COST
+                # 대각선이면 기본 이동 비용만 대각선 비용으로 바꾸고 층별 추가 비용은 그대로
+                new_cost = current_g + step_cost + cost[neighbor] - MOVE_COST
+                if visited[neighbor] != gen or new_cost < g_cost[neighbor]:
+                    visited[neighbor] = gen
+                    g_cost[neighbor] = new_cost
+                    parent[neighbor] = current
+                    hx, hz = abs(nx - target_x), abs(nz - target_z)
+                    # 옥타일 거리: 대각선으로 min(dx, dz), 나머지는 직선
+                    h_cost = MOVE_COST * max(hx, hz) + (DIAGONAL_COST - MOVE_COST) * min(hx, hz)
+                    # f가 같으면 h가 작은 칸 우선 (대각선 평지에서 f 동점 칸을 번호순으로 다 펼치지 않게)
+                    heapq.heappush(open_set, (new_cost + h_cost, h_cost, neighbor))
+        return []
+
+    def smooth_path(self, path, grid):
+        return shortcut(path, grid)
 
 # 제어 관련 클래스 (변경 없음)
 @dataclass
@@ -127,27 +540,131 @@ class NavigationConfig:
     WEIGHT_FACTORS: Dict[str, float] = None
     WAYPOINT_OFFSET: float = 35
     ANGLE_THRESHOLD: float = math.radians(15)
+    PLANNER: str = "astar"  # "astar": 매번 새로 탐색, "dstar": D* Lite 증분 재탐색, "anyangle": 8방향 + 시야선 단축, "hpa": 계층 탐색, "flow": 목표 거리장, "jps": 점프 포인트 탐색, "bidir": 양방향 A*, "multires": 거친 격자 + 1 m 통로 정제, "spacetime": 적 예측 위치를 피하는 시공간 A*
+    ASYNC_PLANNING: bool = False  # True이면 경로 계획을 백그라운드 스레드에서 수행 (요청 스레드를 막지 않음)
+    SMOOTH_PATH: bool = False  # True이면 칸 경로를 단축/곡선화해 TOLERANCE 간격 웨이포인트로 재표본
+    ENEMY_REPLAN_INTERVAL: float = 1.0  # "spacetime" 플래너일 때 적 관측으로 재계획하는 최소 간격 (초)
+    PLAN_AHEAD: int = 0  # > 0이면 get_move가 이만큼의 틱을 미리 시뮬레이션해 명령 큐로 내보냄 (0이면 매 폴링마다 계산)
+    DRIFT_THRESHOLD: float = 3.0  # 실제 위치가 큐의 예측 위치에서 이보다 (m) 벗어나면 큐를 버리고 다시 채움
+    CONTROLLER: str = "heuristic"  # "heuristic": 가중치 랜덤 선택, "mpc": 명령열 롤아웃 (예산 초과 시 heuristic)
+    MPC_LOOKAHEAD: int = 3  # MPC가 경로 이탈/진행을 잴 때 현재 웨이포인트 뒤로 더 볼 웨이포인트 수
+    SEED: Optional[int] = None  # 제어기 전용 RNG 시드 (None이면 임의로 골라 get_status에 표시, 같은 시드면 같은 결정)
+    TRACE_FILE: Optional[str] = None  # 지정하면 결정 입력/출력을 이 파일에 이진 기록 (replay_trace.py로 재생)
 
     def __post_init__(self):
         if self.WEIGHT_FACTORS is None:
             self.WEIGHT_FACTORS = {"D": 0.5, "A": 0.5, "W": 0.5, "S": 1.0}
 
+class PlanningWorker:
+    # 백그라운드 스레드 하나에서 경로 계획 작업을 처리
+    # 대기 슬롯은 하나뿐이라 새 작업이 들어오면 아직 시작 안 한 이전 작업은 취소되고,
+    # 이미 실행 중인 작업은 끝난 뒤 최신 작업이 아니면 결과를 버린다.
+    def __init__(self, controller, history=32):
+        self.controller = controller
+        self.history = history
+        self.condition = threading.Condition()
+        self.pending = None  # (job_id, start, goal, planner)
+        self.latest_job = 0
+        self.jobs = OrderedDict()  # job_id -> 상태 (최근 history개)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, start, goal, planner=None) -> int:
+        with self.condition:
+            self.latest_job += 1
+            job_id = self.latest_job
+            if self.pending is not None:
+                self._set_state(self.pending[0], "cancelled")
+            self.pending = (job_id, start, goal, planner)
+            self._set_state(job_id, "queued")
+            self.condition.notify()
+        return job_id
+
+    def is_current(self, job_id) -> bool:
+        return job_id == self.latest_job
+
+    def status(self, job_id=None) -> Optional[Dict]:
+        with self.condition:
+            job_id = self.latest_job if job_id is None else job_id
+            job = self.jobs.get(job_id)
+            return dict(job, job_id=job_id) if job else None
+
+    def _set_state(self, job_id, state, **info):
+        job = self.jobs.setdefault(job_id, {})
+        job["state"] = state
+        job.update(info)
+        while len(self.jobs) > self.history:
+            self.jobs.popitem(last=False)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                job_id, start, goal, planner = self.pending
+                self.pending = None
+                self._set_state(job_id, "running", planner=planner or self.controller.config.PLANNER)
+            start_time = time.perf_counter()
+            try:
+                plan = self.controller._compute_path(start, goal, planner)
+                published = self.controller._publish(job_id, *plan, source=(start, goal, planner))
+                state = "done" if published else "cancelled"
+            except Exception as e:
+                print(f"Planning job {job_id} failed: {e}")
+                state = "error"
+            with self.condition:
+                self._set_state(job_id, state, plan_ms=(time.perf_counter() - start_time) * 1000)
+
 class NavigationController:
     def __init__(self, config: NavigationConfig, pathfinding: Pathfinding, grid: Grid):
         self.config = config
         self.pathfinding = pathfinding
         self.grid = grid
+        self.enemy_tracker = EnemyTracker()
+        self.last_enemy_replan = 0.0
+        self.planners = {
+            "astar": pathfinding,
+            "dstar": DStarLite(),
+            "anyangle": AnyAnglePathfinding(),
+            "hpa": HierarchicalPathfinding(pathfinding),
+            "flow": pathfinding.flow_fields or FlowFieldService(),
+            "jps": JumpPointSearch(MOVE_COST, DIAGONAL_COST),
+            "bidir": BidirectionalPathfinding(),
+            "multires": MultiResolutionPathfinding(pathfinding),
+            "spacetime": SpaceTimePlanner(pathfinding, self.enemy_tracker),
+        }
+        self.flow_field = None  # "flow" 모드에서 현재 목표의 거리장
+        self.path_cache = PathCache(maxsize=256)
+        self.goal: Optional[Tuple[float, float]] = None  # 최종 목적지 (destination은 현재 웨이포인트)
+        self.goal_planner: Optional[str] = None  # 이 목적지에만 쓸 플래너 (None이면 config.PLANNER, 재계획에도 유지)
         self.current_position: Optional[Tuple[float, float]] = None
         self.current_heading: float = 0.0
+        # 마지막으로 /info에서 받은 실제 위치 (방향 추정용). current_position은 get_move의 자체 예측으로 앞서 갈 수 있음
+        self.reported_position: Optional[Tuple[float, float]] = None
         self.destination: Optional[Tuple[float, float]] = None
         self.last_command: Optional[str] = None
         self.last_update_time: float = time.time()
         self.initial_distance: Optional[float] = None
         self.waypoints: List[Tuple[float, float]] = []
+        self.speed_limits: Optional[List[float]] = None  # SMOOTH_PATH일 때 웨이포인트별 속도 상한 (m/s)
         self.current_waypoint_idx: int = 0
         self.completed: bool = False
+        self.lock = threading.RLock()  # 웨이포인트 교체와 get_move 사이 동기화
+        self.command_queue = deque()  # PLAN_AHEAD 모드에서 미리 계산한 (응답, 그 명령 뒤 예측 위치)
+        self.expected_position: Optional[Tuple[float, float]] = None  # 마지막으로 내보낸 명령의 예측 위치
+        self.queue_stats = {"refills": 0, "served": 0, "drift_invalidations": 0}
+        self.mpc = MPCController()
+        # 전역 random 대신 제어기마다 시드를 가진 RNG (기록에 시드를 남겨 그대로 재현)
+        self.seed = config.SEED if config.SEED is not None else random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+        self.planner_codes = {name: i + 1 for i, name in enumerate(self.planners)}  # 기록용 플래너 번호
+        self.trace = DecisionTrace(config.TRACE_FILE, self.seed, asdict(config)) if config.TRACE_FILE else None
+        self.batch_search = SearchBuffers(grid.size)  # 배치 질의 전용 (백그라운드 계획과 버퍼를 공유하지 않음)
+        self.worker = PlanningWorker(self) if config.ASYNC_PLANNING else None
 
-    def update_position(self, position: str) -> Dict:
+    def update_position(self, position: str, body_deg: Optional[float] = None) -> Dict:
+        # body_deg: /info의 playerBodyX (차체 요 각, 도). 있으면 그 값을 방향 관측으로 쓰고,
+        # 없으면 실제 위치 변화 방향으로 추정 (제자리 회전은 위치가 안 바뀌어 보이지 않음)
         try:
             x, y, z = map(float, position.split(","))
             new_position = (x, z)
@@ -155,21 +672,30 @@ class NavigationController:
             dt = now - self.last_update_time
             self.last_update_time = now
 
-            if self.current_position:
-                prev_x, prev_z = self.current_position
+            new_heading = None
+            if body_deg is not None:
+                new_heading = math.radians(body_deg)
+            elif self.reported_position:
+                # 실제 위치끼리의 차이로만 방향을 잼 (예측 위치와의 차이는 모델 오차가 방향 오차로 들어감)
+                prev_x, prev_z = self.reported_position
                 dx, dz = x - prev_x, z - prev_z
                 distance_moved = math.sqrt(dx**2 + dz**2)
                 if distance_moved > 0.01:
                     new_heading = math.atan2(dx, dz)
-                    self.current_heading = (
-                        self.config.HEADING_SMOOTHING * self.current_heading +
-                        (1 - self.config.HEADING_SMOOTHING) * new_heading
-                    )
-                    self.current_heading = math.atan2(
-                        math.sin(self.current_heading), math.cos(self.current_heading)
-                    )
-
-            self.current_position = new_position
+            if new_heading is not None:
+                # 각 차이를 -pi~pi로 접어서 섞음 (±180° 근처에서 반대 방향으로 평균 나지 않게)
+                error = math.atan2(math.sin(new_heading - self.current_heading), math.cos(new_heading - self.current_heading))
+                self.current_heading += (1 - self.config.HEADING_SMOOTHING) * error
+                self.current_heading = math.atan2(
+                    math.sin(self.current_heading), math.cos(self.current_heading)
+                )
+
+            with self.lock:
+                self.current_position = new_position
+                self.reported_position = new_position
+                self._check_drift(new_position)
+                if self.trace:
+                    self.trace.write(POSITION, x, z, optional(body_deg))
             return {
                 "status": "OK",
                 "current_position": self.current_position,
@@ -178,33 +704,222 @@ class NavigationController:
         except Exception as e:
             return {"status": "ERROR", "message": str(e)}
 
-    def set_destination(self, destination: str) -> Dict:
+    def set_destination(self, destination: str, planner: Optional[str] = None) -> Dict:
+        # planner를 주면 이 목적지(와 이후 재계획)에만 그 플래너를 사용
         try:
+            if planner is not None and planner not in self.planners:
+                return {"status": "ERROR", "message": f"Unknown planner: {planner}"}
             x, y, z = map(float, destination.split(","))
             x = max(0, min(x, 300.0))
             z = max(0, min(z, 300.0))
-            self.destination = (x, z)
+            self._set_goal(x, z, planner)
+            result = {"status": "OK", "destination": {"x": x, "y": y, "z": z}, "planner": self._goal_planner()}
             if self.current_position:
-                self.waypoints = self.pathfinding.find_path(self.current_position, self.destination, self.grid)
-                self.current_waypoint_idx = 0
-                self.completed = False
-                if self.waypoints:
-                    self.destination = self.waypoints[0]
-                else:
-                    self.destination = None
-                    self.completed = True
-                curr_x, curr_z = self.current_position
-                self.initial_distance = math.sqrt((x - curr_x) ** 2 + (z - curr_z) ** 2)
+                if self.worker is not None:
+                    # 새 경로가 게시될 때까지 get_move는 이전 경로를 계속 따라가거나 STOP
+                    result["job_id"] = self.worker.submit(self.current_position, self.goal, self._goal_planner())
+                    result["initial_distance"] = self.initial_distance
+                    return result
+                self._plan_path()
             print(f"Waypoints set: {self.waypoints}")
+            result["initial_distance"] = self.initial_distance
+            result["waypoints"] = self.waypoints
+            return result
+        except Exception as e:
+            return {"status": "ERROR", "message": str(e)}
+
+    def _set_goal(self, x: float, z: float, planner: Optional[str]) -> None:
+        # 목표만 바꾸고 계획은 하지 않음 (재생할 때는 계획을 PLAN 레코드 시점에 따로 함)
+        self.goal = (x, z)
+        self.goal_planner = planner
+        if self.current_position:
+            curr_x, curr_z = self.current_position
+            self.initial_distance = math.sqrt((x - curr_x) ** 2 + (z - curr_z) ** 2)
+        else:
+            self.destination = self.goal
+        if self.trace:
+            with self.lock:
+                # 기본 플래너는 나중에 /set_planner로 바뀔 수 있으므로 지금 실제로 쓸 플래너를 남김
+                self.trace.write(GOAL, x, z, code=self.planner_codes[self._goal_planner()])
+
+    def observe_enemy(self, x: float, z: float, speed: Optional[float] = None, body_deg: Optional[float] = None) -> Optional[Dict]:
+        # 적 위치를 예측기에 반영하고, 시공간 플래너로 가는 중이면 ENEMY_REPLAN_INTERVAL마다 재계획
+        self.enemy_tracker.observe(x, z, speed, body_deg)
+        if self.trace:
+            with self.lock:
+                self.trace.write(ENEMY, x, z, optional(speed), optional(body_deg))
+        if self._goal_planner() != "spacetime":
+            return None
+        now = time.time()
+        if now - self.last_enemy_replan < self.config.ENEMY_REPLAN_INTERVAL:
+            return None
+        self.last_enemy_replan = now
+        return self.replan()
+
+    def observe_height(self, x: float, z: float, y: float) -> None:
+        # 지나간 칸의 지면 높이를 경사 층에 반영 (기록 중이면 재생에서 같은 비용 지도로 계획하도록 남김)
+        self.grid.observe_height(x, z, y)
+        if self.trace:
+            with self.lock:
+                self.trace.write(HEIGHT, x, z, y)
+
+    def set_planner(self, name: str) -> Dict:
+        if name not in self.planners:
+            return {"status": "ERROR", "message": f"Unknown planner: {name}"}
+        prepare_ms = self.prepare_planner(name)
+        with self.lock:
+            self.config.PLANNER = name
+            if self.trace:
+                self.trace.write(PLANNER, code=self.planner_codes[name])
+        return {"status": "OK", "planner": name, "prepare_ms": prepare_ms}
+
+    def prepare_planner(self, name: str) -> float:
+        # 미리 구성할 표가 있는 플래너(hpa, multires)는 전환 시점에 구성 (첫 get_move/경로 요청이 구성 비용을 내지 않게)
+        planner = self.planners[name]
+        if not hasattr(planner, "prepare"):
+            return 0.0
+        start_time = time.perf_counter()
+        planner.prepare(self.grid)
+        return (time.perf_counter() - start_time) * 1000
+
+    def set_controller(self, name: str) -> Dict:
+        if name not in CONTROLLERS:
+            return {"status": "ERROR", "message": f"Unknown controller: {name}"}
+        with self.lock:
+            self.config.CONTROLLER = name
+            self.command_queue.clear()  # PLAN_AHEAD 큐는 이전 제어기로 만든 것
+            if self.trace:
+                self.trace.write(CONTROLLER, code=CONTROLLERS.index(name))
+        return {"status": "OK", "controller": name}
+
+    def _goal_planner(self) -> str:
+        return self.goal_planner or self.config.PLANNER
+
+    def add_obstacles(self, rects) -> int:
+        # 격자에 장애물 사각형을 반영 (기록 중이면 재생에서 같은 순서로 넣도록 남김)
+        count = self.grid.set_obstacles(rects)
+        if self.trace:
+            with self.lock:
+                for rect in rects:
+                    self.trace.write(OBSTACLE, *rect)
+        return count
+
+    def _plan_path(self) -> None:
+        start, goal, planner = self.current_position, self.goal, self._goal_planner()
+        plan = self._compute_path(start, goal, planner)
+        with self.lock:
+            self._apply_path(*plan)
+            self._record_plan(start, goal, planner)
+
+    def _record_plan(self, start, goal, planner) -> None:
+        if self.trace:
+            self.trace.write(PLAN, start[0], start[1], goal[0], goal[1], self.planner_codes[planner])
+
+    def _compute_path(self, start, goal, planner_name=None):
+        # (웨이포인트, 거리장, 웨이포인트별 속도 상한) 계산만 하고 컨트롤러 상태는 건드리지 않음
+        planner_name = planner_name or self.config.PLANNER
+        if planner_name == "flow":
+            return self._plan_flow_field(start, goal)
+        # (플래너, 시작 셀, 목표 셀, 장애물 맵 버전)이 같으면 캐시된 경로 재사용
+        key = (
+            planner_name,
+            self.grid.cell_from_world_point(*start),
+            self.grid.cell_from_world_point(*goal),
+            self.grid.version,
+        )
+        planner = self.planners[planner_name]
+        # 적 위치처럼 격자 밖 상태에 따라 달라지는 플래너는 캐시하지 않음
+        cacheable = getattr(planner, "cacheable", True)
+        waypoints = self.path_cache.get(key) if cacheable else None
+        if waypoints is None:
+            waypoints = planner.find_path(start, goal, self.grid)
+            if cacheable:
+                self.path_cache.put(key, waypoints)
+        if self.config.SMOOTH_PATH:
+            # 칸 경로 대신 시야선 단축 + 회전 반경 제한 곡선을 도달 허용 거리 간격으로 나눈 점을 따라감
+            # 시공간 플래너는 위험 튜브도 벽처럼 피해서 펴야 적을 돌아간 구간이 유지됨
+            avoid = getattr(planner, "avoid_mask", None)
+            waypoints, speed_limits = smooth_path(waypoints, self.grid, self.config.TOLERANCE, avoid=avoid)
+            return waypoints, None, speed_limits
+        return waypoints, None, None
+
+    def _plan_flow_field(self, start, goal):
+        # 웨이포인트는 최종 목표 하나만 두고, 매 틱 거리장의 lookahead 칸을 현재 목적지로 사용
+        flow_field = self.planners["flow"].field(self.grid, goal)
+        if flow_field.distance(self.grid.cell_from_world_point(*start)) == float("inf"):
+            print("Warning: Goal is unreachable from the current position.")
+            return [], None, None
+        return [self.grid.cell_coords(flow_field.goal_cell)], flow_field, None
+
+    def _apply_path(self, waypoints, flow_field=None, speed_limits=None) -> None:
+        with self.lock:
+            self.flow_field = flow_field
+            self.command_queue.clear()  # 새 경로로 다시 시뮬레이션
+            self.waypoints = waypoints
+            self.speed_limits = speed_limits
+            self.current_waypoint_idx = 0
+            self.completed = False
+            if self.waypoints:
+                self.destination = self.waypoints[0]
+            else:
+                self.destination = None
+                self.completed = True
+
+    def _publish(self, job_id, waypoints, flow_field, speed_limits=None, source=None) -> bool:
+        # 최신 작업의 결과만 한 번에 교체 (늦게 끝난 이전 작업은 버림)
+        # source: 기록용 (시작, 목표, 플래너)
+        with self.lock:
+            if not self.worker.is_current(job_id):
+                return False
+            self._apply_path(waypoints, flow_field, speed_limits)
+            if source is not None:
+                self._record_plan(*source)
+            print(f"Waypoints published (job {job_id}): {len(waypoints)}")
+            return True
+
+    def plan_batch(self, destinations: List[str], with_paths: bool = False) -> Dict:
+        # 현재 위치에서 여러 후보 목적지까지 한 번에 계산하고 비용이 낮은 순으로 정렬
+        try:
+            if self.current_position is None:
+                return {"status": "ERROR", "message": "Current position unknown"}
+            goals = []
+            for destination in destinations:
+                x, y, z = map(float, destination.split(","))
+                goals.append((max(0, min(x, 300.0)), max(0, min(z, 300.0))))
+            start_time = time.perf_counter()
+            costs, paths = self.pathfinding.find_paths(
+                self.current_position, goals, self.grid, with_paths, self.batch_search
+            )
+            batch_ms = (time.perf_counter() - start_time) * 1000
+            results = []
+            for i in sorted(range(len(goals)), key=lambda i: costs[i]):
+                reachable = costs[i] != float("inf")
+                result = {"index": i, "goal": goals[i], "reachable": reachable, "cost": costs[i] if reachable else None}
+                if with_paths:
+                    result["path"] = paths[i]
+                results.append(result)
             return {
                 "status": "OK",
-                "destination": {"x": x, "y": y, "z": z},
-                "initial_distance": self.initial_distance,
-                "waypoints": self.waypoints
+                "batch_ms": batch_ms,
+                "expansions": self.pathfinding.expansions,
+                "best": results[0] if results and results[0]["reachable"] else None,
+                "results": results
             }
         except Exception as e:
             return {"status": "ERROR", "message": str(e)}
 
+    def replan(self) -> Dict:
+        # 장애물 변경 후 현재 위치에서 최종 목적지까지 다시 계획
+        if self.goal is None or self.current_position is None or self.completed:
+            return {"status": "SKIPPED"}
+        if self.worker is not None:
+            job_id = self.worker.submit(self.current_position, self.goal, self._goal_planner())
+            return {"status": "QUEUED", "planner": self._goal_planner(), "job_id": job_id}
+        start_time = time.perf_counter()
+        self._plan_path()
+        replan_ms = (time.perf_counter() - start_time) * 1000
+        return {"status": "OK", "planner": self._goal_planner(), "replan_ms": replan_ms, "waypoints": len(self.waypoints)}
+
     def _calculate_speed(self, distance: float) -> float:
         base_speed = self.config.MAX_SPEED
         if distance < self.config.SLOW_RADIUS * 0.5:
@@ -245,7 +960,83 @@ class NavigationController:
             new_z -= move_distance * math.cos(self.current_heading)
         self.current_position = (new_x, new_z)
 
+    def _mpc_move(self, curr_x: float, curr_z: float) -> Optional[Dict]:
+        # 직전 웨이포인트(없으면 현재 위치) -> 현재 목적지 -> 이후 웨이포인트 꺾은선을 따라가도록 MPC로 선택
+        # 예산을 넘기면 None (호출한 쪽이 휴리스틱 선택으로 넘어감)
+        idx = self.current_waypoint_idx
+        anchor = self.waypoints[idx - 1] if idx > 0 and self.flow_field is None else (curr_x, curr_z)
+        polyline = [anchor, self.destination]
+        if self.flow_field is None:
+            polyline += self.waypoints[idx + 1:idx + 1 + self.config.MPC_LOOKAHEAD]
+        action = self.mpc.plan(curr_x, curr_z, self.current_heading, polyline, self.grid.clearance.distance)
+        if action is None:
+            return None
+        chosen_cmd, weight = action
+        self.last_command = chosen_cmd
+        self.current_position, self.current_heading = self.mpc.step(curr_x, curr_z, self.current_heading, chosen_cmd, weight)
+        return {
+            "move": chosen_cmd,
+            "weight": weight,
+            "current_waypoint": self.current_waypoint_idx,
+            "completed": self.completed
+        }
+
     def get_move(self) -> Dict:
+        with self.lock:
+            state = self._decision_state()
+            if self.config.PLAN_AHEAD <= 0:
+                return self._record_move(state, self._get_move())
+            if not self.command_queue:
+                self._fill_queue()
+            move, self.expected_position = self.command_queue.popleft()
+            self.queue_stats["served"] += 1
+            return self._record_move(state, dict(move, queued=len(self.command_queue)))
+
+    def get_moves(self, count: int) -> List[Dict]:
+        # 큐에 있는 명령을 최대 count개 한 번에 내보냄 (클라이언트가 틱마다 하나씩 소비)
+        with self.lock:
+            if self.config.PLAN_AHEAD <= 0:
+                return [self.get_move()]
+            if not self.command_queue:
+                self._fill_queue()
+            moves = []
+            while self.command_queue and len(moves) < count:
+                state = self._decision_state()
+                move, self.expected_position = self.command_queue.popleft()
+                moves.append(self._record_move(state, move))
+            self.queue_stats["served"] += len(moves)
+            return moves
+
+    def _decision_state(self):
+        # 결정 입력: 위치, 방향, 웨이포인트 번호 (재생에서 상태가 갈라졌는지 비교용)
+        x, z = self.current_position or (math.nan, math.nan)
+        return x, z, self.current_heading, self.current_waypoint_idx
+
+    def _record_move(self, state, move: Dict) -> Dict:
+        if self.trace:
+            self.trace.move(*state, move["move"], move["weight"])
+        return move
+
+    def _fill_queue(self) -> None:
+        # 자체 운동 모델(_update_position)로 PLAN_AHEAD 틱을 미리 진행하며 명령을 쌓음
+        # 컨트롤러 상태(위치, 방향, 웨이포인트 번호)는 시뮬레이션한 만큼 앞서 가고, /info의 실제 위치가
+        # 예측에서 DRIFT_THRESHOLD 넘게 벗어나면 큐를 버려 다음 폴링에서 실제 위치부터 다시 채움
+        self.queue_stats["refills"] += 1
+        for _ in range(self.config.PLAN_AHEAD):
+            move = self._get_move()
+            self.command_queue.append((move, self.current_position))
+            if move["move"] == "STOP":
+                break
+
+    def _check_drift(self, position) -> None:
+        if not self.command_queue or self.expected_position is None:
+            return
+        drift = math.hypot(position[0] - self.expected_position[0], position[1] - self.expected_position[1])
+        if drift > self.config.DRIFT_THRESHOLD:
+            self.command_queue.clear()
+            self.queue_stats["drift_invalidations"] += 1
+
+    def _get_move(self) -> Dict:
         if self.current_position is None or self.completed:
             return {"move": "STOP", "weight": 1.0, "current_waypoint": self.current_waypoint_idx, "completed": self.completed}
 
@@ -256,6 +1047,10 @@ class NavigationController:
             return {"move": "STOP", "weight": 1.0, "current_waypoint": self.current_waypoint_idx, "completed": self.completed}
 
         curr_x, curr_z = self.current_position
+        if self.flow_field is not None:
+            # 거리장에서 현재 칸의 lookahead 칸을 O(1)로 읽음 (탐색 없음)
+            cell = self.grid.cell_from_world_point(curr_x, curr_z)
+            self.destination = self.grid.cell_coords(int(self.flow_field.lookahead[cell]))
         dest_x, dest_z = self.destination
         distance = math.sqrt((dest_x - curr_x) ** 2 + (dest_z - curr_z) ** 2)
 
@@ -277,11 +1072,20 @@ class NavigationController:
                 dest_x, dest_z = self.destination
                 distance = math.sqrt((dest_x - curr_x) ** 2 + (dest_z - curr_z) ** 2)
 
+        if self.config.CONTROLLER == "mpc":
+            move = self._mpc_move(curr_x, curr_z)
+            if move is not None:
+                return move
+
         target_heading = math.atan2(dest_x - curr_x, dest_z - curr_z)
         heading_error = target_heading - self.current_heading
         heading_error = math.atan2(math.sin(heading_error), math.cos(heading_error))
 
         speed = self._calculate_speed(distance)
+        if self.speed_limits:
+            # 급한 코너(회전 반경이 짧은 구간)로 들어가는 웨이포인트에서는 회전 속도가 따라갈 만큼 감속
+            limit = self.speed_limits[self.current_waypoint_idx] / TANK_MAX_SPEED * self.config.MAX_SPEED
+            speed = max(self.config.MIN_SPEED, min(speed, limit))
         progress = max(0, 1 - distance / self.initial_distance) if self.initial_distance and distance > 0 else 0.0
         dynamic_weights = self._calculate_weights(heading_error, speed, progress)
 
@@ -290,7 +1094,7 @@ class NavigationController:
             return {"move": "STOP", "weight": 1.0, "current_waypoint": self.current_waypoint_idx, "completed": self.completed}
 
         weights = [dynamic_weights[cmd] for cmd in commands]
-        chosen_cmd = random.choices(commands, weights=weights, k=1)[0]
+        chosen_cmd = self.rng.choices(commands, weights=weights, k=1)[0]
         self.last_command = chosen_cmd
 
         if chosen_cmd:
@@ -304,9 +1108,17 @@ class NavigationController:
         }
 
 # 초기화
+MAP_FILE = "map.map"
 grid = Grid(width=300, height=300, padding=1)  # 패딩 설정
-pathfinding = Pathfinding()
-nav_controller = NavigationController(NavigationConfig(), pathfinding, grid)
+if os.path.exists(MAP_FILE):
+    # 맵 파일의 벽을 미리 반영 (캐시가 있으면 래스터화 없이 바로 읽음)
+    start_time = time.perf_counter()
+    cells = grid.set_obstacle_mask(load_map_mask(MAP_FILE, grid.width, grid.height))
+    print(f"Map loaded: {MAP_FILE}, {cells} wall cells in {(time.perf_counter() - start_time) * 1000:.2f} ms")
+flow_fields = FlowFieldService(steps=int(2 * NavigationConfig().TOLERANCE))  # lookahead는 도달 허용 거리보다 멀리
+pathfinding = Pathfinding(flow_fields)
+nav_controller = NavigationController(NavigationConfig(ASYNC_PLANNING=True, SMOOTH_PATH=True), pathfinding, grid)
+nav_controller.prepare_planner(nav_controller.config.PLANNER)  # 추상 그래프 등을 첫 요청 전에 구성
 obstacles_list = []
 
 # Flask 라우팅
@@ -316,7 +1128,23 @@ def info():
     try:
         player_pos = data["playerPos"]
         x, z = float(player_pos["x"]), float(player_pos["z"])
-        result = nav_controller.update_position(f"{x},0,{z}")
+        body = data.get("playerBodyX")
+        result = nav_controller.update_position(f"{x},0,{z}", float(body) if body is not None else None)
+        # 아군/적 전차가 지나간 칸의 높이로 경사 층 학습
+        for key in ("playerPos", "enemyPos"):
+            pos = data.get(key)
+            if pos and "y" in pos:
+                nav_controller.observe_height(float(pos["x"]), float(pos["z"]), float(pos["y"]))
+        enemy_pos = data.get("enemyPos")
+        if enemy_pos:
+            speed, body = data.get("enemySpeed"), data.get("enemyBodyX")
+            replan = nav_controller.observe_enemy(
+                float(enemy_pos["x"]), float(enemy_pos["z"]),
+                float(speed) if speed is not None else None,
+                float(body) if body is not None else None,
+            )
+            if replan is not None:
+                result["enemy_replan"] = replan
         print(f"/info received: playerPos={player_pos}")
         return jsonify(result)
     except (KeyError, ValueError, TypeError) as e:
@@ -340,20 +1168,23 @@ def update_obstacle():
     data = request.get_json()
     try:
         obstacles = data["obstacles"]
+        rects = []
         for obstacle in obstacles:
             x_min = float(obstacle["x_min"]) + 15
             x_max = float(obstacle["x_max"]) + 15
             z_min = float(obstacle["z_min"]) + 15
             z_max = float(obstacle["z_max"]) + 15
-            grid.set_obstacle(x_min, x_max, z_min, z_max)
-            obstacles_list.append({
-                "x_min": x_min,
-                "x_max": x_max,
-                "z_min": z_min,
-                "z_max": z_max
-            })
-        print(f"Obstacles Updated: {obstacles_list}")
-        return jsonify({"status": "OK"})
+            rects.append((x_min, x_max, z_min, z_max))
+        start_time = time.perf_counter()
+        count = nav_controller.add_obstacles(rects)
+        ingest_ms = (time.perf_counter() - start_time) * 1000
+        obstacles_list.extend(
+            {"x_min": x_min, "x_max": x_max, "z_min": z_min, "z_max": z_max}
+            for x_min, x_max, z_min, z_max in rects
+        )
+        print(f"Obstacles Updated: {count} rects ingested in {ingest_ms:.2f} ms (total {len(obstacles_list)})")
+        replan = nav_controller.replan()
+        return jsonify({"status": "OK", "count": count, "ingest_ms": ingest_ms, "replan": replan})
     except (KeyError, ValueError, TypeError) as e:
         print(f"Error in /update_obstacle: {e}")
         return jsonify({"status": "ERROR", "message": "Invalid obstacle data"}), 400
@@ -363,13 +1194,97 @@ def set_destination():
     data = request.get_json()
     if not data or "destination" not in data:
         return jsonify({"status": "ERROR", "message": "목적지 데이터 누락"}), 400
-    result = nav_controller.set_destination(data["destination"])
+    result = nav_controller.set_destination(data["destination"], data.get("planner"))
+    if result["status"] == "ERROR":
+        return jsonify(result), 400
+    return jsonify(result)
+
+@app.route('/set_planner', methods=['POST'])
+def set_planner():
+    data = request.get_json()
+    if not data or "planner" not in data:
+        return jsonify({"status": "ERROR", "message": "플래너 데이터 누락"}), 400
+    result = nav_controller.set_planner(data["planner"])
     if result["status"] == "ERROR":
         return jsonify(result), 400
     return jsonify(result)
 
+@app.route('/set_controller', methods=['POST'])
+def set_controller():
+    data = request.get_json()
+    if not data or "controller" not in data:
+        return jsonify({"status": "ERROR", "message": "제어기 데이터 누락"}), 400
+    result = nav_controller.set_controller(data["controller"])
+    if result["status"] == "ERROR":
+        return jsonify(result), 400
+    return jsonify(result)
+
+@app.route('/plan_batch', methods=['POST'])
+def plan_batch():
+    data = request.get_json()
+    if not data or "destinations" not in data:
+        return jsonify({"status": "ERROR", "message": "목적지 목록 누락"}), 400
+    result = nav_controller.plan_batch(data["destinations"], bool(data.get("with_paths", False)))
+    if result["status"] == "ERROR":
+        return jsonify(result), 400
+    return jsonify(result)
+
+@app.route('/get_clearance', methods=['GET'])
+def get_clearance():
+    # 임의 지점(기본: 현재 위치)에서 가장 가까운 벽까지 거리와 벽에서 멀어지는 방향
+    try:
+        if "x" in request.args and "z" in request.args:
+            x, z = float(request.args["x"]), float(request.args["z"])
+        elif nav_controller.current_position:
+            x, z = nav_controller.current_position
+        else:
+            return jsonify({"status": "ERROR", "message": "위치 데이터 누락"}), 400
+        grad_x, grad_z = grid.clearance.gradient(x, z)
+        return jsonify({"status": "OK", "x": x, "z": z, "clearance": grid.clearance.at(x, z), "gradient": [grad_x, grad_z]})
+    except ValueError as e:
+        return jsonify({"status": "ERROR", "message": str(e)}), 400
+
+@app.route('/get_status', methods=['GET'])
+def get_status():
+    return jsonify({
+        "current_position": nav_controller.current_position,
+        "goal": nav_controller.goal,
+        "planner": nav_controller.config.PLANNER,
+        "goal_planner": nav_controller.goal_planner,
+        "waypoints": len(nav_controller.waypoints),
+        "current_waypoint": nav_controller.current_waypoint_idx,
+        "completed": nav_controller.completed,
+        "obstacle_version": grid.version,
+        "clearance": grid.clearance.at(*nav_controller.current_position) if nav_controller.current_position else None,
+        "path_cache": nav_controller.path_cache.stats(),
+        "cost_layers": grid.layers.stats(),
+        "planning_job": nav_controller.worker.status() if nav_controller.worker else None,
+        "command_queue": dict(nav_controller.queue_stats, queued=len(nav_controller.command_queue)),
+        "controller": dict(nav_controller.mpc.status(), mode=nav_controller.config.CONTROLLER, seed=nav_controller.seed),
+        "trace": {"file": nav_controller.config.TRACE_FILE, "records": nav_controller.trace.records} if nav_controller.trace else None,
+        "enemy": nav_controller.enemy_tracker.status(),
+        "spacetime": {
+            "plan_ms": nav_controller.planners["spacetime"].plan_ms,
+            "truncated": nav_controller.planners["spacetime"].truncated,
+        }
+    })
+
+@app.route('/get_plan_status/<int:job_id>', methods=['GET'])
+def get_plan_status(job_id):
+    job = nav_controller.worker.status(job_id) if nav_controller.worker else None
+    if job is None:
+        return jsonify({"status": "ERROR", "message": f"Unknown job: {job_id}"}), 404
+    return jsonify(job)
+
 @app.route('/get_move', methods=['GET'])
 def get_move():
+    # ?count=N이면 PLAN_AHEAD 큐에서 최대 N개 명령을 한 번에 받음
+    if "count" in request.args:
+        try:
+            count = max(1, int(request.args["count"]))
+        except ValueError:
+            return jsonify({"status": "ERROR", "message": "count는 정수"}), 400
+        return jsonify({"moves": nav_controller.get_moves(count)})
     return jsonify(nav_controller.get_move())
 
 if __name__ == '__main__':
@@ -1,86 +1,17 @@
 import math
-import matplotlib.pyplot as plt
-
-class Vector:
-    def __init__(self, x=0.0, y=0.0):
-        self.x = x
-        self.y = y
-
-    def __add__(self, other):
-        return Vector(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other):
-        return Vector(self.x - other.x, self.y - other.y)
-
-    def __mul__(self, scalar):
-        return Vector(self.x * scalar, self.y * scalar)
-
-    def length(self):
-        return math.sqrt(self.x**2 + self.y**2)
-
-    def normalize(self):
-        length = self.length()
-        if length > 0:
-            self.x /= length
-            self.y /= length
-        return self
-
-    def __str__(self):
-        return f"Vector({self.x:.2f}, {self.y:.2f})"
-
-class Kinematic:
-    def __init__(self, position=Vector(), orientation=0.0, velocity=Vector(), rotation=0.0):
-        self.position = position
-        self.orientation = orientation
-        self.velocity = velocity
-        self.rotation = rotation
-
-    def update(self, steering, maxSpeed, time):
-        self.velocity = self.velocity + (steering.linear * time)
-        self.rotation += steering.angular * time
-
-        if self.velocity.length() > maxSpeed:
-            self.velocity.normalize()
-            self.velocity *= maxSpeed
-
-        self.position = self.position + (self.velocity * time)
-        self.orientation += self.rotation * time
-
-    def asVector(self):
-        return Vector(math.cos(self.orientation), math.sin(self.orientation))
+import sys
+import time
+import numpy as np
+from gameAI import Vector, Kinematic, KinematicBatch, Seek, Arrive
 
 def newOrientation(current, velocity):
     if velocity.length() > 0:
         return math.atan2(velocity.x, velocity.y)
     return current
 
-class SteeringOutput:
-    def __init__(self, linear=Vector(), angular=0.0):
-        self.linear = linear
-        self.angular = angular
-
-class DynamicSteeringBehavior:
-    def __init__(self, character, maxAcceleration):
-        self.character = character
-        self.maxAcceleration = maxAcceleration
-
-    def getSteering(self):
-        raise NotImplementedError("서브클래스는 getSteering을 구현해야 합니다.")
-
-class Seek(DynamicSteeringBehavior):
-    def __init__(self, character, target, maxAcceleration):
-        super().__init__(character, maxAcceleration)
-        self.target = target
-
-    def getSteering(self):
-        result = SteeringOutput()
-        direction = self.target.position - self.character.position
-        direction.normalize()
-        result.linear = direction * self.maxAcceleration
-        result.angular = 0
-        return result
-
 def simulate_and_visualize():
+    import matplotlib.pyplot as plt  # 시각화할 때만 필요
+
     # 초기 설정
     character = Kinematic(position=Vector(0, 0), orientation=0.0)
     target = Kinematic(position=Vector(5, 5), orientation=0.0)
@@ -125,5 +56,41 @@ def simulate_and_visualize():
     plt.savefig('character_path.png')
     print("경로 시각화가 'character_path.png' 파일로 저장되었습니다.")
 
+def simulate_batch(count=500, steps=300, timeStep=0.1, seed=0):
+    # 전차 count대를 KinematicBatch로 한 번에 Arrive (전차마다 시작점/목표/최고 속도가 다른 튜닝용 시나리오)
+    rng = np.random.default_rng(seed)
+    characters = KinematicBatch(rng.uniform(0, 30, (count, 2)))
+    targets = KinematicBatch(rng.uniform(0, 30, (count, 2)))
+    maxSpeed = rng.uniform(1.0, 3.0, count)
+    arrive = Arrive(characters, targets, maxAcceleration=2.0, maxSpeed=maxSpeed, targetRadius=0.1, slowRadius=2.0)
+    arrived = np.zeros(count, dtype=bool)
+    for _ in range(steps):
+        steering = arrive.getSteering()
+        arrived |= steering.stopped
+        characters.update(steering, maxSpeed, timeStep)
+    return characters, arrived
+
+def compare_batch(count=500, steps=300, timeStep=0.1):
+    # 같은 시나리오를 Kinematic 하나씩 (파이썬 루프) vs KinematicBatch 한 번에
+    start_time = time.perf_counter()
+    characters, arrived = simulate_batch(count, steps, timeStep)
+    batch_ms = (time.perf_counter() - start_time) * 1000
+    rng = np.random.default_rng(0)
+    starts, goals, speeds = rng.uniform(0, 30, (count, 2)), rng.uniform(0, 30, (count, 2)), rng.uniform(1.0, 3.0, count)
+    start_time = time.perf_counter()
+    error = 0.0
+    for i in range(count):
+        character = Kinematic(position=Vector(*starts[i]))
+        arrive = Arrive(character, Kinematic(position=Vector(*goals[i])), 2.0, speeds[i], 0.1, 2.0, verbose=False)
+        for _ in range(steps):
+            character.update(arrive.getSteering(), speeds[i], timeStep)
+        error = max(error, math.dist((character.position.x, character.position.y), characters.position[i]))
+    loop_ms = (time.perf_counter() - start_time) * 1000
+    print(f"{count} tanks x {steps} steps: Kinematic loop {loop_ms:8.1f} ms, KinematicBatch {batch_ms:6.1f} ms "
+          f"({loop_ms / batch_ms:.0f}x), arrived {arrived.sum()}/{count}, max position difference {error:.2e}")
+
 if __name__ == "__main__":
-    simulate_and_visualize()
\ No newline at end of file
+    if sys.argv[1:] == ["batch"]:
+        compare_batch()
+    else:
+        simulate_and_visualize()
\ No newline at end of file
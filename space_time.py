@@ -0,0 +1,249 @@
+import heapq
+import math
+import time
+import numpy as np
+
+INF = float("inf")
+
+class EnemyTracker:
+    # /info의 enemyPos, enemySpeed, enemyBodyX로 적 궤적을 등속 직선으로 예측
+    # 방향은 Unity 요 각 (0°가 +z, 90°가 +x), 즉 속도 = speed * (sin, cos)
+    # 방향/속도가 없으면 직전 관측과의 위치 차이로 속도를 추정
+    def __init__(self):
+        self.position = None
+        self.velocity = (0.0, 0.0)
+        self.time = None
+        self.version = 0  # 관측이 들어올 때마다 증가
+
+    def observe(self, x, z, speed=None, body_deg=None, now=None):
+        now = time.time() if now is None else now
+        if speed is not None and body_deg is not None:
+            yaw = math.radians(body_deg)
+            self.velocity = (speed * math.sin(yaw), speed * math.cos(yaw))
+        elif self.position is not None and now > self.time:
+            dt = now - self.time
+            self.velocity = ((x - self.position[0]) / dt, (z - self.position[1]) / dt)
+        self.position = (x, z)
+        self.time = now
+        self.version += 1
+
+    def predict(self, dt):
+        # 마지막 관측 후 경과 시간을 더해 지금부터 dt초 뒤 위치
+        if self.position is None:
+            return None
+        ahead = dt + max(0.0, time.time() - self.time)
+        return self.position[0] + self.velocity[0] * ahead, self.position[1] + self.velocity[1] * ahead
+
+    def status(self):
+        return {"position": self.position, "velocity": self.velocity, "observed_at": self.time}
+
+# 시공간 A*: 상태는 (칸, 시간 버킷)이고 버킷 k의 칸 비용에 그 시각 적 예측 위치 주변의 위험 비용을 더함
+# - 전차가 speed (m/s, 1칸 = 1 m)로 움직인다고 보고 이동 칸 수로 도착 시각을 계산 (대기 동작 없음)
+# - 위험 구역: 버킷 k 중간 시각의 예측 위치를 중심으로 반경 danger_radius + radius_growth * t (예측 불확실성),
+#   안쪽 칸에 danger_cost * (1 - d / r). horizon 이후에는 마지막 예측 위치에 머문다고 보고 그 구역을 정적 비용으로 둠
+# - 가지치기: 위험 구역이 한 번도 지나가지 않는 칸(튜브 밖)은 시간 차원을 접어 칸 하나를 한 상태로 보고,
+#   horizon을 넘긴 버킷도 하나로 접는다. 그래서 상태 수는 튜브 안에서만 늘어난다.
+# - 지연 예산: budget_ms는 find_path 전체(튜브 구성 + 시공간 탐색 + 꼬리)의 목표 시간.
+#   시공간 탐색은 budget_ms에서 직전 꼬리 시간(tail_ms, 최대 예산의 절반)을 뺀 시각까지만 하고, 넘기면 지금까지 목표에 가장
+#   가까이 간 상태까지를 위험 회피 구간으로 쓰고 나머지는 fallback(정적 A*)으로 이어 붙인다
+#   (가까운 미래일수록 중요하므로). 꼬리는 경로를 완성해야 하므로 중간에 자르지 않는다:
+#   꼬리가 직전보다 오래 걸리면 그만큼 예산을 넘길 수 있음
+#   기본 60 ms: map.map 시나리오(bench_pathfinding.py spacetime)에서 예산 없이 잰 비용이 첫 계획 최대 ~30 ms,
+#   재계획 최대 ~24 ms (확장당 ~6.5 µs, 최대 ~3600 확장). 20 ms면 적이 경로 위에 있는 경우 잘려 정적 경로가 되고,
+#   40 ms는 부하 한 번에 넘어가므로 최악의 두 배로 둠. 5 ms는 항상 잘림 (회피 없음)
+# - h_weight > 1은 가중 A*: 최적 비용의 h_weight배 안쪽 해를 더 적은 확장으로 찾음
+# 적이 움직이면 결과가 달라지므로 경로 캐시에 넣지 않음 (cacheable = False)
+class SpaceTimePlanner:
+    cacheable = False
+
+    def __init__(self, fallback, tracker=None, move_cost=10, speed=10.0, horizon=15.0, bucket=2.0,
+                 danger_radius=15.0, radius_growth=1.0, danger_cost=200.0, budget_ms=60.0, h_weight=2.0,
+                 smooth_margin=2):
+        self.fallback = fallback
+        self.tracker = tracker or EnemyTracker()
+        self.move_cost = move_cost
+        self.speed = speed
+        self.horizon = horizon
+        self.bucket = bucket
+        self.danger_radius = danger_radius
+        self.radius_growth = radius_growth
+        self.danger_cost = danger_cost
+        self.budget_ms = budget_ms
+        self.h_weight = h_weight
+        self.smooth_margin = smooth_margin  # 튜브 안에서 후처리가 경로에서 벗어나도 되는 칸 수
+        self.g_cost = []
+        self.steps = []
+        self.parent = []
+        self.visited = []
+        self.closed = []
+        self.generation = 0
+        self.expansions = 0
+        self.truncated = False  # 마지막 탐색이 예산을 넘겨 정적 A*로 이어 붙였는지
+        self.plan_ms = 0.0
+        self.tail_ms = budget_ms * 0.2  # 꼬리 정적 A* 시간 추정 (처음엔 예산의 1/5, 이후 직전 측정값)
+        self.tube_index = []  # 칸 -> 튜브 안 번호 (-1이면 밖), 탐색마다 지난 튜브 칸만 되돌려 재사용
+        self.tube_members = []
+        self.tube_mask = None
+        # 마지막 탐색의 위험 튜브에서 경로 주변 smooth_margin 칸을 뺀 (width, height) bool.
+        # 경로 후처리(시야선 단축, 원호)가 이 칸을 지나지 않게 해서 적을 돌아간 구간을 직선으로 펴지 않음
+        self.avoid_mask = None
+
+    def _prepare(self, size):
+        # 상태 배열은 더 커질 때만 다시 할당하고, 탐색마다 세대 번호로 O(1) 초기화
+        if size > len(self.g_cost):
+            self.g_cost = [0.0] * size
+            self.steps = [0] * size
+            self.parent = [-1] * size
+            self.visited = [0] * size
+            self.closed = [0] * size
+        self.generation += 1
+        return self.generation
+
+    def _slices(self, grid):
+        # 버킷별 (중심 x, 중심 z, 반경) 과 위험 구역이 지나가는 칸 튜브
+        # 튜브는 (칸마다 튜브 안 번호 (밖이면 -1), 튜브 번호마다 칸 번호)로 돌려줌
+        slices = []
+        tube = np.zeros((grid.width, grid.height), dtype=bool)
+        for k in range(int(math.ceil(self.horizon / self.bucket))):
+            t = (k + 0.5) * self.bucket
+            cx, cz = self.tracker.predict(t)
+            radius = self.danger_radius + self.radius_growth * t
+            slices.append((cx, cz, radius))
+            x0, x1 = max(0, int(cx - radius)), min(grid.width, int(cx + radius) + 2)
+            z0, z1 = max(0, int(cz - radius)), min(grid.height, int(cz + radius) + 2)
+            if x0 >= x1 or z0 >= z1:
+                continue
+            xs = np.arange(x0, x1)[:, None] - cx
+            zs = np.arange(z0, z1)[None, :] - cz
+            tube[x0:x1, z0:z1] |= xs * xs + zs * zs < radius * radius
+        members = np.flatnonzero(tube).tolist()
+        index = self.tube_index
+        if len(index) != tube.size:
+            index = self.tube_index = [-1] * tube.size
+        else:
+            for cell in self.tube_members:
+                index[cell] = -1
+        for slot, cell in enumerate(members):
+            index[cell] = slot
+        self.tube_members = members
+        self.tube_mask = tube
+        return slices, index, members
+
+    def find_path(self, start_pos, target_pos, grid):
+        start_time = time.perf_counter()
+        self.truncated = False
+        self.avoid_mask = None
+        if self.tracker.position is None:
+            path = self.fallback.find_path(start_pos, target_pos, grid)
+            self.expansions = self.fallback.expansions
+            return path
+        start_cell = grid.cell_from_world_point(start_pos[0], start_pos[1])
+        target_cell = grid.cell_from_world_point(target_pos[0], target_pos[1])
+        blocked = grid.obstacle_flat
+        cost = memoryview(grid.entry_costs())
+        if blocked[start_cell] or blocked[target_cell]:
+            print("Warning: Start or target position is on an obstacle.")
+            return []
+
+        slices, tube, members = self._slices(grid)
+        last = len(slices)  # horizon 이후 버킷 번호
+        # 상태 번호: 튜브 밖 칸과 horizon 이후 상태는 칸 번호 그대로, 튜브 안 칸의 버킷 k 상태는 size + 튜브 번호 * last + k
+        size = grid.size
+        gen = self._prepare(size + len(members) * last)
+        g_cost, steps, parent, visited, closed = self.g_cost, self.steps, self.parent, self.visited, self.closed
+        steps_per_bucket = self.speed * self.bucket
+        width, height = grid.width, grid.height
+        target_x, target_z = divmod(target_cell, height)
+        danger_cost = self.danger_cost
+        h_scale = self.move_cost * self.h_weight
+        # 꼬리 몫은 예산의 절반까지만 떼어 둠 (시공간 탐색이 아예 못 돌지 않게)
+        deadline = start_time + (self.budget_ms - min(self.tail_ms, self.budget_ms * 0.5)) / 1000.0
+
+        start_key = start_cell if tube[start_cell] < 0 else size + tube[start_cell] * last
+        g_cost[start_key] = 0.0
+        steps[start_key] = 0
+        parent[start_key] = -1
+        visited[start_key] = gen
+        best_key, best_h = start_key, INF
+        open_set = [(0.0, 0, start_key, start_cell)]
+        self.expansions = 0
+
+        while open_set:
+            _, h_current, key, current = heapq.heappop(open_set)
+            if closed[key] == gen:
+                continue
+            closed[key] = gen
+            self.expansions += 1
+            if current == target_cell:
+                best_key = key
+                break
+            if h_current < best_h:
+                best_key, best_h = key, h_current
+            if not self.expansions & 31 and time.perf_counter() > deadline:
+                self.truncated = True
+                break
+
+            current_g = g_cost[key]
+            next_steps = steps[key] + 1
+            k = int(next_steps / steps_per_bucket)
+            ex, ez, radius = slices[min(k, last - 1)]
+            cx, cz = divmod(current, height)
+            for neighbor, nx, nz in (
+                (current + 1, cx, cz + 1) if cz + 1 < height else (-1, 0, 0),
+                (current + height, cx + 1, cz) if cx + 1 < width else (-1, 0, 0),
+                (current - 1, cx, cz - 1) if cz > 0 else (-1, 0, 0),
+                (current - height, cx - 1, cz) if cx > 0 else (-1, 0, 0),
+            ):
+                if neighbor < 0 or blocked[neighbor]:
+                    continue
+                new_cost = current_g + cost[neighbor]
+                slot = tube[neighbor]
+                if slot < 0:
+                    neighbor_key = neighbor
+                else:
+                    d = math.hypot(nx - ex, nz - ez)
+                    if d < radius:
+                        new_cost += danger_cost * (1.0 - d / radius)
+                    neighbor_key = size + slot * last + k if k < last else neighbor
+                if closed[neighbor_key] == gen:
+                    continue
+                if visited[neighbor_key] != gen or new_cost < g_cost[neighbor_key]:
+                    visited[neighbor_key] = gen
+                    g_cost[neighbor_key] = new_cost
+                    steps[neighbor_key] = next_steps
+                    parent[neighbor_key] = key
+                    h_cost = (abs(nx - target_x) + abs(nz - target_z)) * h_scale
+                    heapq.heappush(open_set, (new_cost + h_cost, h_cost, neighbor_key, neighbor))
+
+        path = []
+        key = best_key
+        while key != -1:
+            path.append(grid.cell_coords(key if key < size else members[(key - size) // last]))
+            key = parent[key]
+        path.reverse()
+        if path[-1] != grid.cell_coords(target_cell):
+            # 예산 초과 또는 도달 불가: 가장 가까이 간 칸부터 정적 A*로 이어 붙임
+            tail_start = time.perf_counter()
+            tail = self.fallback.find_path(path[-1], target_pos, grid)
+            self.tail_ms = (time.perf_counter() - tail_start) * 1000
+            self.expansions += self.fallback.expansions
+            path = path + tail[1:] if tail else []
+        if path:
+            self.avoid_mask = self.tube_mask & ~self._corridor(path, self.tube_mask.shape)
+        self.plan_ms = (time.perf_counter() - start_time) * 1000
+        return path
+
+    def _corridor(self, path, shape):
+        # 경로 칸을 smooth_margin만큼 (체비셰프) 넓힌 마스크: 튜브 안 계단 모양 구간은 이 안에서만 펴짐
+        corridor = np.zeros(shape, dtype=bool)
+        cells = np.array(path, dtype=int)
+        corridor[cells[:, 0], cells[:, 1]] = True
+        for _ in range(self.smooth_margin):
+            grown = corridor.copy()
+            grown[1:, :] |= corridor[:-1, :]
+            grown[:-1, :] |= corridor[1:, :]
+            rows = grown.copy()
+            grown[:, 1:] |= rows[:, :-1]
+            grown[:, :-1] |= rows[:, 1:]
+            corridor = grown
+        return corridor
@@ -0,0 +1,160 @@
+import contextlib
+import csv
+import io
+import itertools
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from dataclasses import asdict
+
+from semple_astar import NavigationController, NavigationConfig, Pathfinding, grid
+from mpc import MPCController
+
+# NavigationConfig 튜닝용 헤드리스 스윕
+# 설정마다 NavigationController를 새로 만들어 map.map 위 시나리오들을 오프라인 전차 모델
+# (4th_try.py/control.py predict_state = MPCController.step)로 폐루프 주행하고
+# 도착 시간, 주행 거리, 명령 수로 점수를 매겨 순위표(CSV)로 씀. 설정은 프로세스 풀에 나눠 돌림.
+# 위치와 차체 각은 시뮬레이터 /info(playerPos, playerBodyX)처럼 매 틱 알려줌 (이 모델은 A/D로 제자리 회전하므로
+# 위치만으로는 방향이 안 보임). base 설정이 한 목표에도 못 닿으면 모델/제어기 문제로 보고 스윕을 멈춤
+#   python sweep_config.py sweep.json [결과.csv] [프로세스 수]
+# sweep.json 예:
+#   {"grid": {"HEADING_SMOOTHING": [0.6, 0.8], "WEIGHT_FACTORS.W": [0.5, 1.0]},   # 전체 조합
+#    "random": {"SLOW_RADIUS": [20, 80]}, "samples": 500,                        # 또는 범위에서 무작위
+#    "base": {"SMOOTH_PATH": true}}                                              # 모든 설정에 공통
+# WEIGHT_FACTORS처럼 dict인 항목은 "WEIGHT_FACTORS.W"로 한 키만 바꿈
+
+SCENARIOS = [
+    ((60.0, 27.23), (59.0, 280.0)),     # 파랑 시작 -> 빨강 시작
+    ((60.0, 27.23), (135.46, 276.87)),  # 파랑 시작 -> 적 시작
+    ((280.0, 30.0), (30.0, 270.0)),
+]
+DT = 0.1             # 틱 간격 (s), Ground.run 루프
+MAX_TICKS = 1500     # 이 안에 못 닿으면 실패
+FAIL_PENALTY = 2.0   # 실패 시나리오의 시간 점수 = MAX_TICKS * DT * FAIL_PENALTY
+LENGTH_WEIGHT = 0.05  # 점수 = 시간(s) + LENGTH_WEIGHT * 주행 거리(m) + COMMAND_WEIGHT * 명령 수 (STOP 제외)
+COMMAND_WEIGHT = 0.05
+SEED = 0             # 제어기 RNG 시드 (모든 설정이 같은 난수열로 비교됨)
+
+def make_config(params):
+    settings = asdict(NavigationConfig())
+    for key, value in params.items():
+        if "." in key:
+            name, item = key.split(".", 1)
+            settings[name] = dict(settings[name], **{item: value})
+        else:
+            settings[key] = value
+    settings.update(ASYNC_PLANNING=False, TRACE_FILE=None, SEED=SEED)
+    return NavigationConfig(**settings)
+
+def run_episode(config, start, goal, max_ticks=MAX_TICKS):
+    # (도착 틱 또는 None, 주행 거리 m, 낸 명령 수, 키 전환 수)
+    truth = MPCController(dt=DT)
+    controller = NavigationController(config, Pathfinding(), grid)
+    # MPC 지연 예산을 풀어 둠: 예산 초과(=CPU 부하)에 따라 휴리스틱으로 넘어가면 점수가 프로세스 수마다 달라짐
+    controller.mpc.budget_ms = math.inf
+    controller.update_position(f"{start[0]},0,{start[1]}", 0.0)
+    controller.set_destination(f"{goal[0]},0,{goal[1]}")
+    position, heading = start, 0.0
+    length, commands, switches, last = 0.0, 0, 0, None
+    for tick in range(max_ticks):
+        move = controller.get_move()
+        if controller.completed:
+            return tick, length, commands, switches
+        key = move["move"]
+        if key != "STOP":
+            commands += 1
+            new_position, heading = truth.step(position[0], position[1], heading, key, move["weight"])
+            length += math.dist(position, new_position)
+            position = new_position
+        switches += key != last
+        last = key
+        controller.update_position(f"{position[0]},0,{position[1]}", math.degrees(heading))
+    return None, length, commands, switches
+
+def evaluate(job):
+    index, params = job
+    start_time = time.perf_counter()
+    config = make_config(params)
+    reached, total_time, total_length, total_commands, total_switches = 0, 0.0, 0.0, 0, 0
+    for start, goal in SCENARIOS:
+        with contextlib.redirect_stdout(io.StringIO()):  # 제어기/플래너의 진행 출력은 버림
+            ticks, length, commands, switches = run_episode(config, start, goal)
+        reached += ticks is not None
+        total_time += ticks * DT if ticks is not None else MAX_TICKS * DT * FAIL_PENALTY
+        total_length += length
+        total_commands += commands
+        total_switches += switches
+    score = total_time + LENGTH_WEIGHT * total_length + COMMAND_WEIGHT * total_commands
+    return {
+        "index": index,
+        "score": round(score, 3),
+        "reached": f"{reached}/{len(SCENARIOS)}",
+        "time_s": round(total_time, 1),
+        "length_m": round(total_length, 1),
+        "commands": total_commands,
+        "switches": total_switches,
+        "eval_ms": round((time.perf_counter() - start_time) * 1000, 1),
+        "params": json.dumps(params, sort_keys=True),
+    }
+
+def expand(spec, seed=0):
+    # sweep.json -> [설정 dict, ...]
+    base = spec.get("base", {})
+    configs = []
+    if "grid" in spec:
+        keys = list(spec["grid"])
+        for values in itertools.product(*(spec["grid"][key] for key in keys)):
+            configs.append(dict(base, **dict(zip(keys, values))))
+    if "random" in spec:
+        rng = random.Random(seed)
+        for _ in range(spec.get("samples", 100)):
+            params = dict(base)
+            for key, (low, high) in spec["random"].items():
+                params[key] = round(rng.uniform(low, high), 4)
+            configs.append(params)
+    return configs or [dict(base)]
+
+def sweep(configs, processes=None, chunksize=4, baseline=None):
+    # 설정 목록을 프로세스 풀로 평가해 점수 오름차순 목록 반환
+    # baseline(보통 sweep.json의 base)을 먼저 돌려 한 목표에도 못 닿으면 순위가 의미 없으므로 중단
+    if baseline is not None:
+        result = evaluate((-1, baseline))
+        if result["reached"].startswith("0/"):
+            raise RuntimeError(f"Baseline config reached no goals ({result['reached']}): {result['params']}")
+    jobs = list(enumerate(configs))
+    if processes == 1:
+        results = [evaluate(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = list(pool.imap_unordered(evaluate, jobs, chunksize=chunksize))
+    results.sort(key=lambda result: result["score"])
+    return results
+
+def write_table(results, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["rank"] + list(results[0]))
+        writer.writeheader()
+        for rank, result in enumerate(results, 1):
+            writer.writerow(dict(result, rank=rank))
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("usage: python sweep_config.py SWEEP_JSON [RESULTS_CSV] [PROCESSES]")
+        sys.exit(1)
+    with open(sys.argv[1]) as f:
+        spec = json.load(f)
+    configs = expand(spec)
+    output = sys.argv[2] if len(sys.argv) > 2 else "sweep_results.csv"
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    start_time = time.perf_counter()
+    results = sweep(configs, processes, baseline=spec.get("base", {}))
+    elapsed = time.perf_counter() - start_time
+    write_table(results, output)
+    print(f"{len(configs)} configs x {len(SCENARIOS)} scenarios in {elapsed:.1f} s "
+          f"({processes or multiprocessing.cpu_count()} processes), ranked table: {output}")
+    for rank, result in enumerate(results[:10], 1):
+        print(f"  {rank:3d}. score {result['score']:8.2f}  reached {result['reached']}  time {result['time_s']:6.1f} s  "
+              f"length {result['length_m']:7.1f} m  commands {result['commands']:5d}  {result['params']}")
@@ -5,6 +5,7 @@ import random
 import time
 import numpy as np
 from collections import deque
+from obstacle_store import ObstacleStore
 
 app = Flask(__name__)
 
@@ -16,7 +17,7 @@ last_command = None  # 마지막 이동 명령 추적
 last_steering = 0.0  # 이전 조향 값 저장
 last_update_time = time.time()  # 마지막 업데이트 시간
 path_history = deque(maxlen=20)  # 이동 경로 히스토리 (최근 20개 위치)
-obstacles = []  # 장애물 위치 목록 [(x, z, radius), ...]
+obstacles = ObstacleStore()  # 장애물 (x, z, radius), 격자 버킷 색인
 
 # 파라미터
 MOVE_STEP = 0.1  # 기본 이동 단위
@@ -134,7 +135,6 @@ def set_weights():
 
 @app.route('/add_obstacle', methods=['POST'])
 def add_obstacle():
-    global obstacles
     data = request.get_json()
     if not data or "position" not in data or "radius" not in data:
         return jsonify({"status": "ERROR", "message": "장애물 데이터 누락"}), 400
@@ -142,7 +142,7 @@ def add_obstacle():
     try:
         x, y, z = map(float, data["position"].split(","))
         radius = float(data["radius"])
-        obstacles.append((x, z, radius))
+        obstacles.add(x, z, radius)
         print(f"🚧 장애물 추가: 위치({x}, {z}), 반경: {radius}")
         return jsonify({"status": "OK", "obstacles": len(obstacles)})
     except Exception as e:
@@ -150,8 +150,7 @@ def add_obstacle():
 
 @app.route('/clear_obstacles', methods=['GET'])
 def clear_obstacles():
-    global obstacles
-    obstacles = []
+    obstacles.clear()
     print("🧹 장애물 목록 초기화")
     return jsonify({"status": "OK", "obstacles": 0})
 
@@ -190,22 +189,8 @@ def get_move():
     if goal_distance > 0:
         goal_vector = goal_vector / goal_distance  # 정규화
     
-    # 장애물 회피 벡터 계산
-    avoidance_vector = np.array([0.0, 0.0])
-    if obstacles:
-        for obs_x, obs_z, obs_radius in obstacles:
-            # 장애물까지의 벡터
-            to_obstacle = np.array([obs_x - curr_x, obs_z - curr_z])
-            distance_to_obs = np.linalg.norm(to_obstacle)
-            
-            # 장애물 영향 범위 내에 있는 경우
-            if distance_to_obs < obs_radius + lookahead_distance:
-                # 장애물에서 멀어지는 방향으로 힘 적용
-                if distance_to_obs > 0:
-                    repulsion = -to_obstacle / distance_to_obs
-                    # 장애물에 가까울수록 더 강한 회피력
-                    strength = 1.0 - min(1.0, (distance_to_obs - obs_radius) / lookahead_distance)
-                    avoidance_vector += repulsion * strength * OBSTACLE_AVOIDANCE_WEIGHT
+    # 장애물 회피 벡터 계산 (영향 범위 안의 장애물만 골라 한 번에 합산)
+    avoidance_vector = obstacles.repulsion(curr_x, curr_z, lookahead_distance) * OBSTACLE_AVOIDANCE_WEIGHT
     
     # 최종 목표 방향 계산 (장애물 회피 포함)
     target_vector = goal_vector * GOAL_WEIGHT + avoidance_vector
@@ -348,7 +333,7 @@ def get_status():
 @app.route('/init', methods=['GET'])
 def init():
     global current_position, destination, last_command, initial_distance, current_heading
-    global path_history, obstacles, last_steering
+    global path_history, last_steering
     
     current_position = None
     destination = None
@@ -357,7 +342,7 @@ def init():
     current_heading = 0.0
     last_steering = 0.0
     path_history.clear()
-    obstacles = []
+    obstacles.clear()
     
     config = {
         "startMode": "start",